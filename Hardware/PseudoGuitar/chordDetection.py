@@ -22,13 +22,13 @@ class ChordDetector:
             with serial.Serial(self.port, self.baud_rate, timeout=1) as ser:
                 logger.info(f"Connected to {self.port} at {self.baud_rate} baud.")
                 while self.running:
-                    if ser.in_waiting > 0:
-                        line = ser.readline().decode('utf-8', errors='ignore').strip()
-                        if line:
-                            # Store the latest valid chord and only log when it changes
-                            if line != self.current_chord:
-                                self.current_chord = line
-                                logger.info(f"Current chord: {line}")
+                    # blocks until a line arrives or the 1 s timeout, instead of spinning on in_waiting
+                    line = ser.readline().decode('utf-8', errors='ignore').strip()
+                    if line:
+                        # Store the latest valid chord and only log when it changes
+                        if line != self.current_chord:
+                            self.current_chord = line
+                            logger.info(f"Current chord: {line}")
         except serial.SerialException as e:
             logger.warning(f"Serial error: {e}")
 
@@ -0,0 +1,121 @@
+# landmarkTrace.py
+# Recorded hand-landmark traces for offline evaluation and tuning.
+#
+# npz layout:
+#   t                (N,)        frame timestamps in seconds
+#   landmarks        (N, 21, 3)  normalized landmark x, y, z; NaN rows = no hand
+#   strum_times      (M,)        ground-truth strum onsets (start of motion)
+#   strum_directions (M,)        +1 down, -1 up
+# CSV layout: header t, x0, y0, z0, ..., x20, y20, z20, strum with one row per
+# frame; strum is 1/-1 on the frame where a ground-truth down/up strum starts.
+import csv
+import math
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+
+
+def load_trace(path):
+    if path.endswith(".npz"):
+        data = np.load(path)
+        return {
+            "t": np.asarray(data["t"], dtype=np.float64),
+            "landmarks": np.asarray(data["landmarks"], dtype=np.float32),
+            "strum_times": np.asarray(data["strum_times"], dtype=np.float64),
+            "strum_directions": np.asarray(data["strum_directions"], dtype=np.int8),
+        }
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    t = np.array([float(row["t"]) for row in rows])
+    landmarks = np.full((len(rows), NUM_LANDMARKS, 3), np.nan, dtype=np.float32)
+    strum_times, strum_directions = [], []
+    for i, row in enumerate(rows):
+        for j in range(NUM_LANDMARKS):
+            for k, axis in enumerate("xyz"):
+                value = row.get(f"{axis}{j}", "")
+                if value != "":
+                    landmarks[i, j, k] = float(value)
+        strum = int(float(row.get("strum") or 0))
+        if strum:
+            strum_times.append(t[i])
+            strum_directions.append(strum)
+    return {
+        "t": t,
+        "landmarks": landmarks,
+        "strum_times": np.array(strum_times, dtype=np.float64),
+        "strum_directions": np.array(strum_directions, dtype=np.int8),
+    }
+
+
+def save_trace(path, trace):
+    if path.endswith(".npz"):
+        np.savez_compressed(path, **trace)
+        return
+    onsets = {}
+    for time_, direction in zip(trace["strum_times"], trace["strum_directions"]):
+        onsets[int(np.argmin(np.abs(trace["t"] - time_)))] = int(direction)
+    header = ["t"] + [f"{axis}{j}" for j in range(NUM_LANDMARKS) for axis in "xyz"] + ["strum"]
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for i, time_ in enumerate(trace["t"]):
+            points = trace["landmarks"][i].reshape(-1)
+            values = ["" if math.isnan(v) else f"{v:.5f}" for v in points]
+            writer.writerow([f"{time_:.5f}"] + values + [onsets.get(i, 0)])
+
+
+# synthetic hand: landmark offsets from the hand center, hand height ~0.25
+_TEMPLATE = np.array([
+    [0.00, 0.13], [-0.04, 0.09], [-0.06, 0.05], [-0.07, 0.02], [-0.08, -0.01],  # wrist, thumb
+    [-0.03, -0.02], [-0.03, -0.06], [-0.03, -0.09], [-0.03, -0.12],  # index
+    [-0.01, 0.00], [-0.01, -0.05], [-0.01, -0.08], [-0.01, -0.11],  # middle
+    [0.01, 0.00], [0.01, -0.04], [0.01, -0.07], [0.01, -0.10],  # ring
+    [0.03, 0.01], [0.03, -0.02], [0.03, -0.05], [0.03, -0.07],  # pinky
+], dtype=np.float32)
+_THUMB_EXTENDED_Y = -0.11  # thumb tip y offset when giving a thumbs up
+
+
+def synthesize_trace(duration=60.0, fps=10.0, tempo=70.0, strum_duration=0.25, amplitude=0.25,
+                     noise=0.004, frame_jitter=0.15, drop_rate=0.02, wobble_rate=0.1, seed=0):
+    # alternating down/up strums on every beat, with landmark jitter, uneven frame
+    # timing, dropped detections and small non-strum wobbles between strums
+    rng = np.random.default_rng(seed)
+    beat = 60.0 / tempo
+    strum_times = np.arange(1.0, duration - beat, beat)
+    strum_directions = np.where(np.arange(len(strum_times)) % 2 == 0, 1, -1).astype(np.int8)
+    wobbles = strum_times[rng.random(len(strum_times)) < wobble_rate] + beat / 2
+
+    frame_dt = 1.0 / fps
+    t = np.cumsum(frame_dt * (1 + frame_jitter * rng.uniform(-1, 1, int(duration * fps))))
+    t = t[t < duration]
+    top = 0.5 - amplitude / 2
+    center_y = np.full(len(t), top)
+    thumb_up = np.zeros(len(t), dtype=bool)
+    for onset, direction in zip(strum_times, strum_directions):
+        phase = np.clip((t - onset) / strum_duration, 0, 1)
+        travel = amplitude * (1 - np.cos(np.pi * phase)) / 2
+        active = t >= onset
+        if direction > 0:
+            center_y[active] = top + travel[active]
+        else:
+            center_y[active] = top + amplitude - travel[active]
+            # thumbs up from shortly before the upstroke until the next downstroke
+            thumb_up |= (t >= onset - 0.1) & (t < onset + beat - 0.1)
+    for start in wobbles:
+        window = (t >= start) & (t < start + 0.3)
+        center_y[window] += 0.02 * np.sin(np.pi * (t[window] - start) / 0.3)
+
+    landmarks = np.empty((len(t), NUM_LANDMARKS, 3), dtype=np.float32)
+    landmarks[:, :, 0] = 0.5 + _TEMPLATE[:, 0]
+    landmarks[:, :, 1] = center_y[:, None] + _TEMPLATE[:, 1]
+    landmarks[thumb_up, 4, 1] = center_y[thumb_up] + _THUMB_EXTENDED_Y
+    landmarks[:, :, 2] = 0.0
+    landmarks[:, :, :2] += rng.normal(0, noise, (len(t), NUM_LANDMARKS, 2))
+    landmarks[rng.random(len(t)) < drop_rate] = np.nan
+    return {
+        "t": t,
+        "landmarks": landmarks,
+        "strum_times": strum_times,
+        "strum_directions": strum_directions,
+    }
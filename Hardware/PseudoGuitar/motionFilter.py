@@ -0,0 +1,134 @@
+# motionFilter.py
+# Low-lag smoothing for the hand center. Every filter takes (timestamp, position)
+# pairs and returns (position, velocity) with velocity in units per second, so
+# irregular frame timing does not skew the estimate. predict() extrapolates the
+# position to compensate for capture -> detection delay.
+import math
+from collections import deque
+
+
+class OneEuroFilter:
+    # Casiez et al. 1-euro filter: the cutoff rises with speed, so the hand center
+    # is heavily smoothed while resting and barely lagged while strumming
+    def __init__(self, min_cutoff=1.5, beta=8.0, d_cutoff=2.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self.t = None
+        self.x = None
+        self.dx = 0.0
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def update(self, t, x):
+        if self.t is None or t <= self.t:
+            if self.t is None:
+                self.x = x
+            self.t = t
+            return self.x, self.dx
+        dt = t - self.t
+        raw_dx = (x - self.x) / dt
+        a_d = self._alpha(self.d_cutoff, dt)
+        self.dx = a_d * raw_dx + (1 - a_d) * self.dx
+        cutoff = self.min_cutoff + self.beta * abs(self.dx)
+        a = self._alpha(cutoff, dt)
+        self.x = a * x + (1 - a) * self.x
+        self.t = t
+        return self.x, self.dx
+
+    def predict(self, t):
+        if self.t is None:
+            return None
+        return self.x + self.dx * (t - self.t)
+
+
+class ConstantVelocityKalman:
+    # 1-D Kalman filter with state [position, velocity]; process noise models
+    # the hand's acceleration, measurement noise the landmark jitter
+    def __init__(self, acceleration_noise=40.0, measurement_noise=0.004):
+        self.q = acceleration_noise
+        self.r = measurement_noise ** 2
+        self.reset()
+
+    def reset(self):
+        self.t = None
+        self.x = None
+        self.v = 0.0
+        self.p = None  # covariance [[p00, p01], [p01, p11]]
+
+    def update(self, t, z):
+        if self.t is None:
+            self.t, self.x, self.v = t, z, 0.0
+            self.p = [self.r, 0.0, 1.0]
+            return self.x, self.v
+        dt = t - self.t
+        if dt <= 0:
+            return self.x, self.v
+        p00, p01, p11 = self.p
+        # predict
+        x = self.x + self.v * dt
+        q = self.q
+        p00 = p00 + 2 * dt * p01 + dt * dt * p11 + q * dt ** 3 / 3
+        p01 = p01 + dt * p11 + q * dt ** 2 / 2
+        p11 = p11 + q * dt
+        # correct
+        s = p00 + self.r
+        k0, k1 = p00 / s, p01 / s
+        residual = z - x
+        self.x = x + k0 * residual
+        self.v = self.v + k1 * residual
+        self.p = [(1 - k0) * p00, (1 - k0) * p01, p11 - k1 * p01]
+        self.t = t
+        return self.x, self.v
+
+    def predict(self, t):
+        if self.t is None:
+            return None
+        return self.x + self.v * (t - self.t)
+
+
+class MovingAverageFilter:
+    # The original behaviour: mean of the last `window` frame-to-frame deltas,
+    # converted to units per second with the actual frame timestamps
+    def __init__(self, window=10):
+        self.window = window
+        self.reset()
+
+    def reset(self):
+        self.t = None
+        self.x = None
+        self.deltas = deque(maxlen=self.window)
+        self.dts = deque(maxlen=self.window)
+
+    def update(self, t, x):
+        if self.t is not None and t > self.t:
+            self.deltas.append(x - self.x)
+            self.dts.append(t - self.t)
+        self.t, self.x = t, x
+        if not self.deltas:
+            return x, 0.0
+        return x, sum(self.deltas) / sum(self.dts)
+
+    def predict(self, t):
+        if self.t is None:
+            return None
+        return self.x
+
+
+FILTERS = {
+    "one_euro": OneEuroFilter,
+    "kalman": ConstantVelocityKalman,
+    "moving_average": MovingAverageFilter,
+}
+
+
+def make_filter(name="one_euro", **params):
+    if name not in FILTERS:
+        raise ValueError(f"Unknown filter {name!r}; choose from {', '.join(FILTERS)}")
+    return FILTERS[name](**params)
@@ -0,0 +1,70 @@
+# motionGate.py
+# Cheap pre-stage that decides whether a frame needs hand inference at all.
+# Frames are shrunk to a small grayscale thumbnail and compared with the last
+# frame that went through MediaPipe; if neither the whole frame nor the last
+# hand ROI moved, the previous landmarks are reused. A refresh is forced every
+# max_skip_interval seconds so tracking never goes stale.
+import cv2
+import numpy as np
+
+THUMB_SIZE = (80, 60)
+
+
+class MotionGate:
+    def __init__(self, threshold=4.0, roi_threshold=3.0, max_skip_interval=0.5, roi_margin=0.1):
+        self.threshold = threshold  # mean abs gray-level change over the whole thumbnail
+        self.roi_threshold = roi_threshold  # same, inside the last hand bounding box
+        self.max_skip_interval = max_skip_interval
+        self.roi_margin = roi_margin
+        self.reference = None
+        self.last_inference_time = None
+        self.roi = None  # (x0, y0, x1, y1) normalized, from the last detected hand
+        self.last_energy = 0.0
+        self.frames = 0
+        self.inferences = 0
+        self.skipped = 0
+
+    def set_roi(self, points):
+        # points: landmark (x, y[, z]) tuples of the last detected hand, or None
+        if not points:
+            self.roi = None
+            return
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        m = self.roi_margin
+        self.roi = (max(0.0, min(xs) - m), max(0.0, min(ys) - m), min(1.0, max(xs) + m), min(1.0, max(ys) + m))
+
+    def should_infer(self, frame, t):
+        self.frames += 1
+        thumb = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), THUMB_SIZE, interpolation=cv2.INTER_AREA)
+        thumb = thumb.astype(np.int16)
+        run = (
+            self.reference is None
+            or self.last_inference_time is None
+            or t - self.last_inference_time >= self.max_skip_interval
+        )
+        if not run:
+            diff = np.abs(thumb - self.reference)
+            self.last_energy = float(diff.mean())
+            run = self.last_energy > self.threshold
+            if not run and self.roi is not None:
+                w, h = THUMB_SIZE
+                x0, y0, x1, y1 = self.roi
+                patch = diff[int(y0 * h):max(int(y1 * h), int(y0 * h) + 1), int(x0 * w):max(int(x1 * w), int(x0 * w) + 1)]
+                run = patch.size > 0 and float(patch.mean()) > self.roi_threshold
+        if run:
+            self.reference = thumb
+            self.last_inference_time = t
+            self.inferences += 1
+        else:
+            self.skipped += 1
+        return run
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "inferences": self.inferences,
+            "skipped": self.skipped,
+            "skip_rate": self.skipped / self.frames if self.frames else 0.0,
+            "last_motion_energy": self.last_energy,
+        }
@@ -0,0 +1,106 @@
+# motionGateEvaluation.py
+# Run a session recording through MediaPipe twice, on every frame and behind the
+# MotionGate, and compare CPU time, inference count and the strums detected from
+# the two landmark streams.
+#
+#   python motionGateEvaluation.py session.mp4
+#   python motionGateEvaluation.py session.mp4 --threshold 3 --max-skip 0.3
+import argparse
+import time
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from motionGate import MotionGate
+from strumDetector import StrumDetector, hand_features
+
+
+def make_hands():
+    return mp.solutions.hands.Hands(
+        static_image_mode=False,
+        max_num_hands=1,
+        model_complexity=0,
+        min_detection_confidence=0.6,
+        min_tracking_confidence=0.4
+    )
+
+
+def read_frames(path, fps):
+    cap = cv2.VideoCapture(path)
+    fps = fps or cap.get(cv2.CAP_PROP_FPS) or 30.0
+    frames = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(cv2.flip(frame, 1))
+    cap.release()
+    return frames, fps
+
+
+def run(frames, fps, gate=None):
+    hands = make_hands()
+    detector = StrumDetector(nominal_interval=1.0 / fps)
+    results = None
+    centers, strums = [], []
+    start = time.process_time()
+    for i, frame in enumerate(frames):
+        t = i / fps
+        if gate is None or gate.should_infer(frame, t) or results is None:
+            results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            if gate is not None:
+                hand = results.multi_hand_landmarks[0] if results.multi_hand_landmarks else None
+                gate.set_roi([(lm.x, lm.y) for lm in hand.landmark] if hand else None)
+        if not results.multi_hand_landmarks:
+            centers.append(np.nan)
+            continue
+        points = [(lm.x, lm.y) for lm in results.multi_hand_landmarks[0].landmark]
+        _, center_y, thumb_distance, _ = hand_features(points)
+        centers.append(center_y)
+        event, direction_down, _ = detector.update(t, center_y, thumb_distance)
+        if event == "strum":
+            strums.append((t, direction_down))
+    cpu = time.process_time() - start
+    hands.close()
+    return cpu, np.array(centers), strums
+
+
+def matched_strums(reference, candidate, tolerance=0.15):
+    matched = 0
+    j = 0
+    for t, direction in reference:
+        while j < len(candidate) and candidate[j][0] < t - tolerance:
+            j += 1
+        if j < len(candidate) and abs(candidate[j][0] - t) <= tolerance and candidate[j][1] == direction:
+            matched += 1
+            j += 1
+    return matched
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure MediaPipe CPU saved by the motion gate")
+    parser.add_argument("video", help="session recording (any format OpenCV can read)")
+    parser.add_argument("--fps", type=float, default=0.0, help="override the file's frame rate")
+    parser.add_argument("--threshold", type=float, default=4.0)
+    parser.add_argument("--roi-threshold", type=float, default=3.0)
+    parser.add_argument("--max-skip", type=float, default=0.5)
+    args = parser.parse_args()
+
+    frames, fps = read_frames(args.video, args.fps)
+    print(f"{len(frames)} frames at {fps:.1f} fps")
+
+    full_cpu, full_centers, full_strums = run(frames, fps)
+    gate = MotionGate(threshold=args.threshold, roi_threshold=args.roi_threshold, max_skip_interval=args.max_skip)
+    gated_cpu, gated_centers, gated_strums = run(frames, fps, gate)
+
+    stats = gate.stats()
+    both = ~np.isnan(full_centers) & ~np.isnan(gated_centers)
+    drift = np.abs(full_centers[both] - gated_centers[both])
+    print(f"every frame : {full_cpu:7.2f} s CPU, {len(frames)} inferences, {len(full_strums)} strums")
+    print(f"motion gate : {gated_cpu:7.2f} s CPU, {stats['inferences']} inferences "
+          f"({stats['skip_rate']:.0%} skipped), {len(gated_strums)} strums")
+    print(f"CPU saved   : {1 - gated_cpu / full_cpu:.0%}" if full_cpu else "CPU saved   : -")
+    if both.any():
+        print(f"hand center drift on reused frames: mean {drift.mean():.4f}, max {drift.max():.4f}")
+    print(f"strums matching the every-frame run: {matched_strums(full_strums, gated_strums)}/{len(full_strums)}")
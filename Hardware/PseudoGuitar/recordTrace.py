@@ -0,0 +1,81 @@
+# recordTrace.py
+# Record hand landmarks from the camera into a trace for strumEvaluation.py and
+# the threshold autotuner. Press d / u as a down / up strum starts to mark the
+# ground truth, q to save and quit. --video also keeps the raw camera frames for
+# motionGateEvaluation.py.
+#
+#   python recordTrace.py traces/alice_desk.npz --camera 1 --video traces/alice_desk.mp4
+import argparse
+import time
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from landmarkTrace import NUM_LANDMARKS, save_trace
+
+parser = argparse.ArgumentParser(description="Record a landmark trace")
+parser.add_argument("output", help="output .npz or .csv path")
+parser.add_argument("--camera", type=int, default=1)
+parser.add_argument("--video", help="also save the raw frames to this video file")
+args = parser.parse_args()
+
+mp_hands = mp.solutions.hands
+hands = mp_hands.Hands(
+    static_image_mode=False,
+    max_num_hands=1,
+    model_complexity=0,
+    min_detection_confidence=0.6,
+    min_tracking_confidence=0.4
+)
+mp_drawing = mp.solutions.drawing_utils
+
+cap = cv2.VideoCapture(args.camera)
+writer = None
+timestamps, frames, strum_times, strum_directions = [], [], [], []
+start = time.monotonic()
+
+while cap.isOpened():
+    ret, frame = cap.read()
+    if not ret:
+        break
+    t = time.monotonic() - start
+    if args.video:
+        if writer is None:
+            height, width = frame.shape[:2]
+            writer = cv2.VideoWriter(args.video, cv2.VideoWriter_fourcc(*"mp4v"),
+                                     cap.get(cv2.CAP_PROP_FPS) or 30.0, (width, height))
+        writer.write(frame)
+    frame = cv2.flip(frame, 1)
+    results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+    points = np.full((NUM_LANDMARKS, 3), np.nan, dtype=np.float32)
+    if results.multi_hand_landmarks:
+        hand_landmarks = results.multi_hand_landmarks[0]
+        points[:] = [(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark]
+        mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
+    timestamps.append(t)
+    frames.append(points)
+
+    cv2.putText(frame, f"{len(strum_times)} strums marked (d/u, q to save)", (30, 50),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
+    cv2.imshow('Record Trace', frame)
+    key = cv2.waitKey(1) & 0xFF
+    if key == ord('d') or key == ord('u'):
+        strum_times.append(t)
+        strum_directions.append(1 if key == ord('d') else -1)
+    elif key == ord('q'):
+        break
+
+cap.release()
+if writer is not None:
+    writer.release()
+cv2.destroyAllWindows()
+
+save_trace(args.output, {
+    "t": np.array(timestamps),
+    "landmarks": np.array(frames, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 3),
+    "strum_times": np.array(strum_times),
+    "strum_directions": np.array(strum_directions, dtype=np.int8),
+})
+print(f"Saved {len(timestamps)} frames and {len(strum_times)} strums to {args.output}")
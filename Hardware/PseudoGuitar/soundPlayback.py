@@ -7,8 +7,9 @@ import logging
 logger = logging.getLogger("soundPlayback")
 
 class RealTimeStrumPlayer:
-    def __init__(self, file_path):
-        self.sound = AudioSegment.from_file(file_path)
+    def __init__(self, file_path, sound=None):
+        # sound: an already decoded AudioSegment for file_path, to skip decoding
+        self.sound = sound if sound is not None else AudioSegment.from_file(file_path)
         self.duration_ms = len(self.sound)
         self.play_obj = None
         self.play_thread = None
@@ -16,55 +17,55 @@ class RealTimeStrumPlayer:
         self.current_progress = 0.0  # 0–1
         self._fade_out_requested = False
         self._lock = threading.Lock()
+        self._raw = None
+        self._faded_raw = None
+
+    def prime(self):
+        """Build the PCM buffers for playback and fade-out now, so start() only hands them to the device"""
+        if self._raw is None:
+            self._raw = self.sound.raw_data
+            self._faded_raw = self.sound.fade_out(1000).raw_data
+        return self
+
+    def _play_buffer(self, raw_data):
+        return sa.play_buffer(
+            raw_data,
+            num_channels=self.sound.channels,
+            bytes_per_sample=self.sound.sample_width,
+            sample_rate=self.sound.frame_rate
+        )
 
     def play_segment(self, start_progress):
         start_ms = int(start_progress * self.duration_ms)
-        segment = self.sound[start_ms:]
         try:
-            play_obj = sa.play_buffer(
-                segment.raw_data,
-                num_channels=segment.channels,
-                bytes_per_sample=segment.sample_width,
-                sample_rate=segment.frame_rate
-            )
-            return play_obj
+            if start_ms == 0 and self._raw is not None:
+                return self._play_buffer(self._raw)
+            return self._play_buffer(self.sound[start_ms:].raw_data)
         except Exception as e:
             logger.warning(f"Failed to play audio segment: {e}")
             return None
 
     def start(self):
-        self.stop()  # Ensure previous playback is stopped
-        self.stop_event.clear()
-<<<<<<< Updated upstream
+        self.stop(wait=True)  # Ensure previous playback is stopped
+        self.stop_event = threading.Event()
+        self._fade_out_requested = False
         try:
             self.play_obj = self.play_segment(0.0)
-            self.play_thread = threading.Thread(target=self._monitor, daemon=True)
+            self.play_thread = threading.Thread(target=self._monitor, args=(self.play_obj, self.stop_event), daemon=True)
             self.play_thread.start()
         except Exception as e:
             logger.warning(f"Error starting playback: {e}")
-=======
-        self._fade_out_requested = False
-        self.play_obj = self.play_segment(0.0)
-        self.play_thread = threading.Thread(target=self._monitor)
-        self.play_thread.start()
->>>>>>> Stashed changes
 
-    def _monitor(self):
-        while not self.stop_event.is_set():
-            time.sleep(0.01)
+    def _monitor(self, play_obj, stop_event):
+        stop_event.wait()
         # Fade out if requested
         if self._fade_out_requested:
-            faded = self.sound.fade_out(1000)
-            fade_play = sa.play_buffer(
-                faded.raw_data,
-                num_channels=faded.channels,
-                bytes_per_sample=faded.sample_width,
-                sample_rate=faded.frame_rate
-            )
+            faded_raw = self._faded_raw if self._faded_raw is not None else self.sound.fade_out(1000).raw_data
+            fade_play = self._play_buffer(faded_raw)
             time.sleep(1)
             fade_play.stop()
-        if self.play_obj:
-            self.play_obj.stop()
+        if play_obj:
+            play_obj.stop()
 
     def update_progress(self, progress):
         if progress < self.current_progress or progress >= 1.0:
@@ -72,15 +73,15 @@ class RealTimeStrumPlayer:
             return
         self.current_progress = progress
 
-    def stop(self, fade_out_ms=1000):
+    def stop(self, fade_out_ms=1000, wait=False):
+        """Stop playback; the fade-out runs on the monitor thread, wait=True blocks until it is done"""
         with self._lock:
             if self.play_thread and self.play_thread.is_alive():
                 self._fade_out_requested = True
                 self.stop_event.set()
-                self.play_thread.join()
+                if wait:
+                    self.play_thread.join()
             elif self.play_obj:
                 self.play_obj.stop()
-        self.play_obj = None
-        self.play_thread = None
-        self.stop_event.clear()
-        self._fade_out_requested = False
+            self.play_obj = None
+            self.play_thread = None
@@ -0,0 +1,110 @@
+# strumDetector.py
+# Strum decision logic shared by the backend, strumming.py and the offline tools.
+# No camera, audio or globals: feed it timestamped hand features, get events back.
+import json
+
+from motionFilter import make_filter
+
+# hand center = midpoint of landmarks 9 and 13, thumb sign = landmarks 4 and 5
+CENTER_LANDMARKS = (9, 13)
+THUMB_TIP, INDEX_BASE = 4, 5
+
+
+def hand_features(points):
+    # points: 21 (x, y[, z]) landmark coordinates in normalized image space
+    center_x = (points[CENTER_LANDMARKS[0]][0] + points[CENTER_LANDMARKS[1]][0]) / 2
+    center_y = (points[CENTER_LANDMARKS[0]][1] + points[CENTER_LANDMARKS[1]][1]) / 2
+    thumb_distance = abs(points[THUMB_TIP][1] - points[INDEX_BASE][1])
+    ys = [p[1] for p in points]
+    hand_height = max(ys) - min(ys)
+    return center_x, center_y, thumb_distance, hand_height
+
+
+class StrumDetector:
+    # velocity_threshold is in the original per-frame units (normalized y per frame
+    # at nominal_interval seconds per frame), so existing tuning carries over while
+    # the filter itself works on real timestamps
+    def __init__(self, velocity_threshold=0.02, thumb_noise_threshold=0.05, stable_time=0.1,
+                 cooldown=0.2, max_strum_duration=4.0, filter_name="one_euro", filter_params=None,
+                 nominal_interval=0.1):
+        self.velocity_threshold = velocity_threshold
+        self.thumb_noise_threshold = thumb_noise_threshold
+        self.stable_time = stable_time
+        self.cooldown = cooldown
+        self.max_strum_duration = max_strum_duration
+        self.nominal_interval = nominal_interval
+        self.filter = make_filter(filter_name, **(filter_params or {}))
+        self.reset()
+
+    def reset(self):
+        self.filter.reset()
+        self.expected_direction_down = True
+        self.last_successful_direction = None
+        self.last_strum_time = None
+        self.strum_start_time = None
+        self.direction_down = True
+        self.direction_since = None
+        self.velocity = 0.0
+
+    def update(self, t, center_y, thumb_distance):
+        """Feed one frame; returns (event, direction_down, thumb_extended)
+
+        event is "strum" for a valid strum in the expected direction, "reset"
+        for a hand reset (thumb sign or direction mismatch), otherwise None.
+        """
+        _, velocity_per_second = self.filter.update(t, center_y)
+        velocity = velocity_per_second * self.nominal_interval
+        self.velocity = velocity
+        thumb_extended = thumb_distance > self.thumb_noise_threshold
+
+        direction_down = velocity > 0
+        if self.direction_since is None or direction_down != self.direction_down:
+            self.direction_down = direction_down
+            self.direction_since = t
+        stable_motion = t - self.direction_since >= self.stable_time
+
+        # incomplete strum timed out: require a fresh stable motion
+        if self.strum_start_time is not None and t - self.strum_start_time > self.max_strum_duration:
+            self.direction_since = t
+            self.strum_start_time = None
+
+        consecutive_same_direction = self.last_successful_direction == direction_down
+        cooled_down = self.last_strum_time is None or t - self.last_strum_time > self.cooldown
+        if not (stable_motion and abs(velocity) > self.velocity_threshold and cooled_down
+                and not consecutive_same_direction):
+            return None, direction_down, thumb_extended
+
+        self.strum_start_time = t
+        self.last_strum_time = t
+        # thumb extended = upstroke, thumb retracted = downstroke
+        valid_thumb_motion = (not thumb_extended) == direction_down
+        if valid_thumb_motion and direction_down == self.expected_direction_down:
+            event = "strum"
+            self.last_successful_direction = direction_down
+        else:
+            event = "reset"
+            # next strum in either direction is allowed after a reset
+            self.last_successful_direction = None
+        self.expected_direction_down = not self.expected_direction_down
+        self.direction_since = t
+        return event, direction_down, thumb_extended
+
+    def predict(self, t):
+        # extrapolated hand center y at time t (e.g. now + pipeline delay)
+        return self.filter.predict(t)
+
+
+def load_tuned_params(path, setup=None):
+    """StrumDetector keyword arguments saved by strumTuner.py for one user/camera setup
+
+    setup may be omitted when the file holds a single setup.
+    """
+    with open(path) as f:
+        setups = json.load(f)
+    if setup is None:
+        if len(setups) != 1:
+            raise KeyError(f"{path} has several setups ({', '.join(setups)}); choose one")
+        setup = next(iter(setups))
+    if setup not in setups:
+        raise KeyError(f"No setup {setup!r} in {path}")
+    return dict(setups[setup]["params"])
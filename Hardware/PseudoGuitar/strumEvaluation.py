@@ -0,0 +1,124 @@
+# strumEvaluation.py
+# Replay landmark traces through StrumDetector and compare detections with the
+# ground-truth strum onsets: detection latency vs. missed and false strums.
+#
+#   python strumEvaluation.py                      # synthetic trace
+#   python strumEvaluation.py traces/*.npz         # recorded traces
+import argparse
+import time
+
+import numpy as np
+
+from landmarkTrace import load_trace, synthesize_trace
+from strumDetector import StrumDetector, hand_features
+
+MAX_LATENCY = 0.5  # detections later than this after an onset do not count for it
+EARLY_TOLERANCE = 0.05
+
+
+def trace_features(trace):
+    # per-frame (t, center_y, thumb_distance) for frames with a detected hand
+    rows = []
+    for t, points in zip(trace["t"], trace["landmarks"]):
+        if np.isnan(points[0, 0]):
+            continue
+        _, center_y, thumb_distance, _ = hand_features(points)
+        rows.append((float(t), float(center_y), float(thumb_distance)))
+    return rows
+
+
+def run_detector(features, detector):
+    detector.reset()
+    detections = []
+    for t, center_y, thumb_distance in features:
+        event, direction_down, _ = detector.update(t, center_y, thumb_distance)
+        if event == "strum":
+            detections.append((t, 1 if direction_down else -1))
+    return detections
+
+
+def score_detections(detections, trace, max_latency=MAX_LATENCY):
+    onsets = trace["strum_times"]
+    directions = trace["strum_directions"]
+    used = [False] * len(detections)
+    latencies = []
+    wrong_direction = 0
+    j = 0
+    for onset, direction in zip(onsets, directions):
+        while j < len(detections) and detections[j][0] < onset - EARLY_TOLERANCE:
+            j += 1
+        k = j
+        while k < len(detections) and used[k]:
+            k += 1
+        if k < len(detections) and detections[k][0] <= onset + max_latency:
+            used[k] = True
+            latencies.append(detections[k][0] - onset)
+            if detections[k][1] != direction:
+                wrong_direction += 1
+    duration = float(trace["t"][-1] - trace["t"][0]) if len(trace["t"]) > 1 else 0.0
+    false_strums = used.count(False)
+    latencies = np.array(latencies)
+    return {
+        "onsets": int(len(onsets)),
+        "detected": int(len(latencies)),
+        "recall": len(latencies) / len(onsets) if len(onsets) else 0.0,
+        "false_strums": false_strums,
+        "false_per_minute": false_strums / (duration / 60.0) if duration else 0.0,
+        "wrong_direction": wrong_direction,
+        "latency_mean": float(latencies.mean()) if len(latencies) else None,
+        "latency_median": float(np.median(latencies)) if len(latencies) else None,
+        "latency_p90": float(np.percentile(latencies, 90)) if len(latencies) else None,
+    }
+
+
+def evaluate(traces, **detector_params):
+    # aggregate over several traces; traces are lists of precomputed features
+    detector = StrumDetector(**detector_params)
+    totals = {"onsets": 0, "detected": 0, "false_strums": 0, "wrong_direction": 0, "minutes": 0.0}
+    latencies = []
+    for trace, features in traces:
+        detections = run_detector(features, detector)
+        score = score_detections(detections, trace)
+        totals["onsets"] += score["onsets"]
+        totals["detected"] += score["detected"]
+        totals["false_strums"] += score["false_strums"]
+        totals["wrong_direction"] += score["wrong_direction"]
+        totals["minutes"] += (trace["t"][-1] - trace["t"][0]) / 60.0
+        if score["latency_mean"] is not None:
+            latencies.append((score["latency_mean"], score["detected"]))
+    detected = totals["detected"]
+    return {
+        "onsets": totals["onsets"],
+        "detected": detected,
+        "false_strums": totals["false_strums"],
+        "recall": detected / totals["onsets"] if totals["onsets"] else 0.0,
+        "false_per_minute": totals["false_strums"] / totals["minutes"] if totals["minutes"] else 0.0,
+        "wrong_direction": totals["wrong_direction"],
+        "latency_mean": sum(m * n for m, n in latencies) / detected if detected else None,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare hand-center filters on landmark traces")
+    parser.add_argument("traces", nargs="*", help="npz/CSV traces (default: a synthetic trace)")
+    parser.add_argument("--fps", type=float, default=10.0, help="frame rate of the synthetic trace")
+    args = parser.parse_args()
+
+    loaded = [load_trace(path) for path in args.traces] or [synthesize_trace(duration=120.0, fps=args.fps)]
+    traces = [(trace, trace_features(trace)) for trace in loaded]
+
+    configs = [
+        ("moving_average (old)", {"filter_name": "moving_average", "stable_time": 0.5}),
+        ("moving_average", {"filter_name": "moving_average"}),
+        ("one_euro", {"filter_name": "one_euro"}),
+        ("kalman", {"filter_name": "kalman"}),
+    ]
+    print(f"{'filter':22} {'recall':>7} {'false/min':>10} {'wrong dir':>10} {'latency ms':>11} {'us/frame':>9}")
+    frames = sum(len(features) for _, features in traces)
+    for name, params in configs:
+        start = time.perf_counter()
+        result = evaluate(traces, **params)
+        per_frame = (time.perf_counter() - start) / frames * 1e6
+        latency = f"{result['latency_mean'] * 1000:.0f}" if result["latency_mean"] is not None else "-"
+        print(f"{name:22} {result['recall']:7.1%} {result['false_per_minute']:10.2f} "
+              f"{result['wrong_direction']:10d} {latency:>11} {per_frame:9.1f}")
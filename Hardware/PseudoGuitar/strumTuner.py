@@ -0,0 +1,192 @@
+# strumTuner.py
+# Search StrumDetector thresholds and filter parameters on labelled landmark
+# traces, in parallel across a process pool, and save the best set per user or
+# camera setup for the backend (GUITARZENO_STRUM_PARAMS) and strumming.py.
+#
+#   python strumTuner.py traces/alice/*.npz traces/bob/*.npz --group-by dir -o strum_params.json
+#   python strumTuner.py traces/*.npz --search random --samples 2000 --rounds 3
+#
+# Configs are ranked by errors per ground-truth strum (missed + false + wrong
+# direction) plus a small penalty on mean detection latency. strum_distance and
+# ref_hand_height only shape playback, not detection, so they are not tuned here.
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from landmarkTrace import load_trace, synthesize_trace
+from strumEvaluation import MAX_LATENCY, evaluate, trace_features
+
+LATENCY_WEIGHT = 0.2  # error-rate points per second of latency: 100 ms costs as much as 2% errors
+
+# detector parameters shared by every filter: (grid values, search range)
+DETECTOR_SPACE = {
+    "velocity_threshold": ([0.005, 0.01, 0.015, 0.02, 0.03, 0.04], (0.003, 0.06)),
+    "thumb_noise_threshold": ([0.03, 0.04, 0.05, 0.07, 0.09], (0.02, 0.12)),
+    "stable_time": ([0.0, 0.05, 0.1, 0.15, 0.2], (0.0, 0.25)),
+    "cooldown": ([0.1, 0.2, 0.3, 0.4], (0.05, 0.5)),
+}
+FILTER_SPACE = {
+    "one_euro": {
+        "min_cutoff": ([0.5, 1.0, 1.5, 3.0], (0.3, 5.0)),
+        "beta": ([2.0, 5.0, 8.0, 15.0], (1.0, 25.0)),
+    },
+    "kalman": {
+        "acceleration_noise": ([10.0, 20.0, 40.0, 80.0], (5.0, 150.0)),
+        "measurement_noise": ([0.002, 0.004, 0.008], (0.001, 0.015)),
+    },
+    "moving_average": {
+        "window": ([3, 5, 7, 10], (2, 12)),
+    },
+}
+
+_traces = None  # (trace, features) pairs of the group being tuned, set once per worker
+
+
+def _init_worker(traces):
+    global _traces
+    _traces = traces
+
+
+def detector_params(config, filter_name, nominal_interval):
+    filter_keys = FILTER_SPACE[filter_name]
+    return {
+        **{key: value for key, value in config.items() if key not in filter_keys},
+        "filter_name": filter_name,
+        "filter_params": {key: value for key, value in config.items() if key in filter_keys},
+        "nominal_interval": nominal_interval,
+    }
+
+
+def objective(result):
+    # lower is better
+    if not result["onsets"]:
+        return math.inf
+    errors = (result["onsets"] - result["detected"]) + result["false_strums"] + result["wrong_direction"]
+    latency = result["latency_mean"] if result["latency_mean"] is not None else MAX_LATENCY
+    return errors / result["onsets"] + LATENCY_WEIGHT * latency
+
+
+def _score(job):
+    config, filter_name, nominal_interval = job
+    result = evaluate(_traces, **detector_params(config, filter_name, nominal_interval))
+    return objective(result), config, result
+
+
+def grid_configs(filter_name):
+    space = {**DETECTOR_SPACE, **FILTER_SPACE[filter_name]}
+    keys = list(space)
+    for values in itertools.product(*(space[key][0] for key in keys)):
+        yield dict(zip(keys, values))
+
+
+def _sample(space, rng, around=None, radius=1.0):
+    config = {}
+    for key, (_, (low, high)) in space.items():
+        if around is None:
+            value = rng.uniform(low, high)
+        else:
+            value = min(high, max(low, rng.gauss(around[key], radius * (high - low))))
+        config[key] = round(value) if isinstance(low, int) else round(value, 4)
+    return config
+
+
+def search(traces, filter_name, nominal_interval, method="grid", samples=1000, rounds=3,
+           keep=10, workers=None, seed=0):
+    """Returns [(objective, config, result)] sorted best first"""
+    space = {**DETECTOR_SPACE, **FILTER_SPACE[filter_name]}
+    rng = random.Random(seed)
+    scored = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(traces,)) as pool:
+        def run(configs):
+            jobs = [(config, filter_name, nominal_interval) for config in configs]
+            chunk = max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 8))
+            scored.extend(pool.map(_score, jobs, chunksize=chunk))
+            scored.sort(key=lambda item: item[0])
+
+        if method == "grid":
+            run(list(grid_configs(filter_name)))
+        else:
+            # random search, then rounds of sampling around the best configs with a shrinking radius
+            run([_sample(space, rng) for _ in range(samples)])
+            radius = 0.15
+            for _ in range(rounds):
+                best = [config for _, config, _ in scored[:keep]]
+                run([_sample(space, rng, around=best[i % len(best)], radius=radius) for i in range(samples // 2)])
+                radius /= 2
+    return scored
+
+
+def group_traces(paths, group_by, name):
+    groups = {}
+    for path in paths:
+        if group_by == "dir":
+            key = os.path.basename(os.path.dirname(os.path.abspath(path)))
+        elif group_by == "prefix":
+            key = os.path.basename(path).split("_")[0].split(".")[0]
+        else:
+            key = name
+        groups.setdefault(key, []).append(path)
+    return groups
+
+
+def _summary(result):
+    latency = f"{result['latency_mean'] * 1000:.0f} ms" if result["latency_mean"] is not None else "-"
+    return (f"recall {result['recall']:.1%}, {result['false_per_minute']:.2f} false/min, "
+            f"{result['wrong_direction']} wrong direction, latency {latency}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tune strum detection parameters on landmark traces")
+    parser.add_argument("traces", nargs="*", help="npz/CSV traces (default: a synthetic trace)")
+    parser.add_argument("--group-by", choices=["none", "dir", "prefix"], default="none",
+                        help="tune separately per parent directory or per filename prefix (alice_desk.npz -> alice)")
+    parser.add_argument("--name", default="default", help="setup name when not grouping")
+    parser.add_argument("--filter", choices=list(FILTER_SPACE), default="one_euro")
+    parser.add_argument("--nominal-interval", type=float, default=0.1,
+                        help="seconds per frame the velocity threshold refers to (backend: 0.1, strumming.py: 1/30)")
+    parser.add_argument("--search", choices=["grid", "random"], default="grid")
+    parser.add_argument("--samples", type=int, default=2000, help="random search: configs per round")
+    parser.add_argument("--rounds", type=int, default=3, help="random search: refinement rounds")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("-o", "--output", default="strum_params.json")
+    args = parser.parse_args()
+
+    if args.traces:
+        groups = {key: [load_trace(path) for path in paths]
+                  for key, paths in group_traces(args.traces, args.group_by, args.name).items()}
+    else:
+        groups = {args.name: [synthesize_trace(duration=120.0)]}
+
+    saved = {}
+    if os.path.exists(args.output):
+        with open(args.output) as f:
+            saved = json.load(f)
+
+    for setup, loaded in groups.items():
+        traces = [(trace, trace_features(trace)) for trace in loaded]
+        start = time.perf_counter()
+        scored = search(traces, args.filter, args.nominal_interval, method=args.search,
+                        samples=args.samples, rounds=args.rounds, workers=args.workers)
+        elapsed = time.perf_counter() - start
+        baseline = evaluate(traces, filter_name=args.filter, nominal_interval=args.nominal_interval)
+        score, config, result = scored[0]
+        print(f"{setup}: {len(scored)} configs on {len(traces)} traces in {elapsed:.1f} s "
+              f"({len(scored) / elapsed:.0f} configs/s)")
+        print(f"  defaults: {_summary(baseline)} (score {objective(baseline):.3f})")
+        print(f"  best    : {_summary(result)} (score {score:.3f})")
+        print(f"  {config}")
+        saved[setup] = {
+            "params": detector_params(config, args.filter, args.nominal_interval),
+            "metrics": result,
+            "score": score,
+            "traces": len(traces),
+        }
+
+    with open(args.output, "w") as f:
+        json.dump(saved, f, indent=2)
+    print(f"Saved {len(groups)} setup(s) to {args.output}")
@@ -5,6 +5,7 @@ import numpy as np
 from collections import deque
 from soundPlayback import RealTimeStrumPlayer
 from chordDetection import ChordDetector
+from strumDetector import StrumDetector, load_tuned_params
 
 
 # mode settings
@@ -18,9 +19,13 @@ manual_strum_distance = 0.3 #need to play with this-->audio is getting cut off.
 
 # hyperparameters
 INIT_FRAMES = 10     # Frames used for initialization (thresholds)
-STRUM_FRAMES = 5     # Frames used for gesture stability detection (~5 strums/sec)
+STABLE_TIME = 0.1    # Seconds the filtered direction must hold before a strum counts
 COOLDOWN = 0.2       # Seconds between strums
 MAX_STRUM_DURATION = 4.0  # Timeout for incomplete strum
+HAND_FILTER = "one_euro"  # one_euro, kalman or moving_average (old 10-frame mean)
+FRAME_INTERVAL = 1 / 30   # nominal seconds per frame; velocity threshold is per frame at this rate
+TUNED_PARAMS = None  # strumTuner.py output (e.g. "strum_params.json"); overrides the values above
+TUNED_SETUP = None   # setup name in TUNED_PARAMS, None if it holds just one
 
 
 # initialize mediapipe
@@ -45,11 +50,20 @@ strum_distance = manual_strum_distance
 
 prev_hand_center = None
 initial_thumb_extended = None
-gesture_window = deque(maxlen=STRUM_FRAMES)
-last_strum_time = 0
-strum_start_time = None
-expected_direction_down = True
-last_successful_strum_direction = None
+strum_params = dict(
+    velocity_threshold=velocity_threshold,
+    thumb_noise_threshold=thumb_noise_threshold,
+    stable_time=STABLE_TIME,
+    cooldown=COOLDOWN,
+    max_strum_duration=MAX_STRUM_DURATION,
+    filter_name=HAND_FILTER,
+    nominal_interval=FRAME_INTERVAL,
+)
+if TUNED_PARAMS:
+    strum_params.update(load_tuned_params(TUNED_PARAMS, TUNED_SETUP))
+strum_detector = StrumDetector(**strum_params)
+# the tuned value wins over the manual one, including for the init check below
+thumb_noise_threshold = strum_params["thumb_noise_threshold"]
 
 strum_in_progress = False
 strum_total_distance = strum_distance 
@@ -67,6 +81,7 @@ while cap.isOpened():
     ret, frame = cap.read()
     if not ret:
         break
+    frame_time = time.monotonic()
 
     frame = cv2.flip(frame, 1)
     rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
@@ -113,6 +128,7 @@ while cap.isOpened():
                     #velocity_threshold = np.mean([abs(hand_positions[i][1] - hand_positions[i-1][1])
                     #                            for i in range(1, INIT_FRAMES)])
                     #thumb_noise_threshold = np.mean(thumb_distances)
+                    #strum_detector.thumb_noise_threshold = thumb_noise_threshold
                     lm17 = hand_landmarks.landmark[17]
                     strum_distance = 1.5 * abs(lm5.y - lm17.y)  # approximate hand length
                     initial_thumb_extended = thumb_distance > thumb_noise_threshold
@@ -121,14 +137,12 @@ while cap.isOpened():
 
                 continue  # skip detection until initialized
 
-            # calculate y-direction velocity
+            # filtered y-direction velocity and strum decision (timestamped, not frame-counted)
             if prev_hand_center is None:
                 prev_hand_center = hand_center
-                continue
-            vel_y = hand_center[1] - prev_hand_center[1]
-            velocities.append(vel_y)
-            smoothed_velocity = np.mean(list(velocities))
-            current_direction_down = smoothed_velocity > 0  # True = down, False = up
+            event, current_direction_down, thumb_extended = strum_detector.update(
+                frame_time, hand_center[1], thumb_distance)
+            smoothed_velocity = strum_detector.velocity
 
             prev_hand_center = hand_center
 
@@ -151,79 +165,42 @@ while cap.isOpened():
                     current_player.stop()
                     strum_in_progress = False
 
-            # stabilize gesture
-            gesture_window.append(current_direction_down)
-            stable_motion = len(gesture_window) == STRUM_FRAMES and all(x == current_direction_down for x in gesture_window)
-
-            # hand sign direction logic
             # Thumb extended = Upstroke, Thumb retracted = Downstroke
-            thumb_extended = thumb_distance > thumb_noise_threshold
-            thumb_direction_down = not thumb_extended
-            valid_thumb_motion = thumb_direction_down == current_direction_down
+            if event == "strum":
+                # Successful strum
+                print(f"Successful strum! Direction: {'Down' if current_direction_down else 'Up'} Time: {frame_time}")
+                chord = detector.get_current_chord()
 
-            # check strum conditions
-            if len(hand_positions) == 0:
-                hand_positions.append(hand_center)
-                continue
-            distance_moved = abs(hand_center[1] - hand_positions[-1][1])
-            current_time = time.time()
-
-            # 4-second timeout
-            if strum_start_time and current_time - strum_start_time > MAX_STRUM_DURATION:
-                prev_hand_center = hand_positions[-1]
-                gesture_window.clear()
-                strum_start_time = None
-
-            # Prevent consecutive strums in same direction without reset
-            consecutive_same_direction = last_successful_strum_direction == current_direction_down
-
-            # Only start strum if stable, velocity threshold exceeded, cooldown passed, and not consecutive same direction
-            if stable_motion and abs(smoothed_velocity) > velocity_threshold and current_time - last_strum_time > COOLDOWN and not consecutive_same_direction:
-                strum_start_time = current_time
-                last_strum_time = current_time
-
-                if valid_thumb_motion and current_direction_down == expected_direction_down:
-                    # Successful strum
-                    print(f"Successful strum! Direction: {'Down' if current_direction_down else 'Up'} Time: {strum_start_time}")
-                    chord = detector.get_current_chord()
-
-                    if chord == "None" or chord == "":
-                        if current_player:
-                            current_player.stop()
-                        current_player = None
-                        strum_in_progress = False
-                        print("No chord detected. Skipping sound.")
-                    else:
-                        # Always stop previous player before starting new one
-                        if current_player:
-                            current_player.stop()
-                        if current_direction_down:
-                            file_path = chord + "_down.wav"
-                        else:
-                            file_path = chord + "_up.wav"
-                        file_path = "chord_sounds/" + file_path
-
-                        current_player = RealTimeStrumPlayer(file_path)
-                        current_player.start()
-                        strum_start_y = hand_center[1]
-                        strum_in_progress = True
-                    
-                    hand_positions.append(hand_center)
-                    expected_direction_down = not expected_direction_down  # toggle expected direction
-                    last_successful_strum_direction = current_direction_down
-                    gesture_window.clear()
+                if chord == "None" or chord == "" or chord is None:
+                    if current_player:
+                        current_player.stop()
+                    current_player = None
+                    strum_in_progress = False
+                    print("No chord detected. Skipping sound.")
                 else:
-                    # Mismatched thumb: Successful reset
-                    #print(f"Successful reset. Direction attempted: {'Down' if current_direction_down else 'Up'}")
+                    # Always stop previous player before starting new one
                     if current_player:
                         current_player.stop()
-                        strum_in_progress = False
-                        current_player = None
-                    hand_positions.append(hand_center)
-                    expected_direction_down = not expected_direction_down
-                    gesture_window.clear()
-                    # reset last strum direction so next strum in either direction is allowed
-                    last_successful_strum_direction = None
+                    if current_direction_down:
+                        file_path = chord + "_down.wav"
+                    else:
+                        file_path = chord + "_up.wav"
+                    file_path = "chord_sounds/" + file_path
+
+                    current_player = RealTimeStrumPlayer(file_path)
+                    current_player.start()
+                    strum_start_y = hand_center[1]
+                    strum_in_progress = True
+
+                hand_positions.append(hand_center)
+            elif event == "reset":
+                # Mismatched thumb: Successful reset
+                #print(f"Successful reset. Direction attempted: {'Down' if current_direction_down else 'Up'}")
+                if current_player:
+                    current_player.stop()
+                    strum_in_progress = False
+                    current_player = None
+                hand_positions.append(hand_center)
 
             # visualize on opencv window
             h, w, _ = frame.shape
@@ -16,6 +16,7 @@ import {
 } from 'lucide-react'
 import Navigation from '@/components/Navigation'
 import ChordDisplay from '@/components/ChordDisplay'
+import HandOverlay, { LandmarksMessage } from '@/components/HandOverlay'
 
 interface DetectionData {
   chord: string
@@ -33,6 +34,7 @@ export default function FreeplayPage() {
   const [isConnected, setIsConnected] = useState(false)
   const [isStreaming, setIsStreaming] = useState(false)
   const [detectionData, setDetectionData] = useState<DetectionData | null>(null)
+  const [landmarks, setLandmarks] = useState<LandmarksMessage | null>(null)
   const [error, setError] = useState<string | null>(null)
   const videoRef = useRef<HTMLImageElement>(null)
   const wsRef = useRef<WebSocket | null>(null)
@@ -52,8 +54,14 @@ export default function FreeplayPage() {
         
         ws.onmessage = (event) => {
           try {
-            const data: DetectionData = JSON.parse(event.data)
-            setDetectionData(data)
+            const data = JSON.parse(event.data)
+            if (data.type === 'landmarks') {
+              setLandmarks(data as LandmarksMessage)
+              return
+            }
+            // Other typed messages (rhythm scores, ...) are not detection updates
+            if (data.type) return
+            setDetectionData(data as DetectionData)
             
             // Update chord
             if (data.chord && data.chord !== 'None') {
@@ -222,20 +230,24 @@ export default function FreeplayPage() {
             </h3>
             <div className="relative bg-black rounded-xl overflow-hidden aspect-video flex items-center justify-center">
               {isStreaming ? (
-                <img
-                  ref={videoRef}
-                  src="http://localhost:8000/video_feed"
-                  alt="Video feed"
-                  className="w-full h-full object-contain"
-                  style={{ imageRendering: 'auto' }}
-                  onError={(e) => {
-                    console.error('Video stream error')
-                    setError('Could not load video stream. Make sure the backend is running.')
-                  }}
-                  onLoad={() => {
-                    setError(null)
-                  }}
-                />
+                <>
+                  <img
+                    ref={videoRef}
+                    src="http://localhost:8000/video_feed"
+                    alt="Video feed"
+                    className="w-full h-full object-contain"
+                    // MJPEG passthrough frames come straight from the camera, unmirrored
+                    style={{ imageRendering: 'auto', transform: landmarks?.mirror_video ? 'scaleX(-1)' : undefined }}
+                    onError={(e) => {
+                      console.error('Video stream error')
+                      setError('Could not load video stream. Make sure the backend is running.')
+                    }}
+                    onLoad={() => {
+                      setError(null)
+                    }}
+                  />
+                  <HandOverlay landmarks={landmarks} />
+                </>
               ) : (
                 <div className="absolute inset-0 flex items-center justify-center bg-gray-900/80">
                   <div className="text-center">
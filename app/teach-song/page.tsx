@@ -30,14 +30,69 @@ async function fetchChordProgression(songName: string) {
   return data.result
 }
 
-async function fetchFeedback(playedChord: string, expectedChord: string) {
-  const res = await fetch("/api/feedback", {
+// Streams the progression over server-sent events, reporting each chord as soon as it is parsed
+async function streamChordProgression(
+  songName: string,
+  onText: (text: string) => void,
+  onChord: (chord: string) => void,
+) {
+  const res = await fetch("/api/teach-song/stream", {
     method: "POST",
     headers: { "Content-Type": "application/json" },
-    body: JSON.stringify({ played_chord: playedChord, expected_chord: expectedChord })
+    body: JSON.stringify({ song_name: songName })
+  })
+  if (!res.body) {
+    return fetchChordProgression(songName)
+  }
+  const reader = res.body.getReader()
+  const decoder = new TextDecoder()
+  let buffer = ""
+  let text = ""
+  while (true) {
+    const { done, value } = await reader.read()
+    if (done) break
+    buffer += decoder.decode(value, { stream: true })
+    const events = buffer.split("\n\n")
+    buffer = events.pop() ?? ""
+    for (const raw of events) {
+      const eventLine = raw.split("\n").find((line) => line.startsWith("event: "))
+      const dataLine = raw.split("\n").find((line) => line.startsWith("data: "))
+      if (!eventLine || !dataLine) continue
+      const data = JSON.parse(dataLine.slice(6))
+      const event = eventLine.slice(7)
+      if (event === "token") {
+        text += data.text
+        onText(text)
+      } else if (event === "chord") {
+        onChord(data.chord)
+      } else if (event === "done") {
+        text = data.result
+      }
+    }
+  }
+  return text
+}
+
+type ChordAttempt = {
+  played_chord: string
+  expected_chord: string
+  timestamp: number
+}
+
+// Grades a whole run in one round-trip: per-chord feedback plus a summary
+async function fetchFeedbackBatch(attempts: ChordAttempt[]) {
+  const res = await fetch("/api/feedback/batch", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ attempts })
   })
   const data = await res.json()
-  return data.result
+  const { summary } = data
+  const misses = data.results
+    .filter((result: { correct: boolean }) => !result.correct)
+    .map((result: { index: number; result: string }) => `Chord ${result.index + 1}: ${result.result}`)
+  const headline = `${summary.correct} of ${summary.total} chords correct, longest streak ${summary.longest_streak}.`
+  return [headline, ...misses].join("\n")
 }
 
 async function fetchSongRecommendation(query: string) {
@@ -74,6 +129,7 @@ export default function TeachSongPage() {
   const [loopSection, setLoopSection] = useState(false)
   const [aiChordProgression, setAiChordProgression] = useState<string>("");
   const [aiFeedback, setAiFeedback] = useState<string>("");
+  const [attempts, setAttempts] = useState<ChordAttempt[]>([]);
   const [aiRecommendation, setAiRecommendation] = useState<string>("");
 
   // Mock suggested songs
@@ -88,19 +144,25 @@ export default function TeachSongPage() {
   const handleSearch = async (e: React.FormEvent) => {
     e.preventDefault()
     if (searchQuery) {
-      // Call backend for chord progression
-      const progression = await fetchChordProgression(searchQuery);
-      setAiChordProgression(progression);
-      speakText(progression);
+      // Stream the chord progression so chords show up while the model is still writing
+      setAiChordProgression("");
       setSelectedSong({
         title: searchQuery,
         artist: "",
-        chords: progression.split(/\s|,|\n/).filter(Boolean),
+        chords: [],
         tempo: 120,
         strummingPattern: "",
         difficulty: "Unknown",
       });
       setCurrentChordIndex(0);
+      setAttempts([]);
+      const progression = await streamChordProgression(
+        searchQuery,
+        (text) => setAiChordProgression(text),
+        (chord) => setSelectedSong((song) => song && { ...song, chords: [...song.chords, chord] }),
+      );
+      setAiChordProgression(progression);
+      speakText(progression);
     }
   }
 
@@ -114,6 +176,7 @@ export default function TeachSongPage() {
       difficulty: song.difficulty,
     })
     setCurrentChordIndex(0)
+    setAttempts([])
   }
 
   const handlePlayPause = () => {
@@ -121,18 +184,30 @@ export default function TeachSongPage() {
   }
 
   const handleNextChord = async () => {
-    if (selectedSong && currentChordIndex < selectedSong.chords.length - 1) {
+    if (selectedSong && currentChordIndex < selectedSong.chords.length) {
       const playedChord = selectedSong.chords[currentChordIndex];
       const expectedChord = selectedSong.chords[currentChordIndex];
-      // Call backend for feedback
-      const feedback = await fetchFeedback(playedChord, expectedChord);
+      const run = [...attempts, { played_chord: playedChord, expected_chord: expectedChord, timestamp: Date.now() / 1000 }];
+      if (currentChordIndex < selectedSong.chords.length - 1) {
+        // Collect the run locally; it is graded in one request at the end
+        setAttempts(run);
+        setCurrentChordIndex(currentChordIndex + 1);
+        return;
+      }
+      // Last chord: grade the run and start the next one from the top
+      handleRestart();
+      const feedback = await fetchFeedbackBatch(run);
       setAiFeedback(feedback);
       speakText(feedback);
-      setCurrentChordIndex(currentChordIndex + 1);
-      setTimeout(() => setAiFeedback(""), 3000);
+      setTimeout(() => setAiFeedback(""), 8000);
     }
   }
 
+  const handleRestart = () => {
+    setCurrentChordIndex(0)
+    setAttempts([])
+  }
+
   const handleRecommendation = async (query: string) => {
     const rec = await fetchSongRecommendation(query);
     setAiRecommendation(rec);
@@ -316,7 +391,7 @@ export default function TeachSongPage() {
                   <Repeat className="w-5 h-5" />
                 </button>
                 <button
-                  onClick={() => setCurrentChordIndex(0)}
+                  onClick={handleRestart}
                   className="p-3 bg-gray-800 hover:bg-gray-700 rounded-full transition-colors"
                 >
                   <RotateCcw className="w-5 h-5" />
@@ -361,7 +436,7 @@ export default function TeachSongPage() {
               <button
                 onClick={() => {
                   setSelectedSong(null)
-                  setCurrentChordIndex(0)
+                  handleRestart()
                   setIsPlaying(false)
                 }}
                 className="mt-4 w-full py-3 bg-gray-800 hover:bg-gray-700 rounded-lg transition-colors"
@@ -0,0 +1,103 @@
+"""
+Cold-start time of the backend: launch uvicorn in a fresh process and time the
+first successfully served request, then (unless API-only) how long the
+background hardware initialization takes to settle. Also times importing the
+vision stack alone, which is what used to sit in front of the first request.
+
+    python -m backend.benchmarks.cold_start --runs 5
+    python -m backend.benchmarks.cold_start --api-only
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get(url):
+    with urllib.request.urlopen(url, timeout=1) as response:
+        return json.loads(response.read())
+
+
+def run_once(api_only, timeout):
+    port = _free_port()
+    env = dict(os.environ, GUITARZENO_SESSION_DIR=tempfile.mkdtemp(prefix="gz-sessions-"))
+    if api_only:
+        env["GUITARZENO_API_ONLY"] = "1"
+    start = time.monotonic()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    first_request = hardware_settled = None
+    status = None
+    try:
+        while time.monotonic() - start < timeout:
+            try:
+                status = _get(f"http://127.0.0.1:{port}/")["hardware"]["status"]
+            except OSError:
+                time.sleep(0.01)
+                continue
+            now = time.monotonic() - start
+            if first_request is None:
+                first_request = now
+            if status not in ("pending", "loading"):
+                hardware_settled = now
+                break
+            time.sleep(0.02)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+    return first_request, hardware_settled, status
+
+
+def vision_import_time():
+    code = "import time; t = time.perf_counter(); import cv2, mediapipe, serial; print(time.perf_counter() - t)"
+    try:
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        return float(output.strip().splitlines()[-1])
+    except (subprocess.CalledProcessError, ValueError, IndexError):
+        return None
+
+
+def _fmt(value):
+    return f"{value:.2f} s" if value is not None else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--api-only", action="store_true", help="start with GUITARZENO_API_ONLY=1")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    first, settled = [], []
+    for i in range(args.runs):
+        first_request, hardware_settled, status = run_once(args.api_only, args.timeout)
+        print(f"run {i + 1}: first request {_fmt(first_request)}, hardware {status} after {_fmt(hardware_settled)}")
+        if first_request is not None:
+            first.append(first_request)
+        if hardware_settled is not None:
+            settled.append(hardware_settled)
+
+    print(f"median time to first served request: {_fmt(statistics.median(first) if first else None)}")
+    if not args.api_only:
+        print(f"median time to hardware settled:     {_fmt(statistics.median(settled) if settled else None)}")
+    print(f"import cv2 + mediapipe + serial alone: {_fmt(vision_import_time())}")
+
+
+if __name__ == "__main__":
+    main()
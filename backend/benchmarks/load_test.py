@@ -0,0 +1,368 @@
+"""
+Whole-backend load test without hardware
+Starts the app in a uvicorn subprocess with a recording as the camera
+(GUITARZENO_CAMERA_SOURCE), a pty virtual glove replaying a chord script
+(GUITARZENO_SERIAL_PORT) and fake_openrouter as the LLM, then drives N /ws
+clients, M /video_feed viewers and a stream of /api/* calls for a while.
+
+Reports:
+  chord latency   glove writes a chord -> first /ws message carrying it
+  glass-to-ws     frame capture -> landmarks message received (needs hand tracking)
+  /ws, /api       message rates, per-endpoint request latency and errors
+  viewers         frames received, fps, frames dropped vs. frames published
+  server          CPU % and RSS (mean / peak), from /proc
+
+Runs headless (Linux); with no --source a synthetic MJPEG clip is generated.
+
+    python -m backend.benchmarks.load_test --ws 8 --viewers 4 --duration 30
+    python -m backend.benchmarks.load_test --source session.mp4 --chords chords.txt --json report.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import numpy as np
+import websockets
+
+from backend import fake_openrouter
+from backend.benchmarks.cold_start import REPO_ROOT, _free_port
+from backend.virtual_glove import VirtualGlove, parse_script
+
+API_CALLS = [
+    ("POST", "/api/feedback", {"played_chord": "C_major", "expected_chord": "G_major"}),
+    ("GET", "/api/songs/search?q=wonderwal", None),
+    ("POST", "/api/teach-song", {"song_name": "Load Test Song {n}"}),
+    ("POST", "/api/feedback", {"played_chord": "Cadd9", "expected_chord": "G"}),
+    ("POST", "/api/recommend-song", {"query": "upbeat songs with {n} chords"}),
+    ("POST", "/api/teach-song/stream", {"song_name": "Streamed Song {n}"}),
+]
+
+
+def percentiles(values):
+    if not values:
+        return None
+    ms = np.array(values) * 1000.0
+    return {
+        "n": len(values),
+        "p50_ms": round(float(np.percentile(ms, 50)), 1),
+        "p95_ms": round(float(np.percentile(ms, 95)), 1),
+        "p99_ms": round(float(np.percentile(ms, 99)), 1),
+        "max_ms": round(float(ms.max()), 1),
+    }
+
+
+def _request(base, method, path, body=None, timeout=30):
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(base + path, data=data, method=method,
+                                     headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        payload = response.read()
+    return json.loads(payload) if response.headers.get_content_type() == "application/json" else payload
+
+
+def start_server(port, env, log_path, timeout):
+    log = open(log_path, "wb")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=REPO_ROOT, env=env, stdout=log, stderr=subprocess.STDOUT,
+    )
+    base = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and server.poll() is None:
+        try:
+            hardware = _request(base, "GET", "/", timeout=1)["hardware"]
+            if hardware["status"] not in ("pending", "loading"):
+                return server, hardware
+        except OSError:
+            pass
+        time.sleep(0.1)
+    return server, None
+
+
+class ProcessSampler:
+    """CPU % and memory of one process from /proc/<pid>/stat and status"""
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.tick = os.sysconf("SC_CLK_TCK")
+        self.cpu = []
+        self.rss_mb = []
+        self.hwm_mb = None
+        self._last = None
+
+    def _cpu_seconds(self):
+        with open(f"/proc/{self.pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / self.tick  # utime + stime
+
+    def sample(self):
+        try:
+            now, cpu = time.monotonic(), self._cpu_seconds()
+            with open(f"/proc/{self.pid}/status") as f:
+                status = dict(line.split(":", 1) for line in f if ":" in line)
+        except (OSError, IndexError):
+            return
+        if self._last is not None:
+            self.cpu.append(100.0 * (cpu - self._last[1]) / max(now - self._last[0], 1e-6))
+        self._last = (now, cpu)
+        self.rss_mb.append(int(status["VmRSS"].split()[0]) / 1024)
+        self.hwm_mb = int(status["VmHWM"].split()[0]) / 1024
+
+    def report(self):
+        return {
+            "cpu_percent_mean": round(float(np.mean(self.cpu)), 1) if self.cpu else None,
+            "cpu_percent_peak": round(float(np.max(self.cpu)), 1) if self.cpu else None,
+            "rss_mb_mean": round(float(np.mean(self.rss_mb)), 1) if self.rss_mb else None,
+            "rss_mb_peak": round(self.hwm_mb, 1) if self.hwm_mb else None,
+        }
+
+
+async def ws_client(url, glove, stop, results):
+    chord_latency, glass_to_ws, counts = [], [], {}
+    connected = time.monotonic()
+    matched = set()
+    try:
+        async with websockets.connect(url, max_size=None) as ws:
+            while not stop.is_set():
+                try:
+                    message = json.loads(await asyncio.wait_for(ws.recv(), timeout=0.5))
+                except asyncio.TimeoutError:
+                    continue
+                now = time.monotonic()
+                kind = message.get("type", "detection")
+                counts[kind] = counts.get(kind, 0) + 1
+                if kind == "landmarks" and message.get("captured_at") is not None:
+                    glass_to_ws.append(now - message["captured_at"])
+                chord = message.get("chord")
+                if chord and chord != "None":
+                    # the latest glove write of this chord, counted on its first arrival only
+                    sent = [t for t, c in list(glove.changes) if c == chord and connected <= t <= now]
+                    if sent and sent[-1] not in matched:
+                        matched.add(sent[-1])
+                        chord_latency.append(now - sent[-1])
+    except (OSError, websockets.WebSocketException) as e:
+        results["errors"].append(f"ws: {e!r}")
+    results["chord_latency"].extend(chord_latency)
+    results["glass_to_ws"].extend(glass_to_ws)
+    for kind, count in counts.items():
+        results["messages"][kind] = results["messages"].get(kind, 0) + count
+
+
+async def viewer(port, path, stop, results):
+    frames = 0
+    first = last = None
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n".encode())
+        await writer.drain()
+        tail = b""
+        while not stop.is_set():
+            try:
+                chunk = await asyncio.wait_for(reader.read(65536), timeout=0.5)
+            except asyncio.TimeoutError:
+                continue
+            if not chunk:
+                break
+            data = tail + chunk
+            found = data.count(b"--frame\r\n")
+            if found:
+                last = time.monotonic()
+                first = first or last
+                frames += found
+            tail = data[-8:]  # a boundary split across reads
+        writer.close()
+    except OSError as e:
+        results["errors"].append(f"viewer: {e!r}")
+    results["viewers"].append({
+        "path": path,
+        "frames": frames,
+        "fps": round((frames - 1) / (last - first), 1) if frames > 1 and last > first else 0.0,
+    })
+
+
+async def api_caller(base, rate, stop, results, offset):
+    n = offset
+    while not stop.is_set():
+        method, path, body = API_CALLS[n % len(API_CALLS)]
+        if body is not None:
+            body = {key: value.format(n=n) for key, value in body.items()}
+        start = time.monotonic()
+        try:
+            await asyncio.to_thread(_request, base, method, path, body)
+            results["api"].setdefault(path, []).append(time.monotonic() - start)
+        except Exception as e:
+            results["api_errors"][path] = results["api_errors"].get(path, 0) + 1
+            results["errors"].append(f"{path}: {e!r}")
+        n += 1
+        await asyncio.sleep(max(0.0, 1.0 / rate - (time.monotonic() - start)))
+
+
+async def drive(args, port, glove, sampler):
+    base = f"http://127.0.0.1:{port}"
+    results = {"chord_latency": [], "glass_to_ws": [], "messages": {}, "viewers": [],
+               "api": {}, "api_errors": {}, "errors": []}
+    stop = asyncio.Event()
+    # half the viewers at full size, half at a thumbnail width, to exercise variant sharing
+    paths = ["/video_feed" if i % 2 == 0 else "/video_feed?width=320" for i in range(args.viewers)]
+    published_before = (await asyncio.to_thread(_request, base, "GET", "/api/video-stats"))["frames_published"]
+    tasks = [asyncio.create_task(ws_client(f"ws://127.0.0.1:{port}/ws", glove, stop, results))
+             for _ in range(args.ws)]
+    tasks += [asyncio.create_task(viewer(port, path, stop, results)) for path in paths]
+    if args.api_rate > 0:
+        tasks += [asyncio.create_task(api_caller(base, args.api_rate, stop, results, i * 100))
+                  for i in range(args.api_clients)]
+
+    start = time.monotonic()
+    while time.monotonic() - start < args.duration:
+        sampler.sample()
+        await asyncio.sleep(0.5)
+    sampler.sample()
+    published = (await asyncio.to_thread(_request, base, "GET", "/api/video-stats"))["frames_published"]
+    elapsed = time.monotonic() - start
+    stop.set()
+    await asyncio.gather(*tasks)
+
+    for entry in results["viewers"]:
+        entry["dropped"] = max(0, published - published_before - entry["frames"])
+    results["published_frames"] = published - published_before
+    results["elapsed"] = elapsed
+    return results
+
+
+def build_report(args, results, sampler, hardware, base):
+    elapsed = results["elapsed"]
+    report = {
+        "config": {"ws_clients": args.ws, "viewers": args.viewers, "api_clients": args.api_clients,
+                   "api_rate": args.api_rate, "duration": round(elapsed, 1), "source": args.source},
+        "hardware": hardware,
+        "chord_latency": percentiles(results["chord_latency"]),
+        "glass_to_ws": percentiles(results["glass_to_ws"]),
+        "ws_messages_per_second": {kind: round(count / elapsed, 1) for kind, count in results["messages"].items()},
+        "viewers": {
+            "published_fps": round(results["published_frames"] / elapsed, 1),
+            "per_viewer": results["viewers"],
+            "dropped_total": sum(entry["dropped"] for entry in results["viewers"]),
+        },
+        "api": {path: percentiles(values) for path, values in results["api"].items()},
+        "api_errors": results["api_errors"],
+        "server": sampler.report(),
+        "errors": results["errors"][:20],
+    }
+    for key, path in (("trace", "/api/trace/summary"), ("video_stats", "/api/video-stats"),
+                      ("vision_stats", "/api/vision-stats")):
+        try:
+            report[key] = _request(base, "GET", path)
+        except OSError:
+            report[key] = None
+    return report
+
+
+def _fmt(stats):
+    if not stats:
+        return "-"
+    return f"p50 {stats['p50_ms']:.1f}  p95 {stats['p95_ms']:.1f}  p99 {stats['p99_ms']:.1f}  max {stats['max_ms']:.1f} ms  (n={stats['n']})"
+
+
+def print_report(report):
+    config = report["config"]
+    print(f"{config['ws_clients']} /ws clients, {config['viewers']} viewers, "
+          f"{config['api_clients']}x{config['api_rate']}/s API calls for {config['duration']} s")
+    print(f"hardware: {json.dumps(report['hardware'])}")
+    print(f"chord latency (glove -> /ws): {_fmt(report['chord_latency'])}")
+    print(f"glass -> /ws landmarks:       {_fmt(report['glass_to_ws'])}")
+    print(f"/ws messages per second:      {report['ws_messages_per_second']}")
+    viewers = report["viewers"]
+    print(f"frames published: {viewers['published_fps']} fps, dropped by viewers: {viewers['dropped_total']}")
+    for entry in viewers["per_viewer"]:
+        print(f"  {entry['path']:<30} {entry['frames']:>6} frames  {entry['fps']:>5} fps  {entry['dropped']:>5} dropped")
+    for path, stats in report["api"].items():
+        print(f"  {path:<30} {_fmt(stats)}  errors {report['api_errors'].get(path, 0)}")
+    server = report["server"]
+    print(f"server CPU {server['cpu_percent_mean']}% mean / {server['cpu_percent_peak']}% peak, "
+          f"RSS {server['rss_mb_mean']} MB mean / {server['rss_mb_peak']} MB peak")
+    for error in report["errors"]:
+        print(f"error: {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--source", help="video file, .mjpeg recording, or image directory/glob "
+                                         "(default: synthetic 640x480 MJPEG)")
+    parser.add_argument("--chords", help="chord script for the virtual glove (default: C, G, Am, F every 2 s)")
+    parser.add_argument("--ws", type=int, default=4, help="concurrent /ws clients")
+    parser.add_argument("--viewers", type=int, default=2, help="concurrent /video_feed viewers")
+    parser.add_argument("--api-clients", type=int, default=2)
+    parser.add_argument("--api-rate", type=float, default=2.0, help="requests per second per API client")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of load")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="fake LLM seconds before the first token")
+    parser.add_argument("--llm-token-delay", type=float, default=0.01)
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    parser.add_argument("--json", help="also write the report here")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="gz-load-")
+    if args.source is None:
+        from backend.benchmarks.mjpeg_capture import synthesize_recording
+
+        args.source = os.path.join(workdir, "synthetic.mjpeg")
+        synthesize_recording(args.source)
+    script = None
+    if args.chords:
+        with open(args.chords) as f:
+            script = parse_script(f.read())
+
+    llm_port, port = _free_port(), _free_port()
+    llm = fake_openrouter.serve(port=llm_port, latency=args.llm_latency,
+                                token_delay=args.llm_token_delay, background=True)
+    glove = VirtualGlove(script).start()
+    env = dict(
+        os.environ,
+        OPENROUTER_API_URL=f"http://127.0.0.1:{llm_port}/api/v1/chat/completions",
+        OPENROUTER_API_KEY="load-test",
+        GUITARZENO_CAMERA_SOURCE=os.path.abspath(args.source),
+        GUITARZENO_SERIAL_PORT=glove.port,
+        GUITARZENO_SESSION_DIR=os.path.join(workdir, "sessions"),
+        GUITARZENO_CACHE_PATH=os.path.join(workdir, "cache.sqlite3"),
+        GUITARZENO_LIBRARY_PATH=os.path.join(workdir, "library.sqlite3"),
+    )
+    log_path = os.path.join(workdir, "server.log")
+    server, hardware = start_server(port, env, log_path, args.startup_timeout)
+    try:
+        if hardware is None:
+            print(f"backend did not come up; log: {log_path}", file=sys.stderr)
+            return 1
+        sampler = ProcessSampler(server.pid)
+        results = asyncio.run(drive(args, port, glove, sampler))
+        crashed = server.poll() is not None
+        if not crashed:
+            report = build_report(args, results, sampler, hardware, f"http://127.0.0.1:{port}")
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+        glove.stop()
+        llm.shutdown()
+
+    if crashed:
+        print(f"backend exited during the run; log: {log_path}", file=sys.stderr)
+        return 1
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    # nonzero for CI when the pipeline delivered nothing at all
+    delivered = sum(results["messages"].values()) if args.ws else 1
+    delivered *= sum(entry["frames"] for entry in results["viewers"]) if args.viewers else 1
+    return 0 if delivered else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+CPU per frame of the decoded capture path vs. MJPEG passthrough, using a recorded
+MJPEG file (raw .mjpeg or MJPG .avi) as the camera. Hand inference is the same in
+both paths and is left out; what differs is everything around it.
+
+  decoded : full decode -> flip -> BGR2RGB -> JPEG encode (quality 80) for viewers
+  mjpeg   : 1/2-scale decode -> flip -> BGR2RGB; camera bytes forwarded to viewers
+
+    python -m backend.benchmarks.mjpeg_capture session.mjpeg
+    python -m backend.benchmarks.mjpeg_capture            # synthetic 640x480 recording
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from backend.mjpeg import MJPEGFileCapture, decode_reduced
+
+
+def synthesize_recording(path, frames=300, size=(640, 480)):
+    # smooth moving scene so JPEG sizes resemble a webcam rather than noise
+    width, height = size
+    ys, xs = np.mgrid[0:height, 0:width]
+    with open(path, "wb") as f:
+        for i in range(frames):
+            image = np.zeros((height, width, 3), dtype=np.uint8)
+            image[..., 0] = (xs + 3 * i) % 256
+            image[..., 1] = (ys + 2 * i) % 256
+            image[..., 2] = 128
+            cv2.circle(image, (width // 2 + int(100 * np.sin(i / 10)), height // 2), 60, (40, 180, 220), -1)
+            f.write(cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, 85])[1].tobytes())
+
+
+def decoded_path(jpeg):
+    frame = cv2.imdecode(jpeg.reshape(-1), cv2.IMREAD_COLOR)  # what CONVERT_RGB=1 does in the driver
+    flipped = cv2.flip(frame, 1)
+    cv2.cvtColor(flipped, cv2.COLOR_BGR2RGB)
+    return cv2.imencode(".jpg", flipped, [cv2.IMWRITE_JPEG_QUALITY, 80])[1].tobytes()
+
+
+def mjpeg_path(jpeg, scale):
+    frame = decode_reduced(jpeg, scale)
+    cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB)
+    return jpeg.tobytes()
+
+
+def measure(capture, frames, step):
+    start_cpu, start_wall = time.process_time(), time.perf_counter()
+    sent = 0
+    for _ in range(frames):
+        _, jpeg = capture.read()
+        sent += len(step(jpeg))
+    cpu, wall = time.process_time() - start_cpu, time.perf_counter() - start_wall
+    return cpu / frames * 1000, wall / frames * 1000, sent / frames
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("recording", nargs="?", help="MJPEG recording (default: synthetic)")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--scale", type=int, default=2, choices=[1, 2, 4, 8], help="inference decode scale")
+    args = parser.parse_args()
+
+    path = args.recording
+    if path is None:
+        path = os.path.join(tempfile.mkdtemp(prefix="gz-mjpeg-"), "synthetic.mjpeg")
+        synthesize_recording(path)
+    cv2.setNumThreads(1)  # per-frame cost on one core, like the capture thread
+
+    results = [
+        ("decoded", measure(MJPEGFileCapture(path, paced=False, convert_rgb=False), args.frames, decoded_path)),
+        (f"mjpeg 1/{args.scale}", measure(MJPEGFileCapture(path, paced=False, convert_rgb=False), args.frames,
+                                          lambda jpeg: mjpeg_path(jpeg, args.scale))),
+    ]
+    print(f"{'path':12} {'CPU ms/frame':>13} {'wall ms/frame':>14} {'bytes/frame':>12}")
+    for name, (cpu, wall, size) in results:
+        print(f"{name:12} {cpu:13.2f} {wall:14.2f} {size:12.0f}")
+    print(f"CPU saved per frame: {1 - results[1][1][0] / results[0][1][0]:.0%}")
+
+
+if __name__ == "__main__":
+    main()
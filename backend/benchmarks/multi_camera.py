@@ -0,0 +1,55 @@
+"""
+Feed N video files through the multi-camera InferenceScheduler and report
+per-source achieved FPS, queueing delay and drops. Files are reused round-robin
+when there are more sources than files.
+
+    python -m backend.benchmarks.multi_camera session.mp4 --sources 4 --workers 2 --duration 20
+"""
+import argparse
+import time
+
+from backend.camera_scheduler import InferenceScheduler, VideoFileSource
+
+
+def _ms(summary, key):
+    return f"{summary[key]:.1f}" if summary else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("videos", nargs="+", help="recordings used as camera stand-ins")
+    parser.add_argument("--sources", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=None, help="default: one per core, at most one per source")
+    parser.add_argument("--fps", type=float, default=None, help="override the files' frame rate")
+    parser.add_argument("--deadline", type=float, default=0.1)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--no-pin", action="store_true", help="do not pin workers to cores")
+    args = parser.parse_args()
+
+    sources = [
+        VideoFileSource(f"cam{i}", args.videos[i % len(args.videos)], fps=args.fps)
+        for i in range(args.sources)
+    ]
+    scheduler = InferenceScheduler(sources, workers=args.workers, deadline=args.deadline,
+                                   pin_cores=not args.no_pin)
+    scheduler.start()
+    try:
+        time.sleep(args.duration)
+        stats = scheduler.stats()
+    finally:
+        scheduler.stop()
+
+    print(f"{args.sources} sources on {scheduler.workers} workers, {args.duration:.0f} s")
+    print(f"{'source':8} {'worker':>6} {'read':>6} {'done':>6} {'stale':>6} {'overw':>6} {'fps':>6} "
+          f"{'queue p50':>10} {'queue p95':>10} {'infer p50':>10} {'lat p95':>8}")
+    for source_id, s in stats.items():
+        print(f"{source_id:8} {s['worker']:6d} {s['frames_read']:6d} {s['completed']:6d} {s['dropped_stale']:6d} "
+              f"{s['overwritten']:6d} {s['fps']:6.1f} {_ms(s['queue_delay_ms'], 'p50'):>10} "
+              f"{_ms(s['queue_delay_ms'], 'p95'):>10} {_ms(s['inference_ms'], 'p50'):>10} "
+              f"{_ms(s['latency_ms'], 'p95'):>8}")
+    total = sum(s["completed"] for s in stats.values())
+    print(f"total {total / args.duration:.1f} inferences/s")
+
+
+if __name__ == "__main__":
+    main()
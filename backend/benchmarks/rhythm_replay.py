@@ -0,0 +1,69 @@
+"""
+Replay synthetic strum streams through RhythmScorer and report events/s
+Each session gets a long alternating down/up pattern and a jittered player
+that sometimes misses notes or adds stray strums.
+
+    python -m backend.benchmarks.rhythm_replay --sessions 8 --notes 20000
+"""
+import argparse
+import random
+import time
+
+from backend.rhythm_scoring import RhythmScorer, parse_pattern
+
+CHORDS = ["G", "C", "D", "Em"]
+
+
+def make_session(notes, tempo, rng):
+    pattern = parse_pattern([
+        {"chord": CHORDS[(i // 8) % len(CHORDS)], "direction": "down" if i % 2 == 0 else "up", "beat": i / 2}
+        for i in range(notes)
+    ])
+    seconds_per_beat = 60.0 / tempo
+    strums = []
+    for beat, chord, direction in pattern:
+        if rng.random() < 0.03:
+            continue  # missed note
+        t = beat * seconds_per_beat + rng.gauss(0, 0.03)
+        if rng.random() < 0.05:
+            direction = "up" if direction == "down" else "down"
+        strums.append((t, direction, chord))
+        if rng.random() < 0.02:
+            strums.append((t + seconds_per_beat / 4, direction, chord))  # stray extra strum
+    strums.sort(key=lambda strum: strum[0])
+    return pattern, strums
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--notes", type=int, default=20000)
+    parser.add_argument("--tempo", type=float, default=100)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    sessions = [make_session(args.notes, args.tempo, rng) for _ in range(args.sessions)]
+    scorers = [RhythmScorer(pattern, args.tempo, start_time=0.0) for pattern, _ in sessions]
+
+    # Interleave sessions the way a server handling several players would
+    events = sorted(
+        (t, index, direction, chord)
+        for index, (_, strums) in enumerate(sessions)
+        for t, direction, chord in strums
+    )
+    start = time.perf_counter()
+    for t, index, direction, chord in events:
+        scorers[index].on_strum(t, direction, chord)
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(events)} strums across {args.sessions} sessions in {elapsed:.3f} s "
+          f"-> {len(events) / elapsed:,.0f} events/s ({len(events) / elapsed / args.sessions:,.0f} per session)")
+    score = scorers[0].snapshot(now=float("inf"))
+    print(f"session 0: on time {score['on_time_rate']:.1%}, accuracy {score['accuracy']:.1%}, "
+          f"misses {score['misses']}, extra {score['extra_strums']}, "
+          f"timing error {score['mean_error'] * 1000:+.1f} +/- {score['error_stddev'] * 1000:.1f} ms, "
+          f"estimated {score['estimated_bpm']:.1f} BPM (target {score['target_bpm']:.0f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Session log throughput: enqueue cost on the hot path, writer drain time and
+vectorized stats over a large log.
+
+    python -m backend.benchmarks.session_log --events 2000000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from backend import session_log
+from backend.chords import GLOVE_CHORDS
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench.gzlog")
+    writer = session_log.SessionLogWriter(path)
+    chords = list(GLOVE_CHORDS) + ["None"]
+    rng = random.Random(0)
+    t = 0.0
+
+    start = time.perf_counter()
+    for i in range(args.events):
+        t += rng.uniform(0.2, 0.6)
+        if i % 8 == 0:
+            writer.log(session_log.EVENT_CHORD_CHANGE, rng.choice(chords), t=t)
+        else:
+            writer.log(session_log.EVENT_STRUM, rng.choice(chords), rng.choice(chords),
+                       rng.choice((session_log.DIRECTION_DOWN, session_log.DIRECTION_UP)),
+                       rng.uniform(-0.1, 0.1), rng.random() < 0.5, rng.random() < 0.8,
+                       rng.uniform(0.01, 0.08), t=t)
+    enqueue = time.perf_counter() - start
+    writer.close()
+    drained = time.perf_counter() - start
+
+    start = time.perf_counter()
+    events = session_log.read_events(path)
+    stats = session_log.session_stats(events)
+    query = time.perf_counter() - start
+
+    print(f"{args.events} events, {os.path.getsize(path) / 1e6:.1f} MB")
+    print(f"enqueue: {enqueue / args.events * 1e6:.2f} us/event, writer drained after {drained:.2f} s")
+    print(f"stats: {query * 1000:.0f} ms ({stats['strums']} strums, {stats['strums_per_minute']:.1f} strums/min, "
+          f"chord accuracy {stats['chord_accuracy']:.3f})")
+
+
+if __name__ == "__main__":
+    main()
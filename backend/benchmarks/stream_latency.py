@@ -0,0 +1,60 @@
+"""
+Time-to-first-chord vs. full-completion latency for the progression lookup
+Runs against backend/fake_openrouter.py with an empty, throwaway cache.
+
+    python -m backend.benchmarks.stream_latency --token-delay 0.05
+"""
+import argparse
+import os
+import tempfile
+import time
+
+os.environ["GUITARZENO_CACHE_PATH"] = os.path.join(tempfile.mkdtemp(), "bench_cache.sqlite3")
+
+from backend import fake_openrouter  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--token-delay", type=float, default=0.05)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    os.environ["OPENROUTER_API_URL"] = f"http://127.0.0.1:{args.port}/api/v1/chat/completions"
+    server = fake_openrouter.serve(port=args.port, latency=args.latency,
+                                   token_delay=args.token_delay, background=True)
+    from backend.chords import ChordStreamParser
+    from backend.openrouter_api import call_openrouter, stream_openrouter, _progression_messages
+
+    try:
+        for run in range(args.runs):
+            messages = _progression_messages(f"Benchmark Song {run}")
+
+            start = time.perf_counter()
+            call_openrouter(messages)
+            blocking = time.perf_counter() - start
+
+            start = time.perf_counter()
+            first_token = first_chord = None
+            chord_parser = ChordStreamParser()
+            for fragment in stream_openrouter(messages):
+                now = time.perf_counter() - start
+                if first_token is None:
+                    first_token = now
+                if chord_parser.feed(fragment) and first_chord is None:
+                    first_chord = now
+            chord_parser.close()
+            total = time.perf_counter() - start
+            first_chord = first_chord if first_chord is not None else total
+
+            print(f"run {run}: blocking {blocking * 1000:.0f} ms | stream first token {first_token * 1000:.0f} ms, "
+                  f"first chord {first_chord * 1000:.0f} ms ({first_chord / total:.0%} of {total * 1000:.0f} ms), "
+                  f"{len(chord_parser.chords)} chords")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
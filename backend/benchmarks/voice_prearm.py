@@ -0,0 +1,109 @@
+"""
+Detection-to-first-sample time of the strum path with and without pre-armed voices
+Replays a strum sequence (alternating directions over a chord progression) through
+the same steps process_frame takes after a strum is detected, and times each one
+from "strum detected" until simpleaudio has the first sample buffer:
+
+  blocking : previous voice stopped with wait=True (fade-out joined), then
+             path, file check, decode and RealTimeStrumPlayer built on the spot
+  cold     : previous voice fades out on its own thread; voice still built on the spot
+  armed    : VoiceArmer prepared (chord, next direction) during the gap between strums
+
+Needs pydub and simpleaudio. Without a sound device play_buffer fails fast, so
+the figures then cover the preparation only.
+
+    python -m backend.benchmarks.voice_prearm --strums 40 --interval 0.3
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+from backend.voice_arming import SAMPLE_DIR, VoiceArmer, sample_path
+
+sys.path.append(os.path.dirname(SAMPLE_DIR))
+
+import soundPlayback  # noqa: E402
+from soundPlayback import RealTimeStrumPlayer  # noqa: E402
+
+PROGRESSION = ["C_major", "G_major", "A_minor", "F_major"]
+
+
+class HandoffClock:
+    """Wraps simpleaudio.play_buffer to note when the new voice's buffer is handed over
+
+    Only calls from the strum thread count; fade-outs play from the monitor threads.
+    """
+
+    def __init__(self):
+        self.play_buffer = soundPlayback.sa.play_buffer
+        self.thread = threading.get_ident()
+        self.first = None
+        soundPlayback.sa.play_buffer = self
+
+    def __call__(self, *args, **kwargs):
+        try:
+            return self.play_buffer(*args, **kwargs)
+        finally:
+            if self.first is None and threading.get_ident() == self.thread:
+                self.first = time.perf_counter()
+
+    def restore(self):
+        soundPlayback.sa.play_buffer = self.play_buffer
+
+
+def run(mode, strums, interval):
+    armer = VoiceArmer(RealTimeStrumPlayer) if mode == "armed" else None
+    clock = HandoffClock()
+    player = None
+    times = []
+    try:
+        direction_down = True
+        for i in range(strums):
+            chord = PROGRESSION[(i // 2) % len(PROGRESSION)]  # two strums per chord
+            if armer:
+                armer.arm(chord, direction_down)  # what process_frame does every frame
+            time.sleep(interval)
+
+            clock.first = None
+            detected = time.perf_counter()
+            if player:
+                player.stop(wait=mode == "blocking")
+            voice = armer.take(chord, direction_down) if armer else None
+            if voice is None:
+                file_path = sample_path(chord, direction_down)
+                if not os.path.exists(file_path):
+                    raise SystemExit(f"missing sample {file_path}")
+                voice = RealTimeStrumPlayer(file_path)
+            player = voice
+            player.start()
+            times.append(((clock.first or time.perf_counter()) - detected) * 1000.0)
+            direction_down = not direction_down
+        if player:
+            player.stop(wait=True)
+    finally:
+        clock.restore()
+    return np.array(times), armer
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--strums", type=int, default=40)
+    parser.add_argument("--interval", type=float, default=0.3, help="seconds between strums")
+    args = parser.parse_args()
+
+    print(f"{args.strums} strums, {args.interval:.2f} s apart, detection -> first sample buffer handed to the device")
+    for mode in ("blocking", "cold", "armed"):
+        times, armer = run(mode, args.strums, args.interval)
+        line = (f"{mode:<9} median {np.median(times):7.2f} ms  p95 {np.percentile(times, 95):7.2f} ms  "
+                f"max {times.max():7.2f} ms")
+        if armer:
+            line += f"  (ready for {armer.hits}/{armer.hits + armer.misses} strums)"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
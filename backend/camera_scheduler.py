@@ -0,0 +1,461 @@
+"""
+Hand-landmark inference for several cameras on one machine
+Each frame source (camera or video file) keeps only its newest frame. A
+dispatcher thread hands frames to a pool of MediaPipe worker processes, one
+in-flight frame per worker, passing pixels through shared memory. Sources are
+assigned to a home worker so MediaPipe's tracking state stays with one process;
+sources sharing a worker are served round-robin. Frames older than their
+source's deadline when their turn comes are dropped instead of queued. A worker that dies is
+restarted; the frame it was working on is counted as lost.
+
+This is a standalone building block for multi-camera setups: main.py serves a
+single camera and keeps its inference in-process.
+
+    scheduler = InferenceScheduler([CameraSource("left", 0), CameraSource("right", 1, deadline=0.2)])
+    scheduler.start()
+    ...
+    scheduler.latest("left")   # newest HandResult for that source
+    scheduler.stats()
+"""
+import logging
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger("backend.camera_scheduler")
+
+DEFAULT_DEADLINE = 0.1  # seconds a frame may wait for a worker before it is stale
+MAX_FRAME_BYTES = 1920 * 1080 * 3
+FPS_WINDOW = 5.0  # seconds of completions used for the achieved-FPS figure
+RESTART_INTERVAL = 1.0  # minimum seconds between restarts of the same worker
+
+
+class FrameSource(threading.Thread):
+    """Background reader that keeps only the newest frame
+
+    deadline: seconds a frame may wait for a worker before it is stale; None uses the scheduler's
+    """
+
+    def __init__(self, source_id: str, deadline: Optional[float] = None):
+        super().__init__(daemon=True, name=f"frames-{source_id}")
+        self.source_id = source_id
+        self.deadline = deadline
+        self.frames_read = 0
+        self.on_frame: Optional[Callable[[], None]] = None
+        self._lock = threading.Lock()
+        self._frame = None
+        self._seq = 0
+        self._capture_time = 0.0
+        self._stopped = threading.Event()
+
+    def publish(self, frame):
+        with self._lock:
+            self._frame = frame
+            self._seq += 1
+            self._capture_time = time.monotonic()
+            self.frames_read += 1
+        if self.on_frame:
+            self.on_frame()
+
+    def latest(self):
+        """(seq, frame, capture_time) of the newest frame; seq is 0 before the first"""
+        with self._lock:
+            return self._seq, self._frame, self._capture_time
+
+    def stop(self):
+        self._stopped.set()
+
+
+class CameraSource(FrameSource):
+    def __init__(self, source_id: str, index: int, width: int = 640, height: int = 480, fps: int = 30,
+                 deadline: Optional[float] = None):
+        super().__init__(source_id, deadline)
+        self.index = index
+        self.width = width
+        self.height = height
+        self.fps = fps
+
+    def run(self):
+        cap = cv2.VideoCapture(self.index)
+        if not cap.isOpened():
+            logger.warning(f"Could not open camera {self.index} for source {self.source_id}")
+            return
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        cap.set(cv2.CAP_PROP_FPS, self.fps)
+        try:
+            while not self._stopped.is_set():
+                ret, frame = cap.read()
+                if not ret:
+                    time.sleep(0.01)
+                    continue
+                self.publish(cv2.flip(frame, 1))
+        finally:
+            cap.release()
+
+
+class VideoFileSource(FrameSource):
+    """Replays a recording at its own frame rate (or fps), looping, to stand in for a camera"""
+
+    def __init__(self, source_id: str, path: str, fps: Optional[float] = None, loop: bool = True,
+                 deadline: Optional[float] = None):
+        super().__init__(source_id, deadline)
+        self.path = path
+        self.fps = fps
+        self.loop = loop
+
+    def run(self):
+        cap = cv2.VideoCapture(self.path)
+        if not cap.isOpened():
+            logger.warning(f"Could not open video {self.path} for source {self.source_id}")
+            return
+        interval = 1.0 / (self.fps or cap.get(cv2.CAP_PROP_FPS) or 30.0)
+        next_time = time.monotonic()
+        try:
+            while not self._stopped.is_set():
+                ret, frame = cap.read()
+                if not ret:
+                    if not self.loop:
+                        break
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                    continue
+                delay = next_time - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                next_time = max(next_time + interval, time.monotonic() - interval)
+                self.publish(cv2.flip(frame, 1))
+        finally:
+            cap.release()
+
+
+@dataclass
+class HandResult:
+    source_id: str
+    seq: int
+    capture_time: float
+    hands: List[list]  # per hand, 21 (x, y, z) normalized landmarks
+    queue_delay: float  # capture -> dispatch to a worker
+    inference_time: float
+    latency: float  # capture -> result back in this process
+
+
+@dataclass
+class SourceStats:
+    dispatched: int = 0
+    completed: int = 0
+    dropped_stale: int = 0
+    overwritten: int = 0  # frames replaced by a newer one before their turn
+    too_large: int = 0
+    lost: int = 0  # in flight on a worker that died
+    completions: deque = field(default_factory=lambda: deque(maxlen=1000))
+    queue_delays: deque = field(default_factory=lambda: deque(maxlen=300))
+    inference_times: deque = field(default_factory=lambda: deque(maxlen=300))
+    latencies: deque = field(default_factory=lambda: deque(maxlen=300))
+
+
+def _worker_main(index, core, shm_name, inbox, results, max_num_hands, model_complexity):
+    if core is not None and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, {core})
+        except OSError:
+            pass
+    os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+    import mediapipe
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    trackers = {}
+    try:
+        while True:
+            job = inbox.get()
+            if job is None:
+                break
+            source_id, seq, shape, capture_time, dispatch_time = job
+            frame = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+            hands = trackers.get(source_id)
+            if hands is None:
+                # one tracker per source so consecutive frames of a camera keep tracking
+                hands = trackers[source_id] = mediapipe.solutions.hands.Hands(
+                    static_image_mode=False,
+                    max_num_hands=max_num_hands,
+                    model_complexity=model_complexity,
+                    min_detection_confidence=0.6,
+                    min_tracking_confidence=0.4
+                )
+            start = time.monotonic()
+            try:
+                output = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+                found = [
+                    [(lm.x, lm.y, lm.z) for lm in hand.landmark]
+                    for hand in (output.multi_hand_landmarks or [])
+                ]
+            except Exception as e:
+                logger.warning(f"MediaPipe processing error on {source_id}: {e}")
+                found = []
+            del frame
+            results.put((index, source_id, seq, capture_time, dispatch_time, time.monotonic() - start, found))
+    finally:
+        for hands in trackers.values():
+            hands.close()
+        shm.close()
+
+
+class InferenceScheduler:
+    def __init__(self, sources: List[FrameSource], workers: Optional[int] = None,
+                 deadline: float = DEFAULT_DEADLINE, max_num_hands: int = 1, model_complexity: int = 0,
+                 pin_cores: bool = True, max_frame_bytes: int = MAX_FRAME_BYTES,
+                 on_result: Optional[Callable[[HandResult], None]] = None):
+        if not sources:
+            raise ValueError("at least one frame source is required")
+        if len({source.source_id for source in sources}) != len(sources):
+            raise ValueError("source ids must be unique")
+        self.sources = list(sources)
+        self.workers = max(1, min(workers or os.cpu_count() or 1, len(self.sources)))
+        self.deadline = deadline  # for sources that do not set their own
+        self.deadlines = {
+            source.source_id: source.deadline if source.deadline is not None else deadline
+            for source in self.sources
+        }
+        self.max_num_hands = max_num_hands
+        self.model_complexity = model_complexity
+        self.pin_cores = pin_cores
+        self.max_frame_bytes = max_frame_bytes
+        self.on_result = on_result
+        # home worker per source, and each worker's sources in round-robin order
+        self.assignment = {source.source_id: i % self.workers for i, source in enumerate(self.sources)}
+        self._rotation = [
+            deque(source for source in self.sources if self.assignment[source.source_id] == w)
+            for w in range(self.workers)
+        ]
+        self._stats: Dict[str, SourceStats] = {source.source_id: SourceStats() for source in self.sources}
+        self._latest: Dict[str, HandResult] = {}
+        self._last_seq = {source.source_id: 0 for source in self.sources}
+        # per worker, guarded by _lock: whether it holds a frame, and which (source_id, seq)
+        self._busy = [False] * self.workers
+        self._in_flight: List[Optional[tuple]] = [None] * self.workers
+        self._last_spawn = [0.0] * self.workers
+        self.restarts = [0] * self.workers
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = False
+        self._procs = []
+        self._inboxes = []
+        self._buffers = []
+        self._results = None
+        self._threads = []
+        self._ctx = None
+        self._core_list = []
+        self.started_at = None
+
+    def start(self):
+        self._ctx = mp.get_context("spawn")  # fork is unsafe with the reader threads running
+        self._results = self._ctx.Queue()
+        self._core_list = self._cores()
+        for w in range(self.workers):
+            self._buffers.append(shared_memory.SharedMemory(create=True, size=self.max_frame_bytes))
+            self._inboxes.append(None)
+            self._procs.append(None)
+            self._spawn_worker(w)
+        self._running = True
+        self.started_at = time.monotonic()
+        self._threads = [
+            threading.Thread(target=self._dispatch_loop, daemon=True, name="scheduler-dispatch"),
+            threading.Thread(target=self._collect_loop, daemon=True, name="scheduler-collect"),
+        ]
+        for thread in self._threads:
+            thread.start()
+        for source in self.sources:
+            source.on_frame = self._wake.set
+            if not source.is_alive():
+                source.start()
+
+    def _spawn_worker(self, w):
+        core = self._core_list[w % len(self._core_list)] if self._core_list else None
+        inbox = self._ctx.Queue(maxsize=1)
+        proc = self._ctx.Process(
+            target=_worker_main,
+            args=(w, core, self._buffers[w].name, inbox, self._results, self.max_num_hands, self.model_complexity),
+            daemon=True,
+            name=f"mediapipe-{w}",
+        )
+        proc.start()
+        self._inboxes[w] = inbox
+        self._procs[w] = proc
+        self._last_spawn[w] = time.monotonic()
+
+    def _restart_worker(self, w):
+        """Replace a worker that died; the frame it held is lost and its sources resume on the new one"""
+        if time.monotonic() - self._last_spawn[w] < RESTART_INTERVAL:
+            return  # don't spin if it dies on startup
+        logger.warning(f"MediaPipe worker {w} exited with code {self._procs[w].exitcode}; restarting")
+        old_inbox = self._inboxes[w]
+        old_inbox.cancel_join_thread()  # nobody will read what is left in it
+        old_inbox.close()
+        self._spawn_worker(w)
+        with self._lock:
+            if self._busy[w] and self._in_flight[w] is not None:
+                self._stats[self._in_flight[w][0]].lost += 1
+            self.restarts[w] += 1
+            self._in_flight[w] = None
+            self._busy[w] = False
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+        # the dispatcher first, so it neither restarts workers nor hands out frames while they exit
+        for thread in self._threads[:1]:
+            thread.join(timeout=2)
+        for source in self.sources:
+            source.stop()
+        for inbox in self._inboxes:
+            try:
+                inbox.put_nowait(None)
+            except queue.Full:
+                pass  # worker is dead or stuck; terminated below
+            inbox.cancel_join_thread()
+        for proc in self._procs:
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.terminate()
+                proc.join(timeout=1)
+        if self._results is not None:
+            self._results.put(None)
+        for thread in self._threads[1:]:
+            thread.join(timeout=2)
+        for buffer in self._buffers:
+            buffer.close()
+            buffer.unlink()
+        self._procs, self._inboxes, self._buffers, self._threads = [], [], [], []
+
+    def latest(self, source_id: str) -> Optional[HandResult]:
+        with self._lock:
+            return self._latest.get(source_id)
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        report = {}
+        with self._lock:
+            for source in self.sources:
+                stats = self._stats[source.source_id]
+                recent = [t for t in stats.completions if t >= now - FPS_WINDOW]
+                window = min(FPS_WINDOW, now - self.started_at) if self.started_at else 0.0
+                report[source.source_id] = {
+                    "worker": self.assignment[source.source_id],
+                    "deadline": self.deadlines[source.source_id],
+                    "frames_read": source.frames_read,
+                    "dispatched": stats.dispatched,
+                    "completed": stats.completed,
+                    "dropped_stale": stats.dropped_stale,
+                    "overwritten": stats.overwritten,
+                    "too_large": stats.too_large,
+                    "lost": stats.lost,
+                    "worker_restarts": self.restarts[self.assignment[source.source_id]],
+                    "fps": len(recent) / window if window > 0 else 0.0,
+                    "queue_delay_ms": _percentiles(stats.queue_delays),
+                    "inference_ms": _percentiles(stats.inference_times),
+                    "latency_ms": _percentiles(stats.latencies),
+                }
+        return report
+
+    def _cores(self):
+        if not self.pin_cores or not hasattr(os, "sched_getaffinity"):
+            return []
+        return sorted(os.sched_getaffinity(0))
+
+    def _dispatch_loop(self):
+        while self._running:
+            self._wake.wait(timeout=0.05)
+            self._wake.clear()
+            for w in range(self.workers):
+                if not self._procs[w].is_alive():
+                    self._restart_worker(w)
+                    if not self._procs[w].is_alive():
+                        continue
+                with self._lock:
+                    busy = self._busy[w]
+                if not busy:
+                    self._dispatch(w)
+
+    def _dispatch(self, w):
+        rotation = self._rotation[w]
+        for _ in range(len(rotation)):
+            source = rotation[0]
+            rotation.rotate(-1)
+            seq, frame, capture_time = source.latest()
+            last_seq = self._last_seq[source.source_id]
+            if seq == last_seq or frame is None:
+                continue
+            stats = self._stats[source.source_id]
+            now = time.monotonic()
+            with self._lock:
+                stats.overwritten += max(0, seq - last_seq - 1)
+                self._last_seq[source.source_id] = seq
+                if now - capture_time > self.deadlines[source.source_id]:
+                    stats.dropped_stale += 1
+                    continue
+                if frame.nbytes > self.max_frame_bytes:
+                    stats.too_large += 1
+                    continue
+                stats.dispatched += 1
+                self._busy[w] = True
+                self._in_flight[w] = (source.source_id, seq)
+            frame = np.ascontiguousarray(frame, dtype=np.uint8)
+            np.ndarray(frame.shape, dtype=np.uint8, buffer=self._buffers[w].buf)[:] = frame
+            self._inboxes[w].put((source.source_id, seq, frame.shape, capture_time, now))
+            return
+
+    def _collect_loop(self):
+        while True:
+            item = self._results.get()
+            if item is None:
+                break
+            w, source_id, seq, capture_time, dispatch_time, inference_time, hands = item
+            now = time.monotonic()
+            result = HandResult(
+                source_id=source_id,
+                seq=seq,
+                capture_time=capture_time,
+                hands=hands,
+                queue_delay=dispatch_time - capture_time,
+                inference_time=inference_time,
+                latency=now - capture_time,
+            )
+            with self._lock:
+                stats = self._stats[source_id]
+                stats.completed += 1
+                stats.completions.append(now)
+                stats.queue_delays.append(result.queue_delay)
+                stats.inference_times.append(inference_time)
+                stats.latencies.append(result.latency)
+                self._latest[source_id] = result
+                # a result posted just before a worker died must not free its replacement
+                released = self._in_flight[w] == (source_id, seq)
+                if released:
+                    self._in_flight[w] = None
+                    self._busy[w] = False
+            if released:
+                self._wake.set()
+            if self.on_result:
+                try:
+                    self.on_result(result)
+                except Exception as e:
+                    logger.warning(f"on_result callback failed for {source_id}: {e}")
+
+
+def _percentiles(samples):
+    if not samples:
+        return None
+    values = np.array(samples) * 1000.0
+    return {
+        "mean": float(values.mean()),
+        "p50": float(np.percentile(values, 50)),
+        "p95": float(np.percentile(values, 95)),
+    }
@@ -0,0 +1,194 @@
+"""
+Local chord feedback engine
+The glove only knows GLOVE_CHORDS, so every (played, expected) answer is
+precomputed once from chord theory and the finger mapping and served from a
+dict lookup. Anything outside the table falls back to the LLM.
+"""
+from typing import Optional
+
+from .chords import (
+    GLOVE_CHORDS,
+    canonical_chord_name,
+    chord_tones,
+    display_name,
+    glove_contacts,
+    split_chord,
+)
+
+
+def _join(items):
+    items = list(items)
+    if len(items) <= 1:
+        return "".join(items)
+    return ", ".join(items[:-1]) + " and " + items[-1]
+
+
+def _contact_changes(played, expected):
+    """Sensors to press and release to go from the played chord to the expected one"""
+    have = glove_contacts(played)
+    want = glove_contacts(expected)
+    press = sorted(c for c in want - have if c != "thumb")
+    release = sorted(c for c in have - want if c != "thumb")
+    thumb = None
+    if "thumb" in want and "thumb" not in have:
+        thumb = "press"
+    elif "thumb" in have and "thumb" not in want:
+        thumb = "release"
+    return press, release, thumb
+
+
+def _build_entry(played, expected):
+    if played == expected:
+        return {
+            "correct": True,
+            "press": [],
+            "release": [],
+            "thumb": None,
+            "shared_tones": list(chord_tones(expected)),
+            "result": f"Correct! That's {display_name(expected)}.",
+        }
+
+    press, release, thumb = _contact_changes(played, expected)
+    played_tones = chord_tones(played)
+    shared = [note for note in chord_tones(expected) if note in played_tones]
+    played_root, played_quality = split_chord(played)
+    expected_root, expected_quality = split_chord(expected)
+
+    steps = []
+    if press:
+        steps.append(f"press {_join(press)}")
+    if release:
+        steps.append(f"lift {_join(release)}")
+    if thumb == "press":
+        steps.append("add the thumb sensor to make it minor")
+    elif thumb == "release":
+        steps.append("let go of the thumb sensor to make it major")
+    tip = _join(steps)
+    tip = tip[0].upper() + tip[1:] + "."
+
+    if played_root == expected_root:
+        detail = f"Right root, but {expected_quality} was expected, not {played_quality}."
+    elif shared:
+        detail = f"{display_name(played)} shares {_join(shared)} with {display_name(expected)}, so it sounds close."
+    else:
+        detail = f"{display_name(played)} has no notes in common with {display_name(expected)}."
+
+    return {
+        "correct": False,
+        "press": press,
+        "release": release,
+        "thumb": thumb,
+        "shared_tones": shared,
+        "result": f"Not quite: you played {display_name(played)}, expected {display_name(expected)}. {detail} {tip}",
+    }
+
+
+def _build_missing_entry(expected):
+    """Feedback when the glove reported no chord at all"""
+    contacts = glove_contacts(expected)
+    fingers = sorted(c for c in contacts if c != "thumb")
+    tip = f"Press {_join(fingers)}"
+    if "thumb" in contacts:
+        tip += " together with the thumb sensor"
+    return {
+        "correct": False,
+        "press": fingers,
+        "release": [],
+        "thumb": "press" if "thumb" in contacts else None,
+        "shared_tones": [],
+        "result": f"No chord detected, expected {display_name(expected)}. {tip}.",
+    }
+
+
+def build_feedback_table():
+    table = {
+        (played, expected): _build_entry(played, expected)
+        for played in GLOVE_CHORDS
+        for expected in GLOVE_CHORDS
+    }
+    for expected in GLOVE_CHORDS:
+        table[("None", expected)] = _build_missing_entry(expected)
+    return table
+
+
+FEEDBACK_TABLE = build_feedback_table()
+
+
+def get_local_feedback(played_chord: str, expected_chord: str) -> Optional[dict]:
+    """Precomputed feedback for a pair of glove chords, or None if either is outside the table"""
+    entry = FEEDBACK_TABLE.get((played_chord, expected_chord))
+    if entry is not None:
+        return entry
+    played = "None" if played_chord in (None, "", "None") else canonical_chord_name(played_chord)
+    expected = canonical_chord_name(expected_chord)
+    if played is None or expected is None:
+        return None
+    return FEEDBACK_TABLE.get((played, expected))
+
+
+def grade_attempts(attempts):
+    """Grade (played, expected, timestamp) tuples locally
+
+    Returns the per-attempt results and the indices whose feedback text still
+    has to come from the LLM because a chord is outside the table.
+    """
+    results = []
+    unresolved = []
+    for index, (played, expected, timestamp) in enumerate(attempts):
+        entry = get_local_feedback(played, expected)
+        if entry is not None:
+            results.append({
+                "index": index,
+                "played_chord": played,
+                "expected_chord": expected,
+                "timestamp": timestamp,
+                "correct": entry["correct"],
+                "result": entry["result"],
+                "source": "local",
+            })
+            continue
+        played_name = canonical_chord_name(played) or played
+        expected_name = canonical_chord_name(expected) or expected
+        results.append({
+            "index": index,
+            "played_chord": played,
+            "expected_chord": expected,
+            "timestamp": timestamp,
+            "correct": played_name == expected_name,
+            "result": None,
+            "source": "llm",
+        })
+        unresolved.append(index)
+    return results, unresolved
+
+
+def summarize_attempts(results):
+    """Aggregate accuracy, streaks, most-missed chords and timing for a graded run"""
+    total = len(results)
+    correct = sum(1 for result in results if result["correct"])
+    longest_streak = streak = 0
+    missed = {}
+    confusions = {}
+    for result in results:
+        if result["correct"]:
+            streak += 1
+            longest_streak = max(longest_streak, streak)
+            continue
+        streak = 0
+        expected = result["expected_chord"]
+        missed[expected] = missed.get(expected, 0) + 1
+        pair = f"{result['played_chord']} -> {expected}"
+        confusions[pair] = confusions.get(pair, 0) + 1
+
+    timestamps = [result["timestamp"] for result in results if isinstance(result["timestamp"], (int, float))]
+    duration = max(timestamps) - min(timestamps) if len(timestamps) > 1 else 0.0
+    return {
+        "total": total,
+        "correct": correct,
+        "accuracy": correct / total if total else 0.0,
+        "longest_streak": longest_streak,
+        "most_missed": sorted(missed.items(), key=lambda item: item[1], reverse=True)[:3],
+        "common_mistakes": sorted(confusions.items(), key=lambda item: item[1], reverse=True)[:3],
+        "duration": duration,
+        "chords_per_minute": 60.0 * (len(timestamps) - 1) / duration if duration > 0 else 0.0,
+    }
@@ -0,0 +1,190 @@
+"""
+Chord vocabulary shared by the glove, the sound bank and the LLM helpers
+Names follow the `C_major` / `A_minor` convention printed by
+chord_detection_arduino.ino and used for the files in chord_sounds/
+"""
+import re
+from typing import Optional
+
+FINGERS = ("index", "middle", "ring", "pinky")
+
+# Finger contacts per root on the glove (see chord_detection_arduino.ino).
+# Touching the thumb sensor as well turns the chord minor.
+ROOT_CONTACTS = {
+    "C": ("index",),
+    "G": ("middle",),
+    "D": ("ring",),
+    "A": ("pinky",),
+    "E": ("index", "middle"),
+    "F": ("middle", "ring"),
+    "Bb": ("ring", "pinky"),
+}
+QUALITIES = ("major", "minor")
+
+GLOVE_CHORDS = tuple(f"{root}_{quality}" for root in ROOT_CONTACTS for quality in QUALITIES)
+
+NOTE_NAMES = ("C", "C#", "D", "Eb", "E", "F", "F#", "G", "Ab", "A", "Bb", "B")
+PITCH_CLASSES = {
+    "C": 0, "B#": 0,
+    "C#": 1, "Db": 1,
+    "D": 2,
+    "D#": 3, "Eb": 3,
+    "E": 4, "Fb": 4,
+    "F": 5, "E#": 5,
+    "F#": 6, "Gb": 6,
+    "G": 7,
+    "G#": 8, "Ab": 8,
+    "A": 9,
+    "A#": 10, "Bb": 10,
+    "B": 11, "Cb": 11,
+}
+# Intervals above the root for each triad quality
+TRIAD_INTERVALS = {"major": (0, 4, 7), "minor": (0, 3, 7)}
+
+_CHORD_RE = re.compile(
+    r"^([A-Ga-g])([#b♯♭]?)"
+    r"(?:[\s_-]*(major|minor|maj|min|m|M))?"
+    r"(.*)$"
+)
+
+
+def canonical_chord_name(text: str) -> Optional[str]:
+    """Map 'Am', 'A minor', 'a_min', 'A#', 'G7', 'D/F#' ... onto 'A_minor' style names
+
+    Extensions (7ths, sus, add) collapse onto the underlying major/minor triad
+    since the glove and sound bank only know triads. Returns None when the text
+    does not start with a chord symbol.
+    """
+    if not text:
+        return None
+    text = text.strip().split("/")[0].strip()
+    match = _CHORD_RE.match(text)
+    if not match:
+        return None
+    letter, accidental, quality, rest = match.groups()
+    rest = rest.strip().lower()
+    # Words that merely start with a note letter ("Great", "Bridge") are not chords
+    if rest and not re.match(r"^(\d|sus|add|dim|aug|maj|min|\(|$)", rest):
+        return None
+    accidental = {"♯": "#", "♭": "b"}.get(accidental, accidental)
+    if quality in ("minor", "min", "m") or rest.startswith("dim"):
+        quality = "minor"
+    else:
+        quality = "major"
+    pitch = PITCH_CLASSES.get(letter.upper() + accidental)
+    if pitch is None:
+        return None
+    return f"{NOTE_NAMES[pitch]}_{quality}"
+
+
+def split_chord(name: str):
+    root, quality = name.split("_", 1)
+    return root, quality
+
+
+def chord_tones(name: str):
+    """Note names of the triad for a canonical chord name"""
+    root, quality = split_chord(name)
+    base = PITCH_CLASSES[root]
+    return tuple(NOTE_NAMES[(base + step) % 12] for step in TRIAD_INTERVALS[quality])
+
+
+def glove_contacts(name: str):
+    """Set of sensors (fingers plus 'thumb') touched to play a glove chord, or None"""
+    root, quality = split_chord(name)
+    fingers = ROOT_CONTACTS.get(root)
+    if fingers is None:
+        return None
+    contacts = set(fingers)
+    if quality == "minor":
+        contacts.add("thumb")
+    return frozenset(contacts)
+
+
+def display_name(name: str) -> str:
+    root, quality = split_chord(name)
+    return f"{root} {quality}"
+
+
+_TOKEN_DELIMITERS = re.compile(r"([\s,|;]+|\s-+\s|->|→)")
+_TOKEN_STRIP = "()[]{}.:*\"'"
+
+
+class ChordStreamParser:
+    """Incrementally pull chord symbols out of streamed LLM text
+
+    feed() takes arbitrary text fragments and returns the chords completed by
+    them; a chord is complete once a delimiter follows it, so 'G' is not
+    emitted until we know the stream is not going to continue with 'G7' or
+    'Great'. A bare 'A' is only taken as a chord when another chord, a
+    separator (punctuation, a line break) or the end of the stream follows it;
+    otherwise it is the article, as in 'A Horse with No Name'.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pending_a = None  # bare "A" waiting on the next token
+        self.chords = []
+
+    def feed(self, text: str):
+        self._buffer += text
+        # Tokens alternate with the delimiters between them; the last piece may still be growing
+        pieces = _TOKEN_DELIMITERS.split(self._buffer)
+        self._buffer = pieces.pop()
+        found = []
+        for index, piece in enumerate(pieces):
+            if index % 2 == 0:
+                self._take(piece, found)
+            elif piece.strip(" \t"):
+                self._separate(found)
+        return found
+
+    def close(self):
+        found = []
+        if self._buffer:
+            self._take(self._buffer, found)
+            self._buffer = ""
+        if self._pending_a is not None:
+            self._emit(self._pending_a, found)
+            self._pending_a = None
+        return found
+
+    def _separate(self, found):
+        if self._pending_a is not None:
+            self._emit(self._pending_a, found)
+            self._pending_a = None
+
+    def _take(self, token, found):
+        if not any(char.isalnum() for char in token):
+            if token:
+                self._separate(found)  # '-', '.', '=>' between chords
+            return
+        word = token.strip(_TOKEN_STRIP)
+        if self._pending_a is not None:
+            pending, self._pending_a = self._pending_a, None
+            if not word[0].islower() and canonical_chord_name(word) is not None:
+                self._emit(pending, found)
+        if word == "A":
+            if token.rstrip(_TOKEN_STRIP) != token:
+                self._emit(word, found)  # 'A.', 'A:', '(A)' end the phrase
+            else:
+                self._pending_a = word
+            return
+        self._emit(word, found)
+
+    def _emit(self, token, found):
+        # Prose like "a" or "am" is lowercase; chord symbols are not
+        if token[0].islower():
+            return
+        name = canonical_chord_name(token)
+        if name is not None:
+            self.chords.append(name)
+            found.append(name)
+
+
+def parse_progression(text: str):
+    """Canonical chord names in the order they appear in free-form text"""
+    parser = ChordStreamParser()
+    parser.feed(text)
+    parser.close()
+    return parser.chords
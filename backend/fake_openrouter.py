@@ -0,0 +1,122 @@
+"""
+Local stand-in for the OpenRouter chat completions API
+Answers both plain and streaming (SSE) requests with canned guitar-teacher
+text, emitted word by word with configurable delays, so the streaming
+endpoints can be exercised without a key or network access.
+
+    python -m backend.fake_openrouter --port 8787 --token-delay 0.05
+    OPENROUTER_API_URL=http://127.0.0.1:8787/api/v1/chat/completions uvicorn backend.main:app
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_PROGRESSION = "Verse: G - D - Em - C\nChorus: C - G - D - Em - C - G - D - D"
+CANNED_PROGRESSIONS = {
+    "wonderwall": "Verse: Em7 - G - Dsus4 - A7sus4\nChorus: C - D - Em - C - D - Em",
+    "free fallin": "Verse: D - G - D - A\nChorus: D - G - D - A",
+    "house of the rising sun": "Am - C - D - F - Am - C - E - E\nAm - C - D - F - Am - E - Am - E",
+    "knockin on heaven s door": "G - D - Am - G - D - C",
+}
+
+
+def canned_reply(messages):
+    prompt = messages[-1]["content"] if messages else ""
+    if "chord progression" in prompt:
+        match = re.search(r"song '(.*)'", prompt)
+        title = match.group(1) if match else ""
+        key = " ".join(re.sub(r"[^\w\s]", " ", title.lower()).split())
+        progression = CANNED_PROGRESSIONS.get(key, DEFAULT_PROGRESSION)
+        return f"Here is the chord progression for {title}:\n{progression}"
+    if "numbered attempt" in prompt:
+        attempts = re.findall(r"^(\d+)\. played '(.*)', expected '(.*)'$", prompt, re.MULTILINE)
+        return "\n".join(
+            f"{number}. {'Correct!' if played == expected else f'Incorrect, try {expected} again.'}"
+            for number, played, expected in attempts
+        )
+    if "expected chord" in prompt:
+        return "Incorrect. Check which sensors you are pressing and try the expected shape again."
+    return "Try 'Wonderwall' by Oasis — four easy chords and a steady strum. Or 'Bésame Mucho' for a challenge."
+
+
+def split_tokens(text):
+    """Roughly word-sized pieces, keeping whitespace attached like real tokenizers"""
+    return re.findall(r"\s*\S+", text)
+
+
+class FakeOpenRouterHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so the stream can use chunked transfer encoding like the real API
+    protocol_version = "HTTP/1.1"
+    latency = 0.2
+    token_delay = 0.05
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self.send_error(400, "invalid JSON")
+            return
+        reply = canned_reply(body.get("messages", []))
+        time.sleep(self.latency)
+
+        if not body.get("stream"):
+            time.sleep(self.token_delay * len(split_tokens(reply)))
+            payload = json.dumps({"choices": [{"message": {"role": "assistant", "content": reply}}]},
+                                 ensure_ascii=False).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self._write_chunk(b": OPENROUTER PROCESSING\n\n")
+        for token in split_tokens(reply):
+            chunk = {"choices": [{"delta": {"content": token}}]}
+            # raw UTF-8 on the wire like the real API, not \u escapes
+            self._write_chunk(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode())
+            time.sleep(self.token_delay)
+        self._write_chunk(b"data: [DONE]\n\n")
+        self._write_chunk(b"")
+        self.close_connection = True
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(host="127.0.0.1", port=8787, latency=0.2, token_delay=0.05, background=False):
+    """Start the fake upstream; with background=True returns the server running on a daemon thread"""
+    handler = type("Handler", (FakeOpenRouterHandler,), {"latency": latency, "token_delay": token_delay})
+    server = ThreadingHTTPServer((host, port), handler)
+    if background:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake OpenRouter chat completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds before the first token")
+    parser.add_argument("--token-delay", type=float, default=0.05, help="seconds between tokens")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.latency, args.token_delay)
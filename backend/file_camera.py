@@ -0,0 +1,80 @@
+"""
+Stand-in cameras for running the backend without hardware
+GUITARZENO_CAMERA_SOURCE can point at a video file, a directory or glob of
+images, or a raw .mjpeg recording. Frames are replayed at a fixed rate and
+looped, behind the same read()/set()/release() calls as cv2.VideoCapture.
+"""
+import glob
+import os
+import time
+
+from .mjpeg import MJPEGFileCapture
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+class FileCamera:
+    def __init__(self, path: str, fps: float = 30.0, loop: bool = True):
+        import cv2
+
+        self.fps = fps
+        self.loop = loop
+        self.images = None
+        self.video = None
+        if os.path.isdir(path):
+            self.images = sorted(
+                os.path.join(path, name) for name in os.listdir(path) if name.lower().endswith(IMAGE_EXTENSIONS)
+            )
+        elif any(ch in path for ch in "*?["):
+            self.images = sorted(glob.glob(path))
+        else:
+            self.video = cv2.VideoCapture(path)
+            self.fps = fps or self.video.get(cv2.CAP_PROP_FPS) or 30.0
+        self.index = 0
+        self._next = time.monotonic()
+
+    def isOpened(self):
+        return bool(self.images) if self.images is not None else self.video.isOpened()
+
+    def read(self):
+        import cv2
+
+        delay = self._next - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        self._next = max(self._next + 1.0 / self.fps, time.monotonic() - 1.0 / self.fps)
+        if self.images is not None:
+            if self.index >= len(self.images):
+                if not self.loop:
+                    return False, None
+                self.index = 0
+            frame = cv2.imread(self.images[self.index])
+            self.index += 1
+            return frame is not None, frame
+        ret, frame = self.video.read()
+        if not ret and self.loop:
+            self.video.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.video.read()
+        return ret, frame
+
+    def set(self, prop, value):
+        return False
+
+    def get(self, prop):
+        import cv2
+
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        return 0.0
+
+    def release(self):
+        if self.video is not None:
+            self.video.release()
+        self.images = None
+
+
+def open_camera_source(path: str, fps: float = 30.0):
+    """A looping, paced VideoCapture look-alike for a recording on disk"""
+    if path.lower().endswith((".mjpeg", ".mjpg")):
+        return MJPEGFileCapture(path, fps=fps)
+    return FileCamera(path, fps=fps)
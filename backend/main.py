@@ -5,16 +5,13 @@ Handles video streaming, chord detection, and strumming detection
 import os
 import asyncio
 import base64
-import cv2
 import json
 import numpy as np
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request, HTTPException
 from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 # Reduce TensorFlow/MediaPipe C++ logs where possible
 os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '2')
-import mediapipe as mp
-import serial
 import threading
 import time
 from collections import deque
@@ -28,15 +25,35 @@ import numbers
 # Add Hardware directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'Hardware', 'PseudoGuitar'))
 
-try:
-    from chordDetection import ChordDetector
-    from soundPlayback import RealTimeStrumPlayer
-except ImportError:
-    logging.warning("Could not import hardware modules. Running in mock mode.")
-    ChordDetector = None
-    RealTimeStrumPlayer = None
+# The vision and hardware stack (cv2, mediapipe, serial, audio) takes seconds to
+# import, so it is loaded by load_vision_modules() on the hardware init thread
+cv2 = None
+mp = None
+ChordDetector = None
+RealTimeStrumPlayer = None
+MotionGate = None
 
-from .openrouter_api import get_chord_progression, get_feedback, get_song_recommendation
+from strumDetector import StrumDetector, hand_features, load_tuned_params
+
+from .openrouter_api import (
+    get_chord_progression,
+    get_feedback,
+    get_feedback_batch,
+    get_song_recommendation,
+    stream_chord_progression,
+    stream_song_recommendation,
+)
+from .chords import ChordStreamParser, parse_progression
+from .song_library import get_library
+from . import session_log
+from .rhythm_scoring import RhythmScorer, parse_pattern
+from .chord_feedback import get_local_feedback, grade_attempts, summarize_attempts
+from .response_cache import get_cache
+from .tracing import new_trace_id, tracer
+from .preview_streams import PreviewVariants, make_variant
+from .mjpeg import decode_reduced, is_compressed
+from .file_camera import open_camera_source
+from .voice_arming import VoiceArmer, sample_path
 
 app = FastAPI()
 
@@ -57,27 +74,21 @@ app.add_middleware(
 )
 
 # Global state
-video_capture: Optional[cv2.VideoCapture] = None
+video_capture = None
+mjpeg_passthrough = False  # camera is delivering compressed MJPEG frames
 hands_detector = None
 mp_hands = None
 mp_drawing = None
-chord_detector: Optional[ChordDetector] = None
+chord_detector = None
 active_connections = set()
 is_running = False
 
 # Strumming detection variables
 hand_positions = deque(maxlen=10)
-velocities = deque(maxlen=10)
-thumb_distances = deque(maxlen=10)
-prev_hand_center = None
-gesture_window = deque(maxlen=5)
-last_strum_time = 0
-strum_start_time = None
-expected_direction_down = True
-last_successful_strum_direction = None
 strum_in_progress = False
 strum_total_distance = 0.3
 current_player = None
+voice_armer = None
 strum_start_y = None
 
 # Settings
@@ -85,26 +96,70 @@ manual_velocity_threshold = 0.02
 manual_thumb_noise_threshold = 0.05
 manual_strum_distance = 0.3
 INIT_FRAMES = 10
-STRUM_FRAMES = 5
+STRUM_STABLE_TIME = 0.1  # seconds the filtered direction must hold before a strum counts
 COOLDOWN = 0.2
 MAX_STRUM_DURATION = 4.0
 velocity_threshold = manual_velocity_threshold
 thumb_noise_threshold = manual_thumb_noise_threshold
 strum_distance = manual_strum_distance
+# Hand-center filter: "one_euro", "kalman" or "moving_average" (the old 10-frame mean)
+HAND_FILTER = os.getenv("GUITARZENO_HAND_FILTER", "one_euro")
+# Tuned detector parameters from Hardware/PseudoGuitar/strumTuner.py (optional)
+STRUM_PARAMS_PATH = os.getenv("GUITARZENO_STRUM_PARAMS")
+STRUM_SETUP = os.getenv("GUITARZENO_STRUM_SETUP")
+# How far ahead to extrapolate the hand position to cover capture -> playback delay
+PREDICTION_LEAD = 0.05
+
+# Serve only the /api/* routes: never import or initialize the vision stack
+API_ONLY = os.getenv("GUITARZENO_API_ONLY", "0") == "1"
 
 # Serial port to use for the chord detector (change this to your Arduino's COM port)
-CHORD_SERIAL_PORT = "COM3"
+CHORD_SERIAL_PORT = os.getenv("GUITARZENO_SERIAL_PORT", "COM3")
+# Replay a recording instead of opening a camera: a video file, a .mjpeg
+# recording, or a directory / glob of images (see file_camera.py)
+CAMERA_SOURCE = os.getenv("GUITARZENO_CAMERA_SOURCE")
 
 # Capture / processing tuning
 CAP_WIDTH = 640
 CAP_HEIGHT = 480
 PROCESS_FPS = 10
 PROCESS_INTERVAL = 1.0 / PROCESS_FPS
-# Turn off drawing to reduce CPU cost when debugging performance
-DRAW_LANDMARKS = True
+# "mjpeg": ask the camera for MJPG, forward its JPEG bytes to viewers unmirrored
+# (the client mirrors) and decode only a 1/MJPEG_DECODE_SCALE copy for inference
+CAPTURE_MODE = os.getenv("GUITARZENO_CAPTURE_MODE", "raw")
+MJPEG_DECODE_SCALE = 2
+# Draw the hand overlay into the video frames. With 0 the frames go out clean and
+# clients draw the overlay from the landmarks pushed over /ws
+DRAW_LANDMARKS = os.getenv("GUITARZENO_DRAW_LANDMARKS", "1") != "0"
+# Skip MediaPipe on frames where nothing moved and reuse the previous landmarks
+MOTION_GATE = os.getenv("GUITARZENO_MOTION_GATE", "1") != "0"
+MOTION_GATE_MAX_SKIP = 0.5  # seconds between forced refreshes while static
+# Prepare the sample for the held chord and expected strum direction before the strum
+VOICE_PREARM = os.getenv("GUITARZENO_VOICE_PREARM", "1") != "0"
+
+strum_params = dict(
+    velocity_threshold=velocity_threshold,
+    thumb_noise_threshold=thumb_noise_threshold,
+    stable_time=STRUM_STABLE_TIME,
+    cooldown=COOLDOWN,
+    max_strum_duration=MAX_STRUM_DURATION,
+    filter_name=HAND_FILTER,
+    nominal_interval=PROCESS_INTERVAL,
+)
+if STRUM_PARAMS_PATH:
+    try:
+        strum_params.update(load_tuned_params(STRUM_PARAMS_PATH, STRUM_SETUP))
+    except (OSError, ValueError, KeyError) as e:
+        logging.warning(f"Could not load tuned strum parameters: {e}. Using defaults.")
+strum_detector = StrumDetector(**strum_params)
+motion_gate = None  # created with the vision stack when MOTION_GATE is on
+last_hand_results = None  # MediaPipe results reused while the motion gate skips inference
 
 # Shared last-processed frame + detection data (so we don't read/process camera twice)
-last_processed_frame_bytes = None
+# Processed frames are published to per-variant JPEG caches shared by /video_feed clients
+preview = PreviewVariants()
+capture_thread = None
+capture_thread_lock = threading.Lock()
 last_detection_data = {
     "chord": "None",
     "strum_direction": None,
@@ -113,10 +168,106 @@ last_detection_data = {
     "thumb_extended": False,
 }
 last_process_time = 0.0
+last_detection_trace = (None, None)  # (trace id, capture time) of last_detection_data
+# Newest hand landmarks for client-side overlays, sent over /ws as {"type": "landmarks", ...}
+last_landmarks = None
+
+# Background hardware initialization, reported on GET /
+# status: pending -> loading -> ready | mock (no camera) | failed, or disabled in API-only mode
+hardware_state = {"status": "pending", "seconds": None, "error": None}
+
+# Event log for the current practice session (strums and chord changes)
+session_logger: Optional[session_log.SessionLogWriter] = None
+current_session_id: Optional[str] = None
+last_logged_chord = None
+session_lock = threading.Lock()  # /start requests may switch sessions concurrently
+
+# Rhythm exercise being scored server-side (see /api/rhythm/*)
+rhythm_scorer: Optional[RhythmScorer] = None
+rhythm_lock = threading.Lock()
+rhythm_version = 0  # bumped on every score change so /ws knows when to push
+
+def score_rhythm_strum(t, direction, chord):
+    """Feed a strum to the active rhythm exercise; returns the expected chord of the matched note"""
+    global rhythm_version
+    if rhythm_scorer is None:
+        return None
+    with rhythm_lock:
+        if rhythm_scorer is None:
+            return None
+        result = rhythm_scorer.on_strum(t, direction, chord)
+        rhythm_version += 1
+        if result["matched"]:
+            return rhythm_scorer.pattern[result["note"]][1]
+    return None
+
+def start_session():
+    """Close the current event log, if any, and start a new one
+
+    Closing joins the log's writer thread while it flushes, so async handlers
+    call this through asyncio.to_thread.
+    """
+    global session_logger, current_session_id, last_logged_chord
+    with session_lock:
+        _close_session()
+        try:
+            current_session_id, session_logger = session_log.open_session()
+            last_logged_chord = None
+        except OSError as e:
+            logging.warning(f"Could not open session log: {e}")
+            current_session_id, session_logger = None, None
+
+def stop_session():
+    with session_lock:
+        _close_session()
+
+def _close_session():
+    global session_logger
+    if session_logger:
+        session_logger.close()
+        session_logger = None
+
+def load_vision_modules():
+    """Import cv2, mediapipe and the hardware modules on first use"""
+    global cv2, mp, ChordDetector, RealTimeStrumPlayer, MotionGate, motion_gate, voice_armer
+    import cv2
+    import mediapipe as mp
+    from motionGate import MotionGate
+
+    # Separately, so a box without audio output (e.g. headless CI) still reads the glove
+    try:
+        from chordDetection import ChordDetector
+    except ImportError:
+        logging.warning("Could not import the chord detector. Running without the glove.")
+        ChordDetector = None
+    try:
+        from soundPlayback import RealTimeStrumPlayer
+    except ImportError:
+        logging.warning("Could not import sound playback. Running without audio.")
+        RealTimeStrumPlayer = None
+
+    if MOTION_GATE and motion_gate is None:
+        motion_gate = MotionGate(max_skip_interval=MOTION_GATE_MAX_SKIP)
+    if VOICE_PREARM and RealTimeStrumPlayer and voice_armer is None:
+        voice_armer = VoiceArmer(RealTimeStrumPlayer)
+
+def initialize_hardware_in_background():
+    """Load the vision stack and open the camera and glove off the event loop"""
+    start = time.monotonic()
+    hardware_state["status"] = "loading"
+    try:
+        load_vision_modules()
+        status = "ready" if initialize_hardware() else "mock"
+    except Exception as e:
+        logging.warning(f"Hardware initialization failed: {e}")
+        hardware_state["error"] = str(e)
+        status = "failed"
+    hardware_state["seconds"] = round(time.monotonic() - start, 3)
+    hardware_state["status"] = status
 
 def initialize_hardware():
     """Initialize Mediapipe and camera"""
-    global hands_detector, mp_hands, mp_drawing, video_capture, chord_detector
+    global hands_detector, mp_hands, mp_drawing, video_capture, chord_detector, mjpeg_passthrough
     
     # Initialize Mediapipe
     try:
@@ -138,8 +289,8 @@ def initialize_hardware():
         mp_drawing = None
     
     # Initialize camera (try different indices)
-    for cam_idx in [1, 0, 2]:
-        cap = cv2.VideoCapture(cam_idx)
+    for cam_idx in ([CAMERA_SOURCE] if CAMERA_SOURCE else [1, 0, 2]):
+        cap = open_camera_source(cam_idx) if CAMERA_SOURCE else cv2.VideoCapture(cam_idx)
         if cap.isOpened():
             video_capture = cap
             # set a moderate capture resolution to reduce processing cost
@@ -150,7 +301,9 @@ def initialize_hardware():
                 video_capture.set(cv2.CAP_PROP_FPS, 30)
             except Exception:
                 pass
-            logging.info(f"Camera opened at index {cam_idx}")
+            if CAPTURE_MODE == "mjpeg":
+                mjpeg_passthrough = enable_mjpeg_capture(video_capture)
+            logging.info(f"Camera opened at {cam_idx}")
             break
     
     if video_capture is None:
@@ -177,11 +330,30 @@ def initialize_hardware():
     
     return True
 
-def process_frame(frame):
-    """Process a single frame for hand detection and strumming"""
-    global prev_hand_center, gesture_window, last_strum_time, strum_start_time
-    global expected_direction_down, last_successful_strum_direction
+def enable_mjpeg_capture(cap):
+    """Ask for undecoded MJPEG frames; returns False (and restores decoding) if the camera/backend can't"""
+    try:
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+        cap.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+        ret, frame = cap.read()
+        if ret and is_compressed(frame):
+            logging.info("Camera delivers MJPEG; forwarding JPEG frames to viewers")
+            return True
+        cap.set(cv2.CAP_PROP_CONVERT_RGB, 1)
+    except Exception as e:
+        logging.debug(f"MJPEG capture setup failed: {e}")
+    logging.warning("Camera did not deliver MJPEG frames; using decoded capture")
+    return False
+
+def process_frame(frame, capture_time=None, trace_id=None):
+    """Process a single frame for hand detection and strumming
+
+    capture_time is the time.monotonic() at which the frame was read, used to
+    record detection latency in the session log and the glass-to-sound trace;
+    trace_id ties this frame's spans together (see backend/tracing.py).
+    """
     global strum_in_progress, current_player, strum_start_y, strum_total_distance
+    global last_logged_chord, last_hand_results, last_landmarks
     
     if hands_detector is None:
         # Return frame with no processing if Mediapipe not initialized
@@ -205,10 +377,23 @@ def process_frame(frame):
             "thumb_extended": False
         }
 
+    if trace_id is None:
+        trace_id = new_trace_id()
     frame = cv2.flip(frame, 1)
-    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    frame_time = capture_time if capture_time is not None else time.monotonic()
+    with tracer.span("motion_gate", trace_id):
+        run_inference = motion_gate is None or motion_gate.should_infer(frame, frame_time)
     try:
-        results = hands_detector.process(rgb_frame)
+        if run_inference or last_hand_results is None:
+            with tracer.span("hand_inference", trace_id):
+                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                results = hands_detector.process(rgb_frame)
+            last_hand_results = results
+            if motion_gate is not None:
+                hand = results.multi_hand_landmarks[0] if results.multi_hand_landmarks else None
+                motion_gate.set_roi([(lm.x, lm.y) for lm in hand.landmark] if hand else None)
+        else:
+            results = last_hand_results
     except Exception as e:
         # MediaPipe can raise packet type mismatch if given empty/invalid frames
         logging.warning(f"MediaPipe processing error: {e}")
@@ -225,144 +410,145 @@ def process_frame(frame):
     strum_detected = False
     velocity = 0.0
     thumb_extended = False
+    # MJPEG viewers get the camera's own bytes, so there is nothing to draw into
+    draw_overlay = DRAW_LANDMARKS and not mjpeg_passthrough
+    landmarks_message = {
+        "type": "landmarks",
+        "frame": trace_id,
+        "captured_at": frame_time,
+        "points": None,
+        "drawn": draw_overlay,
+        "mirror_video": mjpeg_passthrough,
+    }
     
     if results.multi_hand_landmarks:
         for hand_landmarks in results.multi_hand_landmarks:
-            if mp_drawing and mp_hands:
+            if draw_overlay and mp_drawing and mp_hands:
                 mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
             
             # Get bounding box height
-            x_vals = [lm.x for lm in hand_landmarks.landmark]
-            y_vals = [lm.y for lm in hand_landmarks.landmark]
-            hand_height = max(y_vals) - min(y_vals)
+            points = [(lm.x, lm.y) for lm in hand_landmarks.landmark]
+            center_x, center_y, thumb_distance, hand_height = hand_features(points)
             ref_hand_height = 0.25
             adjusted_strum_distance = manual_strum_distance * (ref_hand_height / hand_height)
             strum_distance = np.clip(adjusted_strum_distance, 0.1, 0.6)
             strum_total_distance = strum_distance
-            
-            # Hand center
-            lm9 = hand_landmarks.landmark[9]
-            lm13 = hand_landmarks.landmark[13]
-            center_x = (lm9.x + lm13.x) / 2
-            center_y = (lm9.y + lm13.y) / 2
             hand_center = np.array([center_x, center_y])
             
-            # Thumb distance
-            lm4 = hand_landmarks.landmark[4]
-            lm5 = hand_landmarks.landmark[5]
-            thumb_distance = abs(lm4.y - lm5.y)
-            thumb_extended = thumb_distance > thumb_noise_threshold
+            # Filtered velocity, direction and strum decision on the frame's capture timestamp
+            with tracer.span("strum_detection", trace_id):
+                event, current_direction_down, thumb_extended = strum_detector.update(frame_time, center_y, thumb_distance)
+            velocity = strum_detector.velocity
             
-            # Calculate velocity
-            if prev_hand_center is not None:
-                vel_y = hand_center[1] - prev_hand_center[1]
-                velocities.append(vel_y)
-                smoothed_velocity = np.mean(list(velocities)) if velocities else 0
-                velocity = smoothed_velocity
-                current_direction_down = smoothed_velocity > 0
-            else:
-                prev_hand_center = hand_center
-                current_direction_down = True
-            
-            # Update strum playback
+            # Update strum playback, using where the hand is now rather than where it was at capture
             if strum_in_progress and current_player:
+                predicted_y = strum_detector.predict(time.monotonic() + PREDICTION_LEAD)
                 if current_direction_down:
-                    distance_covered = hand_center[1] - strum_start_y
+                    distance_covered = predicted_y - strum_start_y
                 else:
-                    distance_covered = strum_start_y - hand_center[1]
+                    distance_covered = strum_start_y - predicted_y
                 progress = np.clip(distance_covered / strum_total_distance, 0, 1)
                 current_player.update_progress(progress)
                 if progress >= 1.0:
                     current_player.stop()
                     strum_in_progress = False
             
-            # Stabilize gesture
-            gesture_window.append(current_direction_down)
-            stable_motion = len(gesture_window) == STRUM_FRAMES and all(x == current_direction_down for x in gesture_window)
-            
-            # Thumb direction logic
-            thumb_direction_down = not thumb_extended
-            valid_thumb_motion = thumb_direction_down == current_direction_down
-            
-            # Check strum conditions
-            distance_moved = abs(hand_center[1] - prev_hand_center[1]) if prev_hand_center is not None else 0
-            current_time = time.time()
-            
-            # Timeout
-            if strum_start_time and current_time - strum_start_time > MAX_STRUM_DURATION:
-                prev_hand_center = hand_center
-                gesture_window.clear()
-                strum_start_time = None
-            
-            consecutive_same_direction = last_successful_strum_direction == current_direction_down
-            
-            # Detect strum
-            if stable_motion and abs(velocity) > velocity_threshold and current_time - last_strum_time > COOLDOWN and not consecutive_same_direction:
-                strum_start_time = current_time
-                last_strum_time = current_time
+            if event == "strum":
+                # Successful strum
+                strum_detected = True
+                strum_direction = "down" if current_direction_down else "up"
+                tracer.record("glass_to_detection", trace_id, frame_time, time.monotonic(), direction=strum_direction)
                 
-                if valid_thumb_motion and current_direction_down == expected_direction_down:
-                    # Successful strum
-                    strum_detected = True
-                    strum_direction = "down" if current_direction_down else "up"
-                    
-                    # Get chord
-                    if chord_detector:
+                # Get chord
+                if chord_detector:
+                    with tracer.span("chord_read", trace_id):
                         detected_chord = chord_detector.get_current_chord() or "None"
-                    else:
-                        detected_chord = "None"
-                    
-                    if detected_chord != "None" and detected_chord != "":
-                        # Play sound
-                        if current_player:
-                            current_player.stop()
-                        
-                        # Get the base directory (parent of backend)
-                        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-                        file_path = os.path.join(base_dir, "Hardware", "PseudoGuitar", "chord_sounds", f"{detected_chord}_{strum_direction}.wav")
-                        
-                        if os.path.exists(file_path) and RealTimeStrumPlayer:
-                            try:
-                                current_player = RealTimeStrumPlayer(file_path)
-                                current_player.start()
-                                strum_start_y = hand_center[1]
-                                strum_in_progress = True
-                            except Exception as e:
-                                logging.warning(f"Error playing sound: {e}")
-                        else:
-                            logging.debug(f"Sound file not found: {file_path}")
-                    
-                    hand_positions.append(hand_center)
-                    expected_direction_down = not expected_direction_down
-                    last_successful_strum_direction = current_direction_down
-                    gesture_window.clear()
                 else:
-                    # Reset
+                    detected_chord = "None"
+                
+                if detected_chord != "None" and detected_chord != "":
+                    # Play sound; the previous voice fades out on its own thread
                     if current_player:
-                        current_player.stop()
-                        strum_in_progress = False
-                        current_player = None
-                    hand_positions.append(hand_center)
-                    expected_direction_down = not expected_direction_down
-                    gesture_window.clear()
-                    last_successful_strum_direction = None
+                        with tracer.span("stop_previous", trace_id):
+                            current_player.stop()
+                    
+                    # A voice pre-armed for this chord and direction is ready to start
+                    player = voice_armer.take(detected_chord, current_direction_down) if voice_armer else None
+                    armed = sample_found = player is not None
+                    if player is None:
+                        with tracer.span("sample_lookup", trace_id, chord=detected_chord):
+                            file_path = sample_path(detected_chord, current_direction_down)
+                            sample_found = os.path.exists(file_path)
+                    
+                    if sample_found and RealTimeStrumPlayer:
+                        try:
+                            if player is None:
+                                with tracer.span("sample_load", trace_id):
+                                    player = RealTimeStrumPlayer(file_path)
+                            current_player = player
+                            with tracer.span("audio_start", trace_id, armed=armed):
+                                current_player.start()
+                            tracer.record("glass_to_sound", trace_id, frame_time, time.monotonic(),
+                                          chord=detected_chord, direction=strum_direction)
+                            # Same filtered, lead-compensated estimate the progress is measured
+                            # with, so filter lag does not show up as an offset at the start
+                            strum_start_y = strum_detector.predict(time.monotonic() + PREDICTION_LEAD)
+                            strum_in_progress = True
+                        except Exception as e:
+                            logging.warning(f"Error playing sound: {e}")
+                    else:
+                        logging.debug(f"Sound file not found: {file_path}")
+                
+                expected_chord = score_rhythm_strum(frame_time, strum_direction, detected_chord)
+                if session_logger:
+                    session_logger.log_strum(detected_chord, current_direction_down, velocity, thumb_extended,
+                                             True, _latency_since(capture_time), expected=expected_chord)
+                hand_positions.append(hand_center)
+            elif event == "reset":
+                # Reset
+                if current_player:
+                    current_player.stop()
+                    strum_in_progress = False
+                    current_player = None
+                # Out of the detector's up/down alternation, but still a strum for the
+                # rhythm exercise, scored in the direction the hand actually moved
+                chord = chord_detector.get_current_chord() if chord_detector else None
+                expected_chord = score_rhythm_strum(frame_time, "down" if current_direction_down else "up", chord)
+                if session_logger:
+                    session_logger.log_strum(chord, current_direction_down, velocity, thumb_extended,
+                                             False, _latency_since(capture_time), expected=expected_chord)
+                hand_positions.append(hand_center)
             
-            prev_hand_center = hand_center
+            # Flat [x0, y0, ..., x20, y20] in normalized (mirrored) image coordinates
+            landmarks_message.update(
+                points=[round(float(v), 4) for point in points for v in point],
+                center=[round(float(center_x), 4), round(float(center_y), 4)],
+                velocity=round(float(velocity), 4),
+                direction="down" if current_direction_down else "up",
+                thumb_extended=bool(thumb_extended),
+            )
             
             # Draw visualization
-            h, w, _ = frame.shape
-            cx, cy = int(center_x * w), int(center_y * h)
-            cv2.circle(frame, (cx, cy), 8, (0, 255, 0), -1)
-            cv2.putText(frame, f"Vel: {velocity:.3f}", (30, 50),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
-            cv2.putText(frame, f"Dir: {'Down' if current_direction_down else 'Up'}", (30, 80),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
-            cv2.putText(frame, f"Thumb: {'Extended' if thumb_extended else 'Retracted'}", (30, 110),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+            if draw_overlay:
+                h, w, _ = frame.shape
+                cx, cy = int(center_x * w), int(center_y * h)
+                cv2.circle(frame, (cx, cy), 8, (0, 255, 0), -1)
+                cv2.putText(frame, f"Vel: {velocity:.3f}", (30, 50),
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
+                cv2.putText(frame, f"Dir: {'Down' if current_direction_down else 'Up'}", (30, 80),
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
+                cv2.putText(frame, f"Thumb: {'Extended' if thumb_extended else 'Retracted'}", (30, 110),
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+    last_landmarks = landmarks_message
     
     # Get current chord even if no hand detected
     if chord_detector:
         detected_chord = chord_detector.get_current_chord() or "None"
+    if voice_armer:
+        voice_armer.arm(detected_chord, strum_detector.expected_direction_down)
+    if session_logger and detected_chord != last_logged_chord:
+        session_logger.log_chord_change(detected_chord, _latency_since(capture_time))
+        last_logged_chord = detected_chord
     
     return frame, {
         "chord": detected_chord,
@@ -372,27 +558,18 @@ def process_frame(frame):
         "thumb_extended": thumb_extended
     }
 
-def generate_frames():
-    """Generator for video frames"""
-    global video_capture, is_running
-    global last_processed_frame_bytes, last_detection_data, last_process_time
-    
-    if video_capture is None:
-        # Return a black frame if no camera
-        while is_running:
-            black_frame = np.zeros((480, 640, 3), dtype=np.uint8)
-            cv2.putText(black_frame, "Camera not available", (150, 240),
-                       cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-            _, buffer = cv2.imencode('.jpg', black_frame)
-            frame_bytes = buffer.tobytes()
-            yield (b'--frame\r\n'
-                   b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-            time.sleep(0.033)  # ~30 FPS
-        return
+def _latency_since(capture_time):
+    return time.monotonic() - capture_time if capture_time is not None else 0.0
+
+def capture_loop():
+    """Read and process camera frames while anyone consumes them (video viewers or /ws clients)"""
+    global last_detection_data, last_process_time, last_detection_trace
     
-    while is_running:
+    while is_running and video_capture is not None and (preview.has_subscribers() or active_connections):
+        read_start = time.monotonic()
         with capture_lock:
             ret, frame = video_capture.read()
+        capture_time = time.monotonic()
         if not ret:
             # Try to reinitialize camera
             time.sleep(0.05)
@@ -400,46 +577,97 @@ def generate_frames():
 
         now = time.time()
         # Only process at the configured PROCESS_FPS to reduce CPU load
-        if now - last_process_time >= PROCESS_INTERVAL:
-            try:
-                processed_frame, detection_data = process_frame(frame)
-                _, buffer = cv2.imencode('.jpg', processed_frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
-                last_processed_frame_bytes = buffer.tobytes()
-                last_detection_data = detection_data
-                last_process_time = now
-            except Exception as e:
-                logging.warning(f"Error processing frame: {e}")
-                # fall back to raw frame encoding
-                try:
-                    _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 60])
-                    last_processed_frame_bytes = buffer.tobytes()
-                except Exception:
-                    last_processed_frame_bytes = None
+        if now - last_process_time < PROCESS_INTERVAL:
+            continue
+        trace_id = new_trace_id()
+        tracer.record("capture", trace_id, read_start, capture_time)
+        jpeg = None
+        if mjpeg_passthrough and is_compressed(frame):
+            jpeg = frame
+            with tracer.span("jpeg_decode", trace_id):
+                frame = decode_reduced(jpeg, MJPEG_DECODE_SCALE)
+            if frame is None:
+                continue
+        try:
+            with tracer.span("process_frame", trace_id):
+                processed_frame, detection_data = process_frame(frame, capture_time, trace_id)
+            last_detection_trace = (trace_id, capture_time)
+            last_detection_data = detection_data
+            last_process_time = now
+        except Exception as e:
+            logging.warning(f"Error processing frame: {e}")
+            # fall back to the raw frame for viewers
+            processed_frame = frame
+        try:
+            # Encodes only the variants someone is watching, once each; with MJPEG
+            # capture viewers see the unmirrored camera image, so encode from that
+            with tracer.span("jpeg_encode", trace_id):
+                if jpeg is not None:
+                    preview.publish(frame, trace_id, jpeg=jpeg.tobytes())
+                else:
+                    preview.publish(processed_frame, trace_id)
+        except Exception as e:
+            logging.warning(f"Error encoding frame: {e}")
+
+def ensure_capture_loop():
+    """Start the capture thread if the camera is open and it is not already running"""
+    global capture_thread
+    with capture_thread_lock:
+        if video_capture is not None and is_running and (capture_thread is None or not capture_thread.is_alive()):
+            capture_thread = threading.Thread(target=capture_loop, daemon=True, name="capture")
+            capture_thread.start()
 
-        # Yield the latest encoded frame (processed or fallback)
-        if last_processed_frame_bytes:
+def generate_frames(variant):
+    """Generator for one /video_feed client; frames are shared with every client of the same variant"""
+    preview.subscribe(variant)
+    try:
+        frame_id = None
+        while is_running:
+            if video_capture is None:
+                # Return a black frame until the camera is open (or if there is none)
+                if cv2 is not None:
+                    starting = hardware_state["status"] in ("pending", "loading")
+                    black_frame = np.zeros((480, 640, 3), dtype=np.uint8)
+                    cv2.putText(black_frame, "Starting camera..." if starting else "Camera not available", (150, 240),
+                               cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+                    _, buffer = cv2.imencode('.jpg', black_frame, [cv2.IMWRITE_JPEG_QUALITY, variant.quality])
+                    frame_bytes = buffer.tobytes()
+                    yield (b'--frame\r\n'
+                           b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
+                time.sleep(1.0 / variant.fps if variant.fps else 0.033)
+                continue
+            
+            ensure_capture_loop()
+            latest = preview.wait(variant, frame_id, timeout=1.0)
+            if latest is None:
+                continue
+            frame_id, frame_bytes = latest
             yield (b'--frame\r\n'
-                   b'Content-Type: image/jpeg\r\n\r\n' + last_processed_frame_bytes + b'\r\n')
-        else:
-            # safety fallback
-            time.sleep(0.01)
-            continue
+                   b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
+    finally:
+        preview.unsubscribe(variant)
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize hardware on startup"""
     global is_running
     is_running = True
-    initialize_hardware()
+    await asyncio.to_thread(start_session)
+    if API_ONLY:
+        hardware_state["status"] = "disabled"
+        return
+    # Serve requests right away; the camera and glove come up in the background
+    threading.Thread(target=initialize_hardware_in_background, daemon=True, name="hardware-init").start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
     global is_running, video_capture, chord_detector, current_player
     is_running = False
+    await asyncio.to_thread(stop_session)
     
     if current_player:
-        current_player.stop()
+        current_player.stop(wait=True)
     
     if video_capture:
         video_capture.release()
@@ -447,17 +675,37 @@ async def shutdown_event():
     if chord_detector:
         chord_detector.stop()
     
-    cv2.destroyAllWindows()
+    if cv2 is not None:
+        try:
+            cv2.destroyAllWindows()
+        except cv2.error:
+            pass  # headless OpenCV builds have no HighGUI
 
 @app.get("/")
 async def root():
-    return {"status": "GuitarZeno Backend", "hardware_initialized": video_capture is not None}
+    return {
+        "status": "GuitarZeno Backend",
+        "hardware_initialized": video_capture is not None,
+        "hardware": {
+            **hardware_state,
+            "camera": video_capture is not None,
+            "hand_tracking": hands_detector is not None,
+            "chord_detector": chord_detector is not None,
+        },
+    }
 
 @app.get("/video_feed")
-async def video_feed():
-    """MJPEG video stream endpoint"""
+async def video_feed(width: Optional[int] = None, quality: int = 80, fps: Optional[float] = None):
+    """MJPEG video stream endpoint
+
+    width (pixels, height follows the aspect ratio), JPEG quality and fps pick
+    a variant; clients asking for the same variant share its encoded frames.
+    """
+    if API_ONLY:
+        raise HTTPException(status_code=503, detail="Video is disabled in API-only mode")
+    variant = make_variant(width, quality, fps, max_width=CAP_WIDTH, max_fps=PROCESS_FPS)
     return StreamingResponse(
-        generate_frames(),
+        generate_frames(variant),
         media_type="multipart/x-mixed-replace; boundary=frame"
     )
 
@@ -466,6 +714,7 @@ async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time data"""
     await websocket.accept()
     active_connections.add(websocket)
+    ensure_capture_loop()
     
     last_frame_time = 0
     frame_interval = 1.0 / 10  # 10 Hz
@@ -473,11 +722,16 @@ async def websocket_endpoint(websocket: WebSocket):
     
     try:
         sent_prev = None
+        sent_rhythm_version = rhythm_version
+        sent_landmarks_frame = None
         while is_running:
             current_time = time.time()
             if current_time - last_frame_time >= frame_interval:
+                # Detection runs for /ws clients even with no video viewer
+                ensure_capture_loop()
                 # Send cached detection data periodically
                 try:
+                    trace_id, capture_time = last_detection_trace
                     payload = deepcopy(last_detection_data) if last_detection_data else None
                     if payload is not None:
                         # sanitize payload to JSON-safe primitives
@@ -492,7 +746,10 @@ async def websocket_endpoint(websocket: WebSocket):
 
                         # Only send if changed to reduce traffic
                         if payload != sent_prev:
-                            await websocket.send_json(payload)
+                            with tracer.span("ws_send", trace_id):
+                                await websocket.send_json(payload)
+                            if payload.get("strum_detected") and capture_time is not None:
+                                tracer.record("glass_to_ui", trace_id, capture_time, time.monotonic())
                             sent_prev = payload
                             last_frame_time = current_time
                 except WebSocketDisconnect:
@@ -515,6 +772,20 @@ async def websocket_endpoint(websocket: WebSocket):
                 except Exception:
                     logging.exception("Error sending chord update over WebSocket")
 
+                # Push rhythm score updates as they happen
+                if rhythm_scorer is not None and rhythm_version != sent_rhythm_version:
+                    sent_rhythm_version = rhythm_version
+                    with rhythm_lock:
+                        score = rhythm_scorer.snapshot(time.monotonic()) if rhythm_scorer else None
+                    if score is not None:
+                        await websocket.send_json({"type": "rhythm", **score})
+
+            # Landmarks for the client-side overlay, once per processed frame
+            landmarks = last_landmarks
+            if landmarks is not None and landmarks["frame"] != sent_landmarks_frame:
+                sent_landmarks_frame = landmarks["frame"]
+                await websocket.send_json(landmarks)
+
             await asyncio.sleep(0.05)  # Check every 50ms
     except WebSocketDisconnect:
         active_connections.discard(websocket)
@@ -527,7 +798,8 @@ async def start_detection():
     """Start detection"""
     global is_running
     is_running = True
-    return {"status": "started"}
+    await asyncio.to_thread(start_session)
+    return {"status": "started", "session_id": current_session_id}
 
 @app.post("/stop")
 async def stop_detection():
@@ -540,16 +812,48 @@ async def stop_detection():
 async def api_teach_song(request: Request):
     data = await request.json()
     song_name = data.get("song_name", "")
+    song = get_library().find(song_name)
+    if song is not None:
+        return {"result": song["raw"], "chords": song["chords"], "title": song["title"], "source": "library"}
     result = get_chord_progression(song_name)
-    return {"result": result}
+    chords = _remember_progression(song_name, result)
+    return {"result": result, "chords": chords, "source": "llm"}
 
 @app.post("/api/feedback")
 async def api_feedback(request: Request):
     data = await request.json()
     played_chord = data.get("played_chord", "")
     expected_chord = data.get("expected_chord", "")
-    result = get_feedback(played_chord, expected_chord)
-    return {"result": result}
+    local = get_local_feedback(played_chord, expected_chord)
+    if local is not None:
+        return {"result": local["result"], "correct": local["correct"], "source": "local"}
+    # Chords outside the glove vocabulary go to the (cached) LLM off the event loop
+    result = await asyncio.to_thread(get_feedback, played_chord, expected_chord)
+    return {"result": result, "source": "llm"}
+
+@app.post("/api/feedback/batch")
+async def api_feedback_batch(request: Request):
+    """Grade a whole practice run: per-chord feedback plus a summary in one round-trip
+
+    Body: {"attempts": [{"played_chord": ..., "expected_chord": ..., "timestamp": ...}, ...]}
+    """
+    data = await request.json()
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=400, detail="Body must be a JSON object")
+    items = data.get("attempts", [])
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        raise HTTPException(status_code=400, detail="attempts must be a list of objects")
+    attempts = [
+        (str(item.get("played_chord") or ""), str(item.get("expected_chord") or ""), item.get("timestamp"))
+        for item in items
+    ]
+    results, unresolved = grade_attempts(attempts)
+    if unresolved:
+        pairs = [(results[i]["played_chord"], results[i]["expected_chord"]) for i in unresolved]
+        answers = await asyncio.to_thread(get_feedback_batch, pairs)
+        for i, answer in zip(unresolved, answers):
+            results[i]["result"] = answer
+    return {"results": results, "summary": summarize_attempts(results)}
 
 @app.post("/api/recommend-song")
 async def api_recommend_song(request: Request):
@@ -558,6 +862,176 @@ async def api_recommend_song(request: Request):
     result = get_song_recommendation(query)
     return {"result": result}
 
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def _remember_progression(song_name, text):
+    """Parse an LLM progression into canonical chords and file it in the song library"""
+    if text.startswith("Error:"):
+        return []
+    chords = parse_progression(text)
+    if chords:
+        get_library().add(song_name, chords, raw=text)
+    return chords
+
+def _sse_events(fragments, parse_chords=False, on_done=None):
+    """Turn upstream text fragments into SSE token/chord/done events"""
+    parser = ChordStreamParser() if parse_chords else None
+    parts = []
+    try:
+        for fragment in fragments:
+            parts.append(fragment)
+            yield _sse("token", {"text": fragment})
+            if parser:
+                for chord in parser.feed(fragment):
+                    yield _sse("chord", {"chord": chord, "index": len(parser.chords) - 1})
+        if parser:
+            for chord in parser.close():
+                yield _sse("chord", {"chord": chord, "index": len(parser.chords) - 1})
+    except Exception as e:
+        logging.warning(f"Streaming upstream error: {e}")
+        yield _sse("error", {"message": str(e)})
+        on_done = None
+    if on_done:
+        on_done("".join(parts))
+    done = {"result": "".join(parts)}
+    if parser:
+        done["chords"] = parser.chords
+    yield _sse("done", done)
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+@app.post("/api/teach-song/stream")
+async def api_teach_song_stream(request: Request):
+    """Server-sent events: token fragments plus each chord as soon as it is complete"""
+    data = await request.json()
+    song_name = data.get("song_name", "")
+    song = get_library().find(song_name)
+    if song is not None:
+        fragments = iter([song["raw"] or " ".join(song["chords"])])
+        on_done = None
+    else:
+        fragments = stream_chord_progression(song_name)
+        on_done = lambda text: _remember_progression(song_name, text)
+    return StreamingResponse(
+        _sse_events(fragments, parse_chords=True, on_done=on_done),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+@app.post("/api/recommend-song/stream")
+async def api_recommend_song_stream(request: Request):
+    data = await request.json()
+    query = data.get("query", "")
+    return StreamingResponse(
+        _sse_events(stream_song_recommendation(query)),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+@app.get("/api/songs/search")
+async def api_songs_search(q: str = "", limit: int = 5):
+    """Typo-tolerant title search over the local song library"""
+    return {"songs": get_library().search(q, limit=limit)}
+
+@app.get("/api/songs/playable")
+async def api_songs_playable(chords: str = ""):
+    """Songs that only use the given comma-separated chords, e.g. ?chords=G,C,D"""
+    available = [chord.strip() for chord in chords.split(",") if chord.strip()]
+    return {"songs": get_library().playable_with(available)}
+
+@app.post("/api/rhythm/start")
+async def api_rhythm_start(request: Request):
+    """Start scoring a target pattern
+
+    Body: {"pattern": [{"chord": "G", "direction": "down", "beat": 0}, ...],
+           "tempo": 90, "count_in": 4, "window": 0.15}
+    Beats are counted from the end of the count-in.
+    """
+    global rhythm_scorer, rhythm_version
+    data = await request.json()
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=400, detail="Body must be a JSON object")
+    try:
+        pattern = parse_pattern(data.get("pattern", []))
+        tempo = float(data.get("tempo", 90))
+        count_in = float(data.get("count_in", 4))
+        start_time = time.monotonic() + count_in * 60.0 / tempo
+        kwargs = {"window": float(data["window"])} if "window" in data else {}
+        scorer = RhythmScorer(pattern, tempo, start_time, **kwargs)
+    except (TypeError, ValueError, ZeroDivisionError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    with rhythm_lock:
+        rhythm_scorer = scorer
+        rhythm_version += 1
+    return {"status": "started", "notes": len(pattern), "starts_in": start_time - time.monotonic()}
+
+@app.get("/api/rhythm/score")
+async def api_rhythm_score():
+    with rhythm_lock:
+        if rhythm_scorer is None:
+            raise HTTPException(status_code=404, detail="No rhythm exercise running")
+        return rhythm_scorer.snapshot(time.monotonic())
+
+@app.post("/api/rhythm/stop")
+async def api_rhythm_stop():
+    global rhythm_scorer, rhythm_version
+    with rhythm_lock:
+        score = rhythm_scorer.snapshot(time.monotonic()) if rhythm_scorer else None
+        rhythm_scorer = None
+        rhythm_version += 1
+    return {"status": "stopped", "score": score}
+
+@app.get("/api/sessions")
+async def api_sessions():
+    return {"current": current_session_id, "sessions": session_log.list_sessions()}
+
+@app.get("/api/sessions/{session_id}/stats")
+async def api_session_stats(session_id: str, bins: int = 20):
+    """Strums/min, success and chord accuracy, velocity and timing histograms for one session"""
+    try:
+        path = session_log.session_path(session_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Unknown session")
+    events = session_log.read_events(path)
+    return await asyncio.to_thread(session_log.session_stats, events, bins)
+
+@app.get("/api/cache-stats")
+async def api_cache_stats():
+    return get_cache().stats()
+
+@app.get("/api/trace")
+async def api_trace(clear: bool = False):
+    """Recorded pipeline spans as Chrome trace_event JSON (chrome://tracing, Perfetto)"""
+    trace = tracer.chrome_trace()
+    if clear:
+        tracer.clear()
+    return trace
+
+@app.get("/api/trace/summary")
+async def api_trace_summary():
+    return tracer.summary()
+
+@app.get("/api/video-stats")
+async def api_video_stats():
+    """Per /video_feed variant: subscribers, encoded fps, bytes/s and encode time"""
+    return preview.stats()
+
+@app.get("/api/voice-stats")
+async def api_voice_stats():
+    """Pre-armed voice: what is armed, strums that found it ready (hits) and median prepare time"""
+    if voice_armer is None:
+        return {"voice_prearm": False}
+    return {"voice_prearm": True, **voice_armer.stats()}
+
+@app.get("/api/vision-stats")
+async def api_vision_stats():
+    if motion_gate is None:
+        return {"motion_gate": False}
+    return {"motion_gate": True, **motion_gate.stats()}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
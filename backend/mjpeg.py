@@ -0,0 +1,107 @@
+"""
+Helpers for camera-native MJPEG capture
+With CAP_PROP_FOURCC=MJPG and CAP_PROP_CONVERT_RGB=0, OpenCV's V4L2/MSMF
+backends hand back each frame as the camera's JPEG bytes (a 1xN uint8 array)
+instead of decoded BGR pixels. Those bytes can go straight to MJPEG viewers,
+and hand inference only needs a downscaled decode, which libjpeg does cheaply
+by skipping DCT coefficients (IMREAD_REDUCED_COLOR_*).
+
+MJPEGFileCapture replays a recorded .mjpeg/.avi file the same way, as a
+stand-in camera for benchmarks.
+"""
+import time
+
+import numpy as np
+
+SOI = b"\xff\xd8"
+EOI = b"\xff\xd9"
+
+
+def is_compressed(frame) -> bool:
+    """True if a VideoCapture frame is undecoded JPEG bytes rather than an image"""
+    return frame is not None and frame.dtype == np.uint8 and (
+        frame.ndim == 1 or (frame.ndim == 2 and frame.shape[0] == 1)
+    )
+
+
+def decode_reduced(jpeg, scale: int = 2):
+    """Decode JPEG bytes at 1/scale resolution (scale 1, 2, 4 or 8); None if corrupt"""
+    import cv2
+
+    flags = {
+        1: cv2.IMREAD_COLOR,
+        2: cv2.IMREAD_REDUCED_COLOR_2,
+        4: cv2.IMREAD_REDUCED_COLOR_4,
+        8: cv2.IMREAD_REDUCED_COLOR_8,
+    }
+    buffer = np.frombuffer(jpeg, dtype=np.uint8) if isinstance(jpeg, (bytes, bytearray)) else jpeg.reshape(-1)
+    return cv2.imdecode(buffer, flags[scale])
+
+
+def split_jpeg_frames(data: bytes):
+    """JPEG images found back to back in an MJPEG stream or MJPG-encoded AVI"""
+    frames = []
+    start = data.find(SOI)
+    while start != -1:
+        end = data.find(EOI, start + 2)
+        if end == -1:
+            break
+        frames.append(data[start:end + 2])
+        start = data.find(SOI, end + 2)
+    return frames
+
+
+class MJPEGFileCapture:
+    """cv2.VideoCapture look-alike replaying a recording at fps
+
+    Like a camera, frames come back decoded until CAP_PROP_CONVERT_RGB is set to 0,
+    after which read() returns the compressed JPEG bytes.
+    """
+
+    def __init__(self, path: str, fps: float = 30.0, loop: bool = True, paced: bool = True,
+                 convert_rgb: bool = True):
+        with open(path, "rb") as f:
+            self.frames = [np.frombuffer(frame, dtype=np.uint8).reshape(1, -1) for frame in split_jpeg_frames(f.read())]
+        self.fps = fps
+        self.loop = loop
+        self.paced = paced
+        self.convert_rgb = convert_rgb
+        self.index = 0
+        self._next = time.monotonic()
+
+    def isOpened(self):
+        return bool(self.frames)
+
+    def read(self):
+        if self.index >= len(self.frames):
+            if not self.loop or not self.frames:
+                return False, None
+            self.index = 0
+        if self.paced:
+            delay = self._next - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._next = max(self._next + 1.0 / self.fps, time.monotonic() - 1.0 / self.fps)
+        frame = self.frames[self.index]
+        self.index += 1
+        if self.convert_rgb:
+            return True, decode_reduced(frame, 1)
+        return True, frame
+
+    def set(self, prop, value):
+        import cv2
+
+        if prop == cv2.CAP_PROP_CONVERT_RGB:
+            self.convert_rgb = bool(value)
+            return True
+        return False
+
+    def get(self, prop):
+        import cv2
+
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        return 0.0
+
+    def release(self):
+        self.frames = []
@@ -1,50 +1,199 @@
 import os
+import re
+import json
 import requests
 
-OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
+from .chords import canonical_chord_name
+from .response_cache import get_cache
+
+# Point at backend/fake_openrouter.py for local testing
+OPENROUTER_API_URL = os.getenv("OPENROUTER_API_URL", "https://openrouter.ai/api/v1/chat/completions")
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")  # set key 
 
 
-def get_chord_progression(song_name: str) -> str:
+def _progression_messages(song_name):
     prompt = f"You are a guitar teacher. Give the chord progression for the song '{song_name}' in a simple list, using standard guitar chord names."
-    messages = [
+    return [
         {"role": "system", "content": "You are a helpful guitar teacher."},
         {"role": "user", "content": prompt}
     ]
-    return call_openrouter(messages)
+
+
+def _recommendation_messages(query):
+    prompt = f"Suggest a popular guitar song to learn based on: {query}. Give the song name and artist."
+    return [
+        {"role": "system", "content": "You are a helpful guitar teacher."},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def get_chord_progression(song_name: str) -> str:
+    cached = get_cache().get("progression", song_name)
+    if cached is not None:
+        return cached
+    return _store("progression", song_name, call_openrouter(_progression_messages(song_name)))
+
+
+def stream_chord_progression(song_name: str):
+    """Yield the progression text in fragments as the upstream produces them"""
+    return _stream_cached("progression", song_name, _progression_messages(song_name))
+
+
+def _feedback_key(played_chord, expected_chord):
+    """Cache query for a feedback pair
+
+    The cache normalizes punctuation away, so raw names would make 'C#' and 'C'
+    share an entry; canonical names ('C#_major', 'Eb_minor') keep them apart.
+    """
+    def name(chord):
+        return canonical_chord_name(chord) or (chord or "").replace("#", " sharp ")
+    return f"{name(played_chord)} expected {name(expected_chord)}"
 
 
 def get_feedback(played_chord: str, expected_chord: str) -> str:
+    """LLM feedback, used only for chords the local feedback table does not cover"""
+    query = _feedback_key(played_chord, expected_chord)
+    cached = get_cache().get("feedback", query)
+    if cached is not None:
+        return cached
     prompt = f"The student played '{played_chord}', but the expected chord was '{expected_chord}'. Give short feedback (correct/incorrect, and a tip if wrong)."
     messages = [
         {"role": "system", "content": "You are a helpful guitar teacher."},
         {"role": "user", "content": prompt}
     ]
-    return call_openrouter(messages)
+    return _store("feedback", query, call_openrouter(messages))
 
 
-def get_song_recommendation(query: str) -> str:
-    prompt = f"Suggest a popular guitar song to learn based on: {query}. Give the song name and artist."
+def get_feedback_batch(pairs):
+    """Feedback for several (played, expected) pairs using at most one LLM call
+
+    Cached pairs are answered from the response cache; the rest are sent as a
+    single numbered prompt and the numbered reply is split back per pair.
+    """
+    answers = [None] * len(pairs)
+    missing = {}
+    for index, (played_chord, expected_chord) in enumerate(pairs):
+        query = _feedback_key(played_chord, expected_chord)
+        cached = get_cache().get("feedback", query)
+        if cached is not None:
+            answers[index] = cached
+        else:
+            missing.setdefault((played_chord, expected_chord), []).append(index)
+    if not missing:
+        return answers
+
+    unique = list(missing)
+    lines = [f"{number}. played '{played}', expected '{expected}'"
+             for number, (played, expected) in enumerate(unique, 1)]
+    prompt = ("For each numbered attempt below, the student played a chord and a chord was expected. "
+              "Reply with one line per attempt, starting with its number, giving short feedback "
+              "(correct/incorrect, and a tip if wrong).\n" + "\n".join(lines))
     messages = [
         {"role": "system", "content": "You are a helpful guitar teacher."},
         {"role": "user", "content": prompt}
     ]
-    return call_openrouter(messages)
+    reply = call_openrouter(messages, max_tokens=min(1024, 48 * len(unique)))
 
+    replies = {}
+    if not reply.startswith("Error:"):
+        for line in reply.splitlines():
+            match = re.match(r"\s*(\d+)[.):]\s*(.+)", line)
+            if match:
+                replies[int(match.group(1))] = match.group(2).strip()
+    for number, pair in enumerate(unique, 1):
+        text = replies.get(number)
+        if text is None:
+            text = reply if reply.startswith("Error:") else "No feedback available for this attempt."
+        else:
+            get_cache().set("feedback", _feedback_key(*pair), text)
+        for index in missing[pair]:
+            answers[index] = text
+    return answers
 
-def call_openrouter(messages):
-    headers = {
-        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-        "Content-Type": "application/json"
-    }
+
+def get_song_recommendation(query: str) -> str:
+    cached = get_cache().get("recommendation", query)
+    if cached is not None:
+        return cached
+    return _store("recommendation", query, call_openrouter(_recommendation_messages(query)))
+
+
+def stream_song_recommendation(query: str):
+    return _stream_cached("recommendation", query, _recommendation_messages(query))
+
+
+def _store(kind, query, result):
+    # Never persist upstream failures; the next request should retry
+    if not result.startswith("Error:"):
+        get_cache().set(kind, query, result)
+    return result
+
+
+def _stream_cached(kind, query, messages):
+    cached = get_cache().get(kind, query)
+    if cached is not None:
+        yield cached
+        return
+    parts = []
+    for fragment in stream_openrouter(messages):
+        parts.append(fragment)
+        yield fragment
+    _store(kind, query, "".join(parts))
+
+
+def _request_body(messages, stream=False, max_tokens=128):
     data = {
         "model": "openai/gpt-3.5-turbo",  
         "messages": messages,
-        "max_tokens": 128
+        "max_tokens": max_tokens
+    }
+    if stream:
+        data["stream"] = True
+    return data
+
+
+def _headers():
+    return {
+        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+        "Content-Type": "application/json"
     }
-    response = requests.post(OPENROUTER_API_URL, headers=headers, json=data)
+
+
+def call_openrouter(messages, max_tokens=128):
+    response = requests.post(OPENROUTER_API_URL, headers=_headers(), json=_request_body(messages, max_tokens=max_tokens))
     if response.status_code == 200:
         result = response.json()
         return result["choices"][0]["message"]["content"]
     else:
         return f"Error: {response.text}"
+
+
+
+def stream_openrouter(messages):
+    """Yield content deltas from a streaming (SSE) chat completion"""
+    with requests.post(OPENROUTER_API_URL, headers=_headers(), json=_request_body(messages, stream=True),
+                       stream=True) as response:
+        if response.status_code != 200:
+            yield f"Error: {response.text}"
+            return
+        # SSE is always UTF-8, but text/event-stream arrives without a charset and
+        # requests would fall back to ISO-8859-1 for any non-ASCII token
+        response.encoding = "utf-8"
+        # chunk_size=None hands over bytes as they arrive instead of filling 512-byte blocks
+        for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+            # SSE comments (": OPENROUTER PROCESSING") and blank keep-alives
+            if not line or not line.startswith("data:"):
+                continue
+            payload = line[len("data:"):].strip()
+            if payload == "[DONE]":
+                break
+            try:
+                chunk = json.loads(payload)
+            except ValueError:
+                continue
+            choices = chunk.get("choices") or []
+            if not choices:
+                continue
+            content = (choices[0].get("delta") or {}).get("content")
+            if content:
+                yield content
@@ -0,0 +1,147 @@
+"""
+Shared JPEG variants of the processed camera frame for /video_feed
+A variant is (width, quality, fps). The capture loop publishes each processed
+frame once; every variant with at least one subscriber is resized and encoded
+at most once per frame (less if its fps is lower), and all clients asking for
+the same variant share those bytes. With no subscribers nothing is encoded,
+and a variant's state is dropped when its last subscriber leaves.
+When the camera's own JPEG is published alongside the frame (MJPEG capture),
+full-size variants forward those bytes without any encode.
+"""
+import threading
+import time
+from collections import deque
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+STATS_WINDOW = 5.0  # seconds of encodes used for the bytes/s figure
+
+
+class Variant(NamedTuple):
+    width: Optional[int]  # None = full camera resolution
+    quality: int
+    fps: float  # 0 = every processed frame
+
+
+def make_variant(width=None, quality=80, fps=None, max_width=640, max_fps=30.0) -> Variant:
+    """Clamp and round client parameters so near-identical requests share a variant"""
+    if width is not None:
+        width = int(min(max(width, 64), max_width)) // 16 * 16
+        if width >= max_width:
+            width = None
+    quality = int(min(max(quality, 20), 95)) // 5 * 5
+    fps = float(min(max(fps, 1.0), max_fps)) if fps else 0.0
+    return Variant(width, quality, round(fps, 1))
+
+
+class _VariantState:
+    __slots__ = ("subscribers", "frame_id", "jpeg", "last_encode", "encoded", "encodes", "encode_times")
+
+    def __init__(self):
+        self.subscribers = 0
+        self.frame_id = None
+        self.jpeg = None
+        self.last_encode = 0.0
+        self.encoded = 0
+        self.encodes = deque(maxlen=2000)  # (time, bytes)
+        self.encode_times = deque(maxlen=300)
+
+
+class PreviewVariants:
+    def __init__(self):
+        self._states = {}
+        self._cond = threading.Condition()
+        self.published = 0
+
+    def subscribe(self, variant: Variant):
+        with self._cond:
+            self._states.setdefault(variant, _VariantState()).subscribers += 1
+
+    def unsubscribe(self, variant: Variant):
+        with self._cond:
+            state = self._states.get(variant)
+            if state is not None:
+                state.subscribers -= 1
+                if state.subscribers <= 0:
+                    del self._states[variant]
+
+    def has_subscribers(self) -> bool:
+        return any(state.subscribers for state in list(self._states.values()))
+
+    def publish(self, frame, frame_id, jpeg=None):
+        """Encode frame for every subscribed variant that is due; returns the number of encodes
+
+        jpeg: the camera's compressed bytes for this frame, used as-is for full-size variants
+        """
+        now = time.monotonic()
+        with self._cond:
+            self.published += 1
+            due = [
+                (variant, state) for variant, state in self._states.items()
+                if state.subscribers and (not variant.fps or now - state.last_encode >= 1.0 / variant.fps - 0.005)
+            ]
+        if not due:
+            return 0
+        import cv2
+
+        encoded = []
+        for variant, state in due:
+            if jpeg is not None and variant.width is None:
+                encoded.append((state, jpeg, 0.0))
+                continue
+            start = time.perf_counter()
+            image = frame
+            if variant.width is not None and variant.width != frame.shape[1]:
+                height = round(frame.shape[0] * variant.width / frame.shape[1])
+                image = cv2.resize(frame, (variant.width, height), interpolation=cv2.INTER_AREA)
+            ok, buffer = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, variant.quality])
+            if ok:
+                encoded.append((state, buffer.tobytes(), time.perf_counter() - start))
+        with self._cond:
+            for state, data, seconds in encoded:
+                state.frame_id = frame_id
+                state.jpeg = data
+                state.last_encode = now
+                state.encoded += 1
+                state.encodes.append((now, len(data)))
+                state.encode_times.append(seconds)
+            self._cond.notify_all()
+        return len(encoded)
+
+    def wait(self, variant: Variant, after_id=None, timeout=1.0):
+        """Block until the variant has a frame newer than after_id; returns (frame_id, jpeg) or None
+
+        Only subscribed variants get frames, so subscribe() first.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                state = self._states.get(variant)
+                if state is not None and state.jpeg is not None and state.frame_id != after_id:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            return state.frame_id, state.jpeg
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        report = []
+        with self._cond:
+            for variant, state in self._states.items():
+                recent = [size for t, size in state.encodes if t >= now - STATS_WINDOW]
+                times = np.array(state.encode_times) * 1000.0
+                report.append({
+                    "width": variant.width,
+                    "quality": variant.quality,
+                    "fps": variant.fps,
+                    "subscribers": state.subscribers,
+                    "frames_encoded": state.encoded,
+                    "encoded_fps": len(recent) / STATS_WINDOW,
+                    "bytes_per_second": sum(recent) / STATS_WINDOW,
+                    "encode_ms_mean": float(times.mean()) if len(times) else None,
+                    "encode_ms_p95": float(np.percentile(times, 95)) if len(times) else None,
+                })
+        return {"frames_published": self.published, "variants": report}
@@ -0,0 +1,171 @@
+"""
+Incremental rhythm and timing scoring
+A target pattern is a list of notes (chord, direction, beat) played at a
+tempo. Strums are matched to the nearest unmatched note onset inside a
+timing window; a cursor over the time-ordered notes only ever moves forward,
+so each strum costs O(1) amortized. Timing error statistics and a tempo
+estimate are updated in place as strums arrive.
+"""
+import math
+from typing import Optional
+
+from .chords import canonical_chord_name
+
+DEFAULT_WINDOW = 0.15  # seconds either side of a note onset that can still match it
+DEFAULT_ON_TIME = 0.075  # |timing error| counted as "on time"
+TEMPO_SMOOTHING = 0.3  # EMA weight of the newest seconds-per-beat sample
+
+
+def parse_pattern(notes):
+    """Normalize [{"chord", "direction", "beat"}, ...] into sorted (beat, chord, direction) tuples"""
+    if not isinstance(notes, list):
+        raise ValueError("Pattern must be a list of notes")
+    pattern = []
+    for i, note in enumerate(notes):
+        if not isinstance(note, dict):
+            raise ValueError(f"Note {i} must be an object, got {note!r}")
+        beat = float(note.get("beat", i))
+        chord = note.get("chord")
+        chord = canonical_chord_name(chord) if chord else None
+        direction = note.get("direction")
+        if direction not in (None, "down", "up"):
+            raise ValueError(f"Invalid strum direction: {direction!r}")
+        pattern.append((beat, chord, direction))
+    pattern.sort(key=lambda note: note[0])
+    return pattern
+
+
+class RhythmScorer:
+    def __init__(self, pattern, tempo, start_time, window=DEFAULT_WINDOW, on_time=DEFAULT_ON_TIME):
+        if tempo <= 0:
+            raise ValueError("Tempo must be positive")
+        self.pattern = pattern
+        self.tempo = float(tempo)
+        self.start_time = start_time
+        self.window = window
+        self.on_time = on_time
+        seconds_per_beat = 60.0 / self.tempo
+        self.onsets = [start_time + beat * seconds_per_beat for beat, _, _ in pattern]
+        self.matched = [False] * len(pattern)
+        self._cursor = 0  # first note that may still be matched
+
+        self.hits = 0
+        self.on_time_hits = 0
+        self.correct_hits = 0  # matched with the right direction and chord
+        self.misses = 0
+        self.extra_strums = 0
+        # Welford running mean / variance of signed timing error
+        self._error_count = 0
+        self._error_mean = 0.0
+        self._error_m2 = 0.0
+        self._abs_error_sum = 0.0
+
+        self._last_match = None  # (note index, strum time) of the previous matched strum
+        self._seconds_per_beat = None
+        self._last_strum_time = None
+        self._interval_ema = None
+
+    def _expire(self, now):
+        """Advance the cursor past notes whose window closed without a strum"""
+        while self._cursor < len(self.onsets) and self.onsets[self._cursor] + self.window < now:
+            if not self.matched[self._cursor]:
+                self.misses += 1
+            self._cursor += 1
+
+    def on_strum(self, t, direction=None, chord=None):
+        """Score one strum at monotonic time t; returns the match result"""
+        self._expire(t)
+        self._update_strum_rate(t)
+
+        best = None
+        i = self._cursor
+        while i < len(self.onsets) and self.onsets[i] - self.window <= t:
+            if not self.matched[i]:
+                error = t - self.onsets[i]
+                if best is None or abs(error) < abs(best[1]):
+                    best = (i, error)
+            i += 1
+
+        if best is None:
+            self.extra_strums += 1
+            return {"matched": False, "note": None, "error": None}
+
+        index, error = best
+        self.matched[index] = True
+        _, want_chord, want_direction = self.pattern[index]
+        direction_ok = want_direction is None or direction == want_direction
+        chord_ok = want_chord is None or canonical_chord_name(chord or "") == want_chord
+        on_time = abs(error) <= self.on_time
+
+        self.hits += 1
+        if direction_ok and chord_ok:
+            self.correct_hits += 1
+            if on_time:
+                self.on_time_hits += 1
+        self._add_error(error)
+        self._update_tempo(index, t)
+        return {
+            "matched": True,
+            "note": index,
+            "error": error,
+            "on_time": on_time,
+            "direction_ok": direction_ok,
+            "chord_ok": chord_ok,
+        }
+
+    def _add_error(self, error):
+        self._error_count += 1
+        delta = error - self._error_mean
+        self._error_mean += delta / self._error_count
+        self._error_m2 += delta * (error - self._error_mean)
+        self._abs_error_sum += abs(error)
+
+    def _update_tempo(self, index, t):
+        if self._last_match is not None:
+            prev_index, prev_t = self._last_match
+            beats = self.pattern[index][0] - self.pattern[prev_index][0]
+            if beats > 0 and t > prev_t:
+                sample = (t - prev_t) / beats
+                if self._seconds_per_beat is None:
+                    self._seconds_per_beat = sample
+                else:
+                    self._seconds_per_beat += TEMPO_SMOOTHING * (sample - self._seconds_per_beat)
+        self._last_match = (index, t)
+
+    def _update_strum_rate(self, t):
+        if self._last_strum_time is not None and t > self._last_strum_time:
+            interval = t - self._last_strum_time
+            if self._interval_ema is None:
+                self._interval_ema = interval
+            elif interval < 2.5 * self._interval_ema:  # ignore pauses between phrases
+                self._interval_ema += TEMPO_SMOOTHING * (interval - self._interval_ema)
+        self._last_strum_time = t
+
+    @property
+    def finished(self):
+        return self._cursor >= len(self.onsets)
+
+    def snapshot(self, now: Optional[float] = None):
+        """Current score; pass now to also count notes that have since been missed"""
+        if now is not None:
+            self._expire(now)
+        judged = self.hits + self.misses
+        variance = self._error_m2 / (self._error_count - 1) if self._error_count > 1 else 0.0
+        return {
+            "notes": len(self.pattern),
+            "judged": judged,
+            "hits": self.hits,
+            "correct": self.correct_hits,
+            "on_time": self.on_time_hits,
+            "misses": self.misses,
+            "extra_strums": self.extra_strums,
+            "on_time_rate": self.on_time_hits / judged if judged else 0.0,
+            "accuracy": self.correct_hits / judged if judged else 0.0,
+            "mean_error": self._error_mean,
+            "error_stddev": math.sqrt(variance),
+            "mean_abs_error": self._abs_error_sum / self._error_count if self._error_count else 0.0,
+            "target_bpm": self.tempo,
+            "estimated_bpm": 60.0 / self._seconds_per_beat if self._seconds_per_beat else None,
+            "strum_rate_bpm": 60.0 / self._interval_ema if self._interval_ema else None,
+            "finished": self.finished,
+        }
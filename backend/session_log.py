@@ -0,0 +1,246 @@
+"""
+Append-only binary log of strum and chord-change events
+The capture loop only enqueues a tuple; a background thread packs records
+into fixed-width rows, appends them and fsyncs in batches. Readers memory-map
+the file as a NumPy structured array, so session stats are vectorized even
+over millions of events.
+"""
+import itertools
+import os
+import queue
+import re
+import struct
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+from .chords import GLOVE_CHORDS
+
+DEFAULT_SESSION_DIR = os.getenv(
+    "GUITARZENO_SESSION_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "sessions"),
+)
+
+MAGIC = b"GZLOG\x00"
+VERSION = 1
+HEADER = struct.Struct("<6sHH6x")  # magic, version, record size -> 16 bytes
+
+EVENT_STRUM = 0
+EVENT_CHORD_CHANGE = 1
+
+CHORD_NONE = 255
+CHORD_OTHER = 254
+CHORD_CODES = {name: code for code, name in enumerate(GLOVE_CHORDS)}
+
+DIRECTION_DOWN = 1
+DIRECTION_UP = -1
+
+FLAG_SUCCESS = 1  # strum matched the expected direction and thumb gesture
+FLAG_THUMB_EXTENDED = 2
+
+# t: monotonic seconds, latency: seconds from frame capture to detection
+RECORD = struct.Struct("<dBBBbBff")
+RECORD_DTYPE = np.dtype([
+    ("t", "<f8"),
+    ("kind", "u1"),
+    ("chord", "u1"),
+    ("expected", "u1"),
+    ("direction", "i1"),
+    ("flags", "u1"),
+    ("velocity", "<f4"),
+    ("latency", "<f4"),
+])
+assert RECORD_DTYPE.itemsize == RECORD.size
+
+_SESSION_ID_RE = re.compile(r"^[\w-]+$")
+_CLOSE = object()  # writer-thread shutdown sentinel
+_session_sequence = itertools.count()
+
+
+def chord_code(name) -> int:
+    if not name or name == "None":
+        return CHORD_NONE
+    return CHORD_CODES.get(name, CHORD_OTHER)
+
+
+def chord_label(code: int) -> str:
+    if code == CHORD_NONE:
+        return "None"
+    if code == CHORD_OTHER:
+        return "Other"
+    return GLOVE_CHORDS[code]
+
+
+def session_path(session_id: str, directory=DEFAULT_SESSION_DIR) -> str:
+    if not _SESSION_ID_RE.match(session_id):
+        raise ValueError(f"Invalid session id: {session_id!r}")
+    return os.path.join(directory, f"{session_id}.gzlog")
+
+
+class SessionLogWriter:
+    def __init__(self, path, fsync_interval=1.0, batch_size=512):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.batch_size = batch_size
+        self.events_written = 0
+        self._queue = queue.SimpleQueue()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, "ab")
+        if is_new:
+            self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+            self._file.flush()
+        self._thread = threading.Thread(target=self._run, name="session-log-writer", daemon=True)
+        self._thread.start()
+
+    def log(self, kind, chord=None, expected=None, direction=0, velocity=0.0,
+            thumb_extended=False, success=False, latency=0.0, t=None):
+        """Queue one event; never blocks on disk"""
+        flags = (FLAG_SUCCESS if success else 0) | (FLAG_THUMB_EXTENDED if thumb_extended else 0)
+        self._queue.put((
+            time.monotonic() if t is None else t,
+            kind,
+            chord_code(chord),
+            chord_code(expected),
+            direction,
+            flags,
+            float(velocity),
+            float(latency),
+        ))
+
+    def log_strum(self, chord, direction_down, velocity, thumb_extended, success, latency=0.0, expected=None):
+        self.log(EVENT_STRUM, chord, expected, DIRECTION_DOWN if direction_down else DIRECTION_UP,
+                 velocity, thumb_extended, success, latency)
+
+    def log_chord_change(self, chord, latency=0.0, expected=None):
+        self.log(EVENT_CHORD_CHANGE, chord, expected, 0, 0.0, False, False, latency)
+
+    def _run(self):
+        last_sync = time.monotonic()
+        dirty = False
+        while True:
+            try:
+                item = self._queue.get(timeout=self.fsync_interval)
+            except queue.Empty:
+                item = None
+            if item is not None:
+                if item is _CLOSE:
+                    break
+                batch = [item]
+                while len(batch) < self.batch_size:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _CLOSE:
+                        self._write(batch)
+                        self._sync()
+                        return
+                    batch.append(item)
+                self._write(batch)
+                dirty = True
+            if dirty and time.monotonic() - last_sync >= self.fsync_interval:
+                self._sync()
+                last_sync = time.monotonic()
+                dirty = False
+        self._sync()
+
+    def _write(self, batch):
+        self._file.write(b"".join(RECORD.pack(*record) for record in batch))
+        self.events_written += len(batch)
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        """Flush everything queued so far and close the file"""
+        if self._file.closed:
+            return
+        self._queue.put(_CLOSE)
+        self._thread.join()
+        self._file.close()
+
+
+def read_events(path):
+    """Memory-map a session log as a structured array (see RECORD_DTYPE)"""
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+    if len(header) < HEADER.size:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    magic, version, record_size = HEADER.unpack(header)
+    if magic != MAGIC or record_size != RECORD_DTYPE.itemsize:
+        raise ValueError(f"{path} is not a version {VERSION} session log")
+    size = os.path.getsize(path) - HEADER.size
+    count = size // record_size  # ignore a torn trailing record
+    if count == 0:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER.size, shape=(count,))
+
+
+def session_stats(events, bins=20):
+    """Per-session aggregates computed with vectorized NumPy"""
+    strums = events[events["kind"] == EVENT_STRUM]
+    changes = events[events["kind"] == EVENT_CHORD_CHANGE]
+    duration = float(events["t"][-1] - events["t"][0]) if len(events) > 1 else 0.0
+    minutes = duration / 60.0
+
+    successful = (strums["flags"] & FLAG_SUCCESS) != 0
+    directions = strums["direction"]
+    with_expected = strums["expected"] != CHORD_NONE
+    chord_hits = strums["chord"][with_expected] == strums["expected"][with_expected]
+
+    speed = np.abs(strums["velocity"])
+    speed_counts, speed_edges = np.histogram(speed, bins=bins) if len(speed) else (np.zeros(0), np.zeros(0))
+    intervals = np.diff(strums["t"])
+    interval_counts, interval_edges = (np.histogram(intervals, bins=bins)
+                                       if len(intervals) else (np.zeros(0), np.zeros(0)))
+    chord_counts = np.bincount(strums["chord"], minlength=256)
+    latency = events["latency"]
+
+    return {
+        "events": int(len(events)),
+        "strums": int(len(strums)),
+        "chord_changes": int(len(changes)),
+        "duration": duration,
+        "strums_per_minute": float(len(strums) / minutes) if minutes > 0 else 0.0,
+        "successful_strums": int(successful.sum()),
+        "strum_success_rate": float(successful.mean()) if len(strums) else 0.0,
+        "down_strums": int((directions == DIRECTION_DOWN).sum()),
+        "up_strums": int((directions == DIRECTION_UP).sum()),
+        "chord_accuracy": float(chord_hits.mean()) if len(chord_hits) else None,
+        "chords": {chord_label(code): int(count) for code, count in enumerate(chord_counts) if count},
+        "velocity_histogram": {"counts": speed_counts.astype(int).tolist(), "edges": speed_edges.tolist()},
+        "interval_histogram": {"counts": interval_counts.astype(int).tolist(), "edges": interval_edges.tolist()},
+        "latency_p50": float(np.percentile(latency, 50)) if len(latency) else 0.0,
+        "latency_p95": float(np.percentile(latency, 95)) if len(latency) else 0.0,
+    }
+
+
+def list_sessions(directory=DEFAULT_SESSION_DIR):
+    if not os.path.isdir(directory):
+        return []
+    sessions = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".gzlog"):
+            path = os.path.join(directory, name)
+            size = os.path.getsize(path)
+            sessions.append({
+                "session_id": name[:-len(".gzlog")],
+                "events": max(0, size - HEADER.size) // RECORD.size,
+            })
+    return sessions
+
+
+def new_session_id() -> str:
+    """Sortable and unique per process: second, millisecond, pid and a sequence number"""
+    now = time.time()
+    return (time.strftime("%Y%m%d-%H%M%S", time.localtime(now))
+            + f"-{int(now * 1000) % 1000:03d}-{os.getpid()}-{next(_session_sequence)}")
+
+
+def open_session(session_id: Optional[str] = None, directory=DEFAULT_SESSION_DIR):
+    session_id = session_id or new_session_id()
+    return session_id, SessionLogWriter(session_path(session_id, directory))
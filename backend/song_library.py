@@ -0,0 +1,187 @@
+"""
+Local library of songs and their canonical chord progressions
+Persisted in SQLite and indexed in memory: character trigrams over titles for
+typo-tolerant search, and chord -> songs postings for "what can I play with
+these chords" queries. The LLM is only consulted for titles not in here yet;
+only an exact (normalized) title counts, since near-miss titles such as
+"Let It Go" and "Let It Be" are different songs.
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from typing import Optional
+
+from .chords import GLOVE_CHORDS, canonical_chord_name
+from .response_cache import normalize_query
+
+DEFAULT_LIBRARY_PATH = os.getenv(
+    "GUITARZENO_LIBRARY_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "song_library.sqlite3"),
+)
+# Starter entries for the songs suggested in the teach-song page
+SEED_SONGS = [
+    ("Wonderwall", "Oasis", "Em7 G Dsus4 A7sus4 Em7 G Dsus4 A7sus4 C D Em C D Em"),
+    ("Hotel California", "Eagles", "Bm F# A E G D Em F#"),
+    ("Hey There Delilah", "Plain White T's", "D F#m D F#m G A Bm G A"),
+    ("Free Fallin'", "Tom Petty", "D Dsus4 D A D Dsus4 D A"),
+    ("House of the Rising Sun", "The Animals", "Am C D F Am C E E Am C D F Am E Am E"),
+    ("Knockin' on Heaven's Door", "Bob Dylan", "G D Am G D C"),
+    ("Horse with No Name", "America", "Em D Em D"),
+    ("Sweet Home Alabama", "Lynyrd Skynyrd", "D C G D C G"),
+]
+
+
+def trigrams(text: str):
+    padded = f"  {normalize_query(text)} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SongLibrary:
+    def __init__(self, path=DEFAULT_LIBRARY_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS songs ("
+            " id INTEGER PRIMARY KEY,"
+            " title TEXT NOT NULL,"
+            " normalized_title TEXT NOT NULL UNIQUE,"
+            " artist TEXT NOT NULL DEFAULT '',"
+            " chords TEXT NOT NULL,"
+            " raw TEXT NOT NULL DEFAULT '',"
+            " source TEXT NOT NULL,"
+            " added_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self.songs = {}  # id -> song dict
+        self._by_title = {}  # normalized title -> id
+        self._trigram_index = defaultdict(set)
+        self._gram_counts = {}  # id -> number of trigrams in the title
+        self._chord_index = defaultdict(set)
+        for row in self._conn.execute(
+            "SELECT id, title, normalized_title, artist, chords, raw, source FROM songs"
+        ):
+            self._index(self._row_to_song(row))
+        if not self.songs:
+            self._seed()
+
+    @staticmethod
+    def _row_to_song(row):
+        song_id, title, normalized_title, artist, chords, raw, source = row
+        progression = chords.split()
+        return {
+            "id": song_id,
+            "title": title,
+            "normalized_title": normalized_title,
+            "artist": artist,
+            "chords": progression,
+            "chord_set": sorted(set(progression)),
+            "glove_playable": all(chord in GLOVE_CHORDS for chord in progression),
+            "raw": raw,
+            "source": source,
+        }
+
+    def _index(self, song):
+        self.songs[song["id"]] = song
+        self._by_title[song["normalized_title"]] = song["id"]
+        grams = trigrams(song["title"])
+        self._gram_counts[song["id"]] = len(grams)
+        for gram in grams:
+            self._trigram_index[gram].add(song["id"])
+        for chord in song["chord_set"]:
+            self._chord_index[chord].add(song["id"])
+
+    def _unindex(self, song):
+        for gram in trigrams(song["title"]):
+            self._trigram_index[gram].discard(song["id"])
+        for chord in song["chord_set"]:
+            self._chord_index[chord].discard(song["id"])
+        self._by_title.pop(song["normalized_title"], None)
+        self._gram_counts.pop(song["id"], None)
+        self.songs.pop(song["id"], None)
+
+    def _seed(self):
+        for title, artist, progression in SEED_SONGS:
+            chords = [canonical_chord_name(symbol) for symbol in progression.split()]
+            self.add(title, chords, raw=progression, artist=artist, source="seed")
+
+    def add(self, title: str, chords, raw: str = "", artist: str = "", source: str = "llm"):
+        """Insert or replace a song; chords must already be canonical names"""
+        normalized_title = normalize_query(title)
+        chords = [chord for chord in chords if chord]
+        if not normalized_title or not chords:
+            return None
+        with self._lock:
+            existing = self._by_title.get(normalized_title)
+            if existing is not None:
+                self._unindex(self.songs[existing])
+            cursor = self._conn.execute(
+                "INSERT OR REPLACE INTO songs (title, normalized_title, artist, chords, raw, source, added_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (title.strip(), normalized_title, artist, " ".join(chords), raw, source, time.time()),
+            )
+            self._conn.commit()
+            song = self._row_to_song(
+                (cursor.lastrowid, title.strip(), normalized_title, artist, " ".join(chords), raw, source)
+            )
+            self._index(song)
+            return song
+
+    def search(self, query: str, limit: int = 5):
+        """Songs ranked by trigram Dice similarity of their title to the query"""
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+        shared = defaultdict(int)
+        with self._lock:
+            for gram in query_grams:
+                for song_id in self._trigram_index.get(gram, ()):
+                    shared[song_id] += 1
+            scored = []
+            for song_id, count in shared.items():
+                score = 2 * count / (len(query_grams) + self._gram_counts[song_id])
+                scored.append((score, self.songs[song_id]))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [dict(song, score=round(score, 3)) for score, song in scored[:limit]]
+
+    def find(self, query: str) -> Optional[dict]:
+        """The song with exactly this title (after normalization); use search() for suggestions"""
+        with self._lock:
+            song_id = self._by_title.get(normalize_query(query))
+            if song_id is None:
+                return None
+            return dict(self.songs[song_id], score=1.0)
+
+    def playable_with(self, chords):
+        """Songs whose every chord is in the given set"""
+        available = {canonical_chord_name(chord) or chord for chord in chords}
+        covered = defaultdict(int)
+        with self._lock:
+            for chord in available:
+                for song_id in self._chord_index.get(chord, ()):
+                    covered[song_id] += 1
+            return [
+                self.songs[song_id]
+                for song_id, count in covered.items()
+                if count == len(self.songs[song_id]["chord_set"])
+            ]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_library: Optional[SongLibrary] = None
+_library_lock = threading.Lock()
+
+
+def get_library() -> SongLibrary:
+    """Return the shared library, loading it from disk on first use"""
+    global _library
+    if _library is None:
+        with _library_lock:
+            if _library is None:
+                _library = SongLibrary()
+    return _library
@@ -0,0 +1,14 @@
+import os
+import sys
+import tempfile
+
+# Tests import the backend as the app does (`backend.main:app`), from the repo root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+# Keep module-level default stores out of the source tree
+_scratch = tempfile.mkdtemp(prefix="gz-tests-")
+os.environ.setdefault("GUITARZENO_CACHE_PATH", os.path.join(_scratch, "cache.sqlite3"))
+os.environ.setdefault("GUITARZENO_LIBRARY_PATH", os.path.join(_scratch, "library.sqlite3"))
+os.environ.setdefault("GUITARZENO_SESSION_DIR", os.path.join(_scratch, "sessions"))
@@ -0,0 +1,68 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from backend.camera_scheduler import InferenceScheduler, FrameSource
+
+
+class SyntheticSource(FrameSource):
+    def run(self):
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        while not self._stopped.wait(0.02):
+            self.publish(frame)
+
+
+def wait_for(condition, timeout=15.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = InferenceScheduler([SyntheticSource("cam")], workers=1, deadline=1.0, pin_cores=False)
+    scheduler.start()
+    yield scheduler
+    scheduler.stop()
+
+
+def test_dead_worker_is_restarted_and_its_frame_counted_lost(scheduler):
+    assert wait_for(lambda: scheduler.stats()["cam"]["dispatched"] >= 1)
+    scheduler._procs[0].kill()
+
+    assert wait_for(lambda: scheduler.restarts[0] >= 1)
+    stats = scheduler.stats()["cam"]
+    assert stats["worker_restarts"] >= 1
+    assert stats["lost"] + stats["completed"] >= 1
+    # the replacement gets frames instead of the slot staying busy forever
+    dispatched = stats["dispatched"]
+    assert wait_for(lambda: scheduler.stats()["cam"]["dispatched"] > dispatched)
+
+
+def test_stop_does_not_block_on_a_dead_worker(scheduler):
+    assert wait_for(lambda: scheduler.stats()["cam"]["dispatched"] >= 1)
+    scheduler._procs[0].kill()
+    scheduler._procs[0].join()
+
+    done = threading.Event()
+    threading.Thread(target=lambda: (scheduler.stop(), done.set()), daemon=True).start()
+    assert done.wait(15)
+    assert not any(proc.is_alive() for proc in scheduler._procs)
+
+
+def test_deadlines_are_per_source():
+    strict, relaxed = SyntheticSource("strict", deadline=0.0), SyntheticSource("relaxed")
+    scheduler = InferenceScheduler([strict, relaxed], workers=1, deadline=1.0, pin_cores=False)
+    assert scheduler.deadlines == {"strict": 0.0, "relaxed": 1.0}
+    scheduler.start()
+    try:
+        assert wait_for(lambda: scheduler.stats()["relaxed"]["dispatched"] >= 1)
+        assert wait_for(lambda: scheduler.stats()["strict"]["dropped_stale"] >= 1)
+        assert scheduler.stats()["strict"]["dispatched"] == 0
+    finally:
+        scheduler.stop()
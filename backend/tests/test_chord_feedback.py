@@ -0,0 +1,157 @@
+import pytest
+
+from backend import openrouter_api
+from backend.chord_feedback import grade_attempts, summarize_attempts
+from backend.response_cache import ResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = ResponseCache(path=str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setattr(openrouter_api, "get_cache", lambda: cache)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    calls = []
+
+    def call_openrouter(messages, max_tokens=128):
+        calls.append(messages[-1]["content"])
+        lines = [line for line in messages[-1]["content"].splitlines() if line[:1].isdigit()]
+        return "\n".join(f"{line.split('.')[0]}. tip for {line.split('.', 1)[1].strip()}" for line in lines)
+
+    monkeypatch.setattr(openrouter_api, "call_openrouter", call_openrouter)
+    return calls
+
+
+def test_grade_attempts_resolves_glove_chords_locally():
+    results, unresolved = grade_attempts([
+        ("G_major", "G_major", 0.0),
+        ("Am", "C", 1.0),
+        ("None", "D", 2.0),
+    ])
+    assert unresolved == []
+    assert [result["correct"] for result in results] == [True, False, False]
+    assert all(result["source"] == "local" and result["result"] for result in results)
+    assert results[1]["played_chord"] == "Am"
+
+
+def test_grade_attempts_leaves_unknown_chords_for_the_llm():
+    results, unresolved = grade_attempts([
+        ("F#m", "Gb minor", 0.0),
+        ("G", "G", 1.0),
+        ("Xyz", "G", 2.0),
+    ])
+    assert unresolved == [0, 2]
+    assert results[0]["result"] is None and results[0]["source"] == "llm"
+    # graded by canonical name even when the text has to come from the LLM
+    assert results[0]["correct"] is True
+    assert results[2]["correct"] is False
+
+
+def test_summarize_attempts():
+    results, _ = grade_attempts([
+        ("G", "G", 10.0),
+        ("C", "C", 11.0),
+        ("Am", "C", 12.0),
+        ("G", "G", 13.0),
+        ("Am", "C", 14.0),
+    ])
+    summary = summarize_attempts(results)
+    assert summary["total"] == 5
+    assert summary["correct"] == 3
+    assert summary["accuracy"] == pytest.approx(0.6)
+    assert summary["longest_streak"] == 2
+    assert summary["most_missed"] == [("C", 2)]
+    assert summary["common_mistakes"] == [("Am -> C", 2)]
+    assert summary["duration"] == 4.0
+    assert summary["chords_per_minute"] == pytest.approx(60.0)
+
+
+def test_summarize_empty_run():
+    summary = summarize_attempts([])
+    assert summary["total"] == 0
+    assert summary["accuracy"] == 0.0
+    assert summary["chords_per_minute"] == 0.0
+
+
+def test_feedback_batch_makes_one_call_for_unique_misses(cache, llm):
+    pairs = [("F#m", "G"), ("Xyz", "G"), ("F#m", "G")]
+    answers = openrouter_api.get_feedback_batch(pairs)
+    assert len(llm) == 1
+    assert answers[0] == answers[2] == "tip for played 'F#m', expected 'G'"
+    assert answers[1] == "tip for played 'Xyz', expected 'G'"
+
+    # answered from the cache the second time
+    assert openrouter_api.get_feedback_batch(pairs[:2]) == answers[:2]
+    assert len(llm) == 1
+
+
+def test_feedback_batch_does_not_cache_missing_lines(cache, monkeypatch):
+    monkeypatch.setattr(openrouter_api, "call_openrouter", lambda messages, max_tokens=128: "1. only one")
+    answers = openrouter_api.get_feedback_batch([("F#m", "G"), ("Xyz", "G")])
+    assert answers == ["only one", "No feedback available for this attempt."]
+    assert cache.get("feedback", openrouter_api._feedback_key("Xyz", "G")) is None
+
+
+@pytest.mark.parametrize("body", [[1], {"attempts": 3}, {"attempts": [1]}, {"attempts": ["G"]}])
+def test_batch_endpoint_rejects_malformed_bodies(body):
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+    from backend.main import app
+
+    response = TestClient(app).post("/api/feedback/batch", json=body)
+    assert response.status_code == 400
+
+
+def test_feedback_table_covers_every_glove_pair():
+    from backend.chord_feedback import FEEDBACK_TABLE, get_local_feedback
+    from backend.chords import GLOVE_CHORDS
+
+    assert len(FEEDBACK_TABLE) == len(GLOVE_CHORDS) ** 2 + len(GLOVE_CHORDS)
+    assert get_local_feedback("G", "G_major")["correct"] is True
+    # spellings resolve to the same entry
+    assert get_local_feedback("Am", "C") is get_local_feedback("A minor", "C_major")
+    assert get_local_feedback("", "D") is FEEDBACK_TABLE[("None", "D_major")]
+    assert get_local_feedback("F#m", "G") is None
+
+
+def test_feedback_key_normalizes_chord_spellings():
+    key = openrouter_api._feedback_key
+    assert key("Db major", "B") == key("C#", "B") == key("c#_maj", "B major")
+    assert key("C#", "B") != key("C", "B")
+
+
+def _post_feedback(played, expected):
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+    from backend.main import app
+
+    response = TestClient(app).post("/api/feedback", json={"played_chord": played, "expected_chord": expected})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_feedback_endpoint_answers_glove_chords_without_the_llm(cache, monkeypatch):
+    def call_openrouter(messages, max_tokens=128):
+        raise AssertionError("table hit must not call the LLM")
+
+    monkeypatch.setattr(openrouter_api, "call_openrouter", call_openrouter)
+    data = _post_feedback("Am", "C")
+    assert data["source"] == "local"
+    assert data["correct"] is False
+
+
+def test_feedback_endpoint_falls_through_to_the_llm(cache, monkeypatch):
+    calls = []
+
+    def call_openrouter(messages, max_tokens=128):
+        calls.append(messages)
+        return "Close, move one finger."
+
+    monkeypatch.setattr(openrouter_api, "call_openrouter", call_openrouter)
+    assert _post_feedback("F#m", "G") == {"result": "Close, move one finger.", "source": "llm"}
+    assert _post_feedback("Gb minor", "G") == {"result": "Close, move one finger.", "source": "llm"}
+    assert len(calls) == 1  # the respelled pair is served from the cache
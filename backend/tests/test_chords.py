@@ -0,0 +1,73 @@
+import pytest
+
+from backend.chords import ChordStreamParser, canonical_chord_name, parse_progression
+
+
+@pytest.mark.parametrize("text, name", [
+    ("Am", "A_minor"),
+    ("A minor", "A_minor"),
+    ("a_min", "A_minor"),
+    ("C", "C_major"),
+    ("A#", "Bb_major"),
+    ("Db", "C#_major"),
+    ("F♯m", "F#_minor"),
+    ("G7", "G_major"),
+    ("Dsus4", "D_major"),
+    ("D/F#", "D_major"),
+    ("Bdim", "B_minor"),
+    ("Em7", "E_minor"),
+])
+def test_canonical_chord_name(text, name):
+    assert canonical_chord_name(text) == name
+
+
+@pytest.mark.parametrize("text", ["", None, "Great", "Bridge", "Hello", "X"])
+def test_canonical_chord_name_rejects_words(text):
+    assert canonical_chord_name(text) is None
+
+
+def test_parse_progression_from_prose():
+    text = "Here is the chord progression for Wonderwall:\nVerse: Em7 - G - Dsus4 - A7sus4\nChorus: C - D"
+    assert parse_progression(text) == ["E_minor", "G_major", "D_major", "A_major", "C_major", "D_major"]
+
+
+def test_stream_parser_waits_for_a_delimiter():
+    parser = ChordStreamParser()
+    assert parser.feed("G") == []
+    assert parser.feed("7 - C") == ["G_major"]
+    assert parser.feed("m ") == ["C_minor"]
+    assert parser.close() == []
+
+
+def test_stream_parser_matches_whole_text_for_any_split():
+    text = "Verse: G - D - Em - C\nChorus: C - G - D - Em"
+    expected = parse_progression(text)
+    for size in (1, 2, 3, 7):
+        parser = ChordStreamParser()
+        for start in range(0, len(text), size):
+            parser.feed(text[start:start + size])
+        parser.close()
+        assert parser.chords == expected
+
+
+def test_stream_parser_skips_the_article_a():
+    assert parse_progression("Play A chord like G then A") == ["G_major", "A_major"]
+
+
+@pytest.mark.parametrize("text, chords", [
+    ("A Horse with No Name", []),
+    ("A Great song: G D", ["G_major", "D_major"]),
+    ("Songs like A Horse with No Name use Em and D", ["E_minor", "D_major"]),
+    ("A Em D", ["A_major", "E_minor", "D_major"]),
+    ("A - D - E", ["A_major", "D_major", "E_major"]),
+    ("Verse: D A\nChorus: G", ["D_major", "A_major", "G_major"]),
+    ("It ends on A.", ["A_major"]),
+    ("(A) then G", ["A_major", "G_major"]),
+])
+def test_bare_a_needs_a_chord_separator_or_end_after_it(text, chords):
+    assert parse_progression(text) == chords
+    parser = ChordStreamParser()
+    for char in text:
+        parser.feed(char)
+    parser.close()
+    assert parser.chords == chords
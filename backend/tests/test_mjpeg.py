@@ -0,0 +1,58 @@
+import cv2
+import numpy as np
+import pytest
+
+from backend.mjpeg import MJPEGFileCapture, decode_reduced, is_compressed, split_jpeg_frames
+
+
+def encode(value, width=64, height=48):
+    ok, jpeg = cv2.imencode(".jpg", np.full((height, width, 3), value, dtype=np.uint8))
+    assert ok
+    return jpeg.tobytes()
+
+
+def test_split_back_to_back_frames():
+    frames = [encode(0), encode(128), encode(255)]
+    assert split_jpeg_frames(b"".join(frames)) == frames
+
+
+def test_split_skips_garbage_and_drops_a_truncated_tail():
+    first, second = encode(10), encode(200)
+    stream = b"--boundary\r\nContent-Type: image/jpeg\r\n\r\n" + first + b"\r\n--boundary\r\n" + second[:-10]
+    assert split_jpeg_frames(stream) == [first]
+
+
+def test_split_empty_and_frameless_input():
+    assert split_jpeg_frames(b"") == []
+    assert split_jpeg_frames(b"no jpeg here") == []
+
+
+def test_is_compressed():
+    jpeg = np.frombuffer(encode(0), dtype=np.uint8)
+    assert is_compressed(jpeg)
+    assert is_compressed(jpeg.reshape(1, -1))
+    assert not is_compressed(np.zeros((48, 64, 3), dtype=np.uint8))
+    assert not is_compressed(None)
+
+
+@pytest.mark.parametrize("scale", [1, 2, 4])
+def test_decode_reduced_scales_resolution(scale):
+    image = decode_reduced(encode(90, width=128, height=96), scale)
+    assert image.shape == (96 // scale, 128 // scale, 3)
+
+
+def test_file_capture_toggles_between_decoded_and_compressed(tmp_path):
+    path = tmp_path / "clip.mjpeg"
+    path.write_bytes(encode(0) + encode(255))
+    cap = MJPEGFileCapture(str(path), paced=False)
+    assert cap.isOpened()
+
+    ok, frame = cap.read()
+    assert ok and frame.shape == (48, 64, 3)
+
+    cap.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+    ok, frame = cap.read()
+    assert ok and is_compressed(frame)
+
+    ok, frame = cap.read()  # loops back to the first frame
+    assert ok and frame.tobytes() == encode(0)
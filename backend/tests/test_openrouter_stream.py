@@ -0,0 +1,26 @@
+import pytest
+
+from backend import fake_openrouter, openrouter_api
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    server = fake_openrouter.serve(port=0, latency=0.0, token_delay=0.0, background=True)
+    port = server.server_address[1]
+    monkeypatch.setattr(openrouter_api, "OPENROUTER_API_URL", f"http://127.0.0.1:{port}/api/v1/chat/completions")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_stream_decodes_non_ascii_tokens_as_utf8(upstream):
+    text = "".join(openrouter_api.stream_openrouter(openrouter_api._recommendation_messages("latin songs")))
+    assert "Oasis — four" in text
+    assert "Bésame Mucho" in text
+
+
+def test_stream_and_blocking_call_agree(upstream):
+    messages = openrouter_api._progression_messages("Canción del Mariachi")
+    streamed = "".join(openrouter_api.stream_openrouter(messages))
+    assert streamed == openrouter_api.call_openrouter(messages)
+    assert "Canción del Mariachi" in streamed
@@ -0,0 +1,50 @@
+import numpy as np
+
+from backend.preview_streams import PreviewVariants, make_variant
+
+FRAME = np.zeros((48, 64, 3), dtype=np.uint8)
+
+
+def test_make_variant_rounds_near_identical_requests_together():
+    assert make_variant(width=321, quality=77, fps=14.96) == make_variant(width=330, quality=75, fps=15.0)
+    assert make_variant(width=5000).width is None
+
+
+def test_only_subscribed_variants_are_encoded():
+    preview = PreviewVariants()
+    variant = make_variant(width=64)
+    assert preview.publish(FRAME, 1) == 0
+
+    preview.subscribe(variant)
+    preview.subscribe(variant)
+    assert preview.publish(FRAME, 2) == 1
+    frame_id, jpeg = preview.wait(variant, after_id=None, timeout=0.1)
+    assert frame_id == 2 and jpeg[:2] == b"\xff\xd8"
+    assert preview.wait(variant, after_id=2, timeout=0.05) is None
+
+
+def test_states_are_dropped_with_their_last_subscriber():
+    preview = PreviewVariants()
+    variants = [make_variant(width=64 + 16 * i) for i in range(20)]
+    for variant in variants:
+        preview.subscribe(variant)
+        preview.publish(FRAME, 1)
+        preview.unsubscribe(variant)
+    assert preview.stats()["variants"] == []
+    assert not preview.has_subscribers()
+
+
+def test_wait_does_not_create_states():
+    preview = PreviewVariants()
+    assert preview.wait(make_variant(width=128, quality=40, fps=3), timeout=0.01) is None
+    assert preview.stats()["variants"] == []
+
+
+def test_shared_variant_survives_one_of_two_subscribers_leaving():
+    preview = PreviewVariants()
+    variant = make_variant()
+    preview.subscribe(variant)
+    preview.subscribe(variant)
+    preview.unsubscribe(variant)
+    assert preview.publish(FRAME, 1) == 1
+    assert preview.stats()["variants"][0]["subscribers"] == 1
@@ -0,0 +1,72 @@
+import time
+
+from backend.openrouter_api import _feedback_key
+from backend.response_cache import ResponseCache, normalize_query
+
+
+def test_normalize_query_folds_case_punctuation_and_spacing():
+    assert normalize_query("  Wonderwall!!  by   OASIS ") == "wonderwall by oasis"
+    assert normalize_query("Knockin' on Heaven's Door") == "knockin on heaven s door"
+    assert normalize_query(None) == ""
+
+
+def test_feedback_keys_keep_sharps_and_flats_apart():
+    keys = {normalize_query(_feedback_key(played, "B")) for played in ("C#", "C", "Eb", "E")}
+    assert len(keys) == 4
+    # spellings of the same chord still share an entry
+    assert normalize_query(_feedback_key("C#", "B")) == normalize_query(_feedback_key("Db major", "B"))
+    assert normalize_query(_feedback_key("xyz#", "B")) != normalize_query(_feedback_key("xyz", "B"))
+
+
+def test_cache_round_trip_and_expiry(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "cache.sqlite3"), ttl=0.05)
+    cache.set("progression", "Wonderwall", "Em7 - G")
+    assert cache.get("progression", "wonderwall!") == "Em7 - G"
+    assert cache.get("recommendation", "wonderwall") is None
+    time.sleep(0.06)
+    assert cache.get("progression", "wonderwall") is None
+    cache.close()
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "cache.sqlite3"), max_entries=2, memory_entries=0)
+    cache.set("progression", "a", "1")
+    cache.set("progression", "b", "2")
+    cache.get("progression", "a")
+    cache.set("progression", "c", "3")
+    assert cache.get("progression", "b") is None
+    assert cache.get("progression", "a") == "1"
+    cache.close()
+
+
+def test_memory_hits_keep_disk_rows_from_being_evicted(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "cache.sqlite3"), max_entries=2)
+    cache.set("progression", "a", "1")
+    time.sleep(0.01)
+    cache.set("progression", "b", "2")
+    time.sleep(0.01)
+    assert cache.get("progression", "a") == "1"
+    assert cache.memory_hits == 1
+    cache.set("progression", "c", "3")
+    cache.close()
+
+    reopened = ResponseCache(path=str(tmp_path / "cache.sqlite3"), memory_entries=0)
+    assert reopened.get("progression", "a") == "1"
+    assert reopened.get("progression", "b") is None
+    reopened.close()
+
+
+def test_memory_hit_recency_survives_a_restart(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "cache.sqlite3"))
+    cache.set("progression", "a", "1")
+    time.sleep(0.01)
+    cache.set("progression", "b", "2")
+    time.sleep(0.01)
+    cache.get("progression", "a")
+    cache.close()
+
+    reopened = ResponseCache(path=str(tmp_path / "cache.sqlite3"), max_entries=2, memory_entries=0)
+    reopened.set("progression", "c", "3")
+    assert reopened.get("progression", "a") == "1"
+    assert reopened.get("progression", "b") is None
+    reopened.close()
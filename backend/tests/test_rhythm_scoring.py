@@ -0,0 +1,60 @@
+import pytest
+
+from backend.rhythm_scoring import RhythmScorer, parse_pattern
+
+
+def four_downs():
+    return parse_pattern([{"chord": "G", "direction": "down", "beat": beat} for beat in range(4)])
+
+
+def test_parse_pattern_normalizes_and_sorts():
+    pattern = parse_pattern([{"chord": "Am", "beat": 2}, {"direction": "up", "beat": 0.5}, {"chord": "G"}])
+    assert pattern == [(0.5, None, "up"), (2.0, "A_minor", None), (2.0, "G_major", None)]
+
+
+@pytest.mark.parametrize("notes", [[1], ["G"], [None], {"chord": "G"}, "G D"])
+def test_parse_pattern_rejects_non_objects(notes):
+    with pytest.raises(ValueError):
+        parse_pattern(notes)
+
+
+def test_parse_pattern_rejects_bad_direction():
+    with pytest.raises(ValueError):
+        parse_pattern([{"direction": "sideways"}])
+
+
+def test_on_time_correct_strums():
+    scorer = RhythmScorer(four_downs(), tempo=60, start_time=100.0)
+    for beat in range(4):
+        result = scorer.on_strum(100.0 + beat + 0.02, "down", "G_major")
+        assert result["matched"] and result["on_time"] and result["direction_ok"]
+    score = scorer.snapshot(110.0)
+    assert (score["hits"], score["correct"], score["on_time"], score["misses"]) == (4, 4, 4, 0)
+    assert score["mean_error"] == pytest.approx(0.02)
+    assert score["estimated_bpm"] == pytest.approx(60.0)
+    assert score["finished"]
+
+
+def test_wrong_direction_and_chord_are_hits_but_not_correct():
+    scorer = RhythmScorer(four_downs(), tempo=60, start_time=0.0)
+    result = scorer.on_strum(0.0, "up", "G_major")
+    assert result["matched"] and not result["direction_ok"]
+    result = scorer.on_strum(1.0, "down", "C")
+    assert result["matched"] and not result["chord_ok"]
+    assert scorer.snapshot()["correct"] == 0
+
+
+def test_misses_extra_strums_and_window():
+    scorer = RhythmScorer(four_downs(), tempo=60, start_time=0.0, window=0.1)
+    assert not scorer.on_strum(0.5, "down", "G")["matched"]  # between notes
+    assert scorer.on_strum(1.05, "down", "G")["matched"]
+    assert not scorer.on_strum(1.06, "down", "G")["matched"]  # note 1 already taken
+    score = scorer.snapshot(5.0)
+    assert score["extra_strums"] == 2
+    assert score["misses"] == 3  # notes 0, 2 and 3 expired unplayed
+    assert score["judged"] == 4
+
+
+def test_tempo_must_be_positive():
+    with pytest.raises(ValueError):
+        RhythmScorer(four_downs(), tempo=0, start_time=0.0)
@@ -0,0 +1,78 @@
+import os
+
+import numpy as np
+import pytest
+
+from backend import session_log
+from backend.session_log import (
+    CHORD_NONE, CHORD_OTHER, DIRECTION_DOWN, DIRECTION_UP, EVENT_CHORD_CHANGE, EVENT_STRUM, HEADER, RECORD,
+    SessionLogWriter, chord_code, chord_label, read_events, session_stats,
+)
+
+
+def test_session_ids_are_unique_within_a_second():
+    ids = [session_log.new_session_id() for _ in range(50)]
+    assert len(set(ids)) == len(ids)
+    assert ids == sorted(ids, key=lambda session_id: int(session_id.rsplit("-", 1)[1]))
+    for session_id in ids:
+        session_log.session_path(session_id, "/tmp")  # valid as a file name
+
+
+def test_open_session_twice_gives_separate_files(tmp_path):
+    first_id, first = session_log.open_session(directory=str(tmp_path))
+    second_id, second = session_log.open_session(directory=str(tmp_path))
+    first.close()
+    second.close()
+    assert first_id != second_id
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_chord_codes_round_trip():
+    assert chord_label(chord_code("G_major")) == "G_major"
+    assert chord_code(None) == chord_code("None") == CHORD_NONE
+    assert chord_code("C#_major") == CHORD_OTHER
+
+
+def test_write_then_memmap_round_trip(tmp_path):
+    path = str(tmp_path / "session.gzlog")
+    writer = SessionLogWriter(path, fsync_interval=0.01)
+    writer.log_strum("C_major", True, 0.5, False, True, latency=0.03, expected="C_major")
+    writer.log_strum("C_major", False, -0.4, True, False, latency=0.05)
+    writer.log_chord_change("G_major", latency=0.01)
+    writer.close()
+
+    events = read_events(path)
+    assert os.path.getsize(path) == HEADER.size + 3 * RECORD.size
+    assert events["kind"].tolist() == [EVENT_STRUM, EVENT_STRUM, EVENT_CHORD_CHANGE]
+    assert [chord_label(code) for code in events["chord"]] == ["C_major", "C_major", "G_major"]
+    assert events["direction"].tolist() == [DIRECTION_DOWN, DIRECTION_UP, 0]
+    assert events["expected"][1] == CHORD_NONE
+    np.testing.assert_allclose(events["latency"], [0.03, 0.05, 0.01], rtol=1e-6)
+    assert np.all(np.diff(events["t"]) >= 0)
+
+    stats = session_stats(events)
+    assert stats["strums"] == 2
+    assert stats["chord_changes"] == 1
+    assert stats["successful_strums"] == 1
+    assert stats["chord_accuracy"] == 1.0
+    assert stats["chords"] == {"C_major": 2}
+
+
+def test_reopening_appends_and_torn_record_is_ignored(tmp_path):
+    path = str(tmp_path / "session.gzlog")
+    for _ in range(2):
+        writer = SessionLogWriter(path)
+        writer.log_chord_change("A_minor")
+        writer.close()
+    with open(path, "ab") as f:
+        f.write(b"\x00" * (RECORD.size - 1))
+    assert len(read_events(path)) == 2
+
+
+def test_rejects_other_files_and_bad_ids(tmp_path):
+    path = tmp_path / "not_a_log.gzlog"
+    path.write_bytes(b"x" * 64)
+    with pytest.raises(ValueError):
+        read_events(str(path))
+    with pytest.raises(ValueError):
+        session_log.session_path("../etc/passwd")
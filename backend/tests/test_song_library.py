@@ -0,0 +1,58 @@
+import pytest
+
+from backend.song_library import SongLibrary, trigrams
+
+
+@pytest.fixture
+def library(tmp_path):
+    library = SongLibrary(path=str(tmp_path / "library.sqlite3"))
+    yield library
+    library.close()
+
+
+def test_trigrams_are_padded_and_normalized():
+    assert trigrams("Ab") == {"  a", " ab", "ab "}
+    assert trigrams("AB!") == trigrams("ab")
+
+
+def test_search_tolerates_typos(library):
+    assert library.search("wonderwal")[0]["title"] == "Wonderwall"
+    assert library.search("hotel califronia")[0]["title"] == "Hotel California"
+    scores = [song["score"] for song in library.search("house of the risin sun")]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_find_matches_normalized_titles_only(library):
+    assert library.find("WONDERWALL!")["title"] == "Wonderwall"
+    assert library.find("  hotel   california ")["title"] == "Hotel California"
+    assert library.find("a song nobody has heard of") is None
+
+
+@pytest.mark.parametrize("query", ["Let It Go", "Yesterdays", "Hotel California 2", "wonderwal"])
+def test_find_rejects_near_miss_titles(library, query):
+    library.add("Let It Be", ["C_major", "G_major", "A_minor", "F_major"])
+    library.add("Yesterday", ["F_major", "E_minor", "A_major", "D_minor"])
+    assert library.find(query) is None
+    # still offered as suggestions
+    assert library.search(query)[0]["score"] >= 0.6
+
+
+def test_add_replaces_and_reindexes(library, tmp_path):
+    library.add("My Song", ["G_major", "C_major"])
+    library.add("my song", ["A_minor"])
+    song = library.find("My Song")
+    assert song["title"] == "my song"
+    assert song["chords"] == ["A_minor"]
+    assert song["id"] not in {s["id"] for s in library.playable_with(["G", "C"])}
+    assert song["id"] in {s["id"] for s in library.playable_with(["Am"])}
+
+    reopened = SongLibrary(path=str(tmp_path / "library.sqlite3"))
+    assert reopened.find("my song")["chords"] == ["A_minor"]
+    reopened.close()
+
+
+def test_playable_with_requires_every_chord(library):
+    library.add("Two Chords", ["G_major", "D_major"])
+    titles = {song["title"] for song in library.playable_with(["G", "D"])}
+    assert "Two Chords" in titles
+    assert "Two Chords" not in {song["title"] for song in library.playable_with(["G"])}
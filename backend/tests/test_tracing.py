@@ -0,0 +1,63 @@
+import threading
+
+from backend.tracing import SpanBuffer, new_trace_id
+
+
+def test_wraparound_keeps_only_the_newest_spans_in_time_order():
+    buffer = SpanBuffer(capacity=4, enabled=True)
+    for i in range(10):
+        buffer.record(f"s{i}", i, float(i), i + 0.5)
+
+    spans = buffer.spans()
+    assert [span[0] for span in spans] == ["s6", "s7", "s8", "s9"]
+    assert [span[2] for span in spans] == [6.0, 7.0, 8.0, 9.0]
+
+
+def test_partially_filled_buffer_skips_empty_slots():
+    buffer = SpanBuffer(capacity=8, enabled=True)
+    buffer.record("late", 1, 2.0, 3.0)
+    buffer.record("early", 2, 1.0, 1.5)
+    assert [span[0] for span in buffer.spans()] == ["early", "late"]
+
+
+def test_concurrent_writers_never_exceed_capacity():
+    buffer = SpanBuffer(capacity=64, enabled=True)
+
+    def write(thread_index):
+        for i in range(1000):
+            buffer.record("w", thread_index, float(i), i + 0.001)
+
+    threads = [threading.Thread(target=write, args=(t,)) for t in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(buffer.spans()) == 64
+
+
+def test_disabled_buffer_records_nothing():
+    buffer = SpanBuffer(capacity=4, enabled=False)
+    buffer.record("s", 1, 0.0, 1.0)
+    with buffer.span("block", 2):
+        pass
+    assert buffer.spans() == []
+
+
+def test_span_context_manager_and_exports():
+    buffer = SpanBuffer(capacity=4, enabled=True)
+    trace_id = new_trace_id()
+    with buffer.span("inference", trace_id, hands=1):
+        pass
+    buffer.record("audio_start", trace_id, 10.0, 10.002)
+
+    events = {event["name"]: event for event in buffer.chrome_trace()["traceEvents"] if event["ph"] == "X"}
+    assert events["inference"]["args"] == {"trace_id": trace_id, "hands": 1}
+    assert events["audio_start"]["ts"] == 10.0 * 1e6
+    assert abs(events["audio_start"]["dur"] - 2000.0) < 1e-3
+
+    summary = buffer.summary()
+    assert summary["inference"]["count"] == 1
+    assert abs(summary["audio_start"]["max_ms"] - 2.0) < 1e-6
+
+    buffer.clear()
+    assert buffer.spans() == []
@@ -0,0 +1,107 @@
+"""
+In-memory span tracing for the glass-to-sound path
+Every captured frame gets a trace id; stages of the pipeline (inference, strum
+detection, sample lookup, audio start, WebSocket send) record spans against it.
+Spans go into a fixed-size ring buffer without locks: slot claiming uses
+itertools.count, whose next() is atomic under the GIL, and a slot write is a
+single list assignment. The buffer exports Chrome trace_event JSON, which
+chrome://tracing or https://ui.perfetto.dev can load.
+"""
+import itertools
+import os
+import threading
+import time
+
+import numpy as np
+
+TRACE_ENABLED = os.getenv("GUITARZENO_TRACE", "1") != "0"
+TRACE_CAPACITY = int(os.getenv("GUITARZENO_TRACE_SPANS", "65536"))
+
+_trace_ids = itertools.count(1)
+
+
+def new_trace_id() -> int:
+    return next(_trace_ids)
+
+
+class _Span:
+    __slots__ = ("buffer", "name", "trace_id", "args", "start")
+
+    def __init__(self, buffer, name, trace_id, args):
+        self.buffer = buffer
+        self.name = name
+        self.trace_id = trace_id
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.monotonic()
+        return self
+
+    def __exit__(self, *exc):
+        self.buffer.record(self.name, self.trace_id, self.start, time.monotonic(), **self.args)
+        return False
+
+
+class SpanBuffer:
+    def __init__(self, capacity: int = TRACE_CAPACITY, enabled: bool = TRACE_ENABLED):
+        self.capacity = capacity
+        self.enabled = enabled
+        self.clear()
+
+    def clear(self):
+        self._slots = [None] * self.capacity
+        self._counter = itertools.count()
+
+    def record(self, name, trace_id, start, end, **args):
+        """Record a finished span; start and end are time.monotonic() seconds"""
+        if not self.enabled:
+            return
+        index = next(self._counter)
+        self._slots[index % self.capacity] = (name, trace_id, start, end, threading.get_ident(), args)
+
+    def span(self, name, trace_id, **args):
+        """Context manager timing the enclosed block"""
+        return _Span(self, name, trace_id, args)
+
+    def spans(self):
+        return sorted((slot for slot in list(self._slots) if slot is not None), key=lambda span: span[2])
+
+    def chrome_trace(self):
+        pid = os.getpid()
+        events = []
+        threads = {}
+        for name, trace_id, start, end, tid, args in self.spans():
+            threads.setdefault(tid, len(threads) + 1)
+            events.append({
+                "name": name,
+                "cat": "pipeline",
+                "ph": "X",
+                "ts": start * 1e6,
+                "dur": max(0.0, end - start) * 1e6,
+                "pid": pid,
+                "tid": threads[tid],
+                "args": {"trace_id": trace_id, **args},
+            })
+        for tid, index in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": index,
+                           "args": {"name": f"thread {tid}"}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def summary(self):
+        """Per span name: count and duration percentiles in milliseconds"""
+        durations = {}
+        for name, _, start, end, _, _ in self.spans():
+            durations.setdefault(name, []).append((end - start) * 1000.0)
+        return {
+            name: {
+                "count": len(values),
+                "mean_ms": float(np.mean(values)),
+                "p50_ms": float(np.percentile(values, 50)),
+                "p95_ms": float(np.percentile(values, 95)),
+                "max_ms": float(np.max(values)),
+            }
+            for name, values in durations.items()
+        }
+
+
+tracer = SpanBuffer()
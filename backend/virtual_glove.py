@@ -0,0 +1,91 @@
+"""
+Pseudo-terminal stand-in for the Arduino chord glove
+Opens a pty pair and writes chord names to it from a script, one line per
+chord change, the way the glove firmware does over USB serial. Point the
+backend at the printed port with GUITARZENO_SERIAL_PORT. Linux/macOS only.
+
+Script format: one "<seconds> <chord>" per line, times relative to start,
+'#' starts a comment. The script repeats when loop is on.
+
+    python -m backend.virtual_glove --script chords.txt
+"""
+import argparse
+import os
+import threading
+import time
+import tty
+
+DEFAULT_SCRIPT = [(0.0, "C_major"), (2.0, "G_major"), (4.0, "A_minor"), (6.0, "F_major"), (8.0, None)]
+
+
+def parse_script(text):
+    """[(seconds, chord)]; a final entry with chord None only marks the loop length"""
+    script = []
+    for line in text.splitlines():
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        parts = line.split()
+        script.append((float(parts[0]), parts[1] if len(parts) > 1 else None))
+    return sorted(script, key=lambda step: step[0])
+
+
+class VirtualGlove:
+    def __init__(self, script=None, loop=True):
+        self.script = script or DEFAULT_SCRIPT
+        self.loop = loop
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)  # no echo or newline translation, like a real serial line
+        self.port = os.ttyname(self.slave)
+        self.changes = []  # (time.monotonic(), chord) of every line written
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="virtual-glove")
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        length = max(self.script[-1][0], 1e-3)
+        start = time.monotonic()
+        while not self._stopped.is_set():
+            for offset, chord in self.script:
+                if self._stopped.wait(max(0.0, start + offset - time.monotonic())):
+                    return
+                if chord is None:
+                    continue
+                self.changes.append((time.monotonic(), chord))
+                os.write(self.master, f"{chord}\n".encode())
+            if not self.loop:
+                return
+            start += length
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join(timeout=1)
+        for fd in (self.master, self.slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Virtual chord glove on a pty")
+    parser.add_argument("--script", help="chord script file (default: C, G, Am, F every 2 s)")
+    parser.add_argument("--once", action="store_true", help="play the script once instead of looping")
+    args = parser.parse_args()
+
+    script = None
+    if args.script:
+        with open(args.script) as f:
+            script = parse_script(f.read())
+    glove = VirtualGlove(script, loop=not args.once).start()
+    print(f"Virtual glove on {glove.port}  (GUITARZENO_SERIAL_PORT={glove.port})", flush=True)
+    try:
+        while glove._thread.is_alive():
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        glove.stop()
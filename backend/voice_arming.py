@@ -0,0 +1,110 @@
+"""
+Pre-armed chord voices for the strum path
+Everything a strum needs before its first sample goes to the sound device
+(sample path, file check, WAV decode, RealTimeStrumPlayer construction and
+its PCM buffers) depends only on the held chord and the expected strum
+direction, and both are known before the strum happens. VoiceArmer prepares
+that voice on a background thread whenever either changes, so a detected
+strum only has to start() it. Decoded samples are kept in a small LRU cache,
+so switching back and forth between chords does not decode them again.
+"""
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+
+SAMPLE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Hardware", "PseudoGuitar", "chord_sounds"
+)
+
+
+def sample_path(chord, direction_down, sample_dir=SAMPLE_DIR):
+    return os.path.join(sample_dir, f"{chord}_{'down' if direction_down else 'up'}.wav")
+
+
+class VoiceArmer:
+    def __init__(self, player_class, sample_dir=SAMPLE_DIR, cache_size=16):
+        self.player_class = player_class
+        self.sample_dir = sample_dir
+        self.cache_size = cache_size
+        self._sounds = OrderedDict()  # path -> decoded AudioSegment
+        self._sounds_lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._wanted = None  # (chord, direction_down) the next strum is expected to play
+        self._armed = None  # (key, player or None if there is no sample)
+        self._thread = None
+        self.hits = 0
+        self.misses = 0
+        self.arm_times = deque(maxlen=300)
+
+    def arm(self, chord, direction_down):
+        """Prepare the voice for (chord, direction) in the background; cheap to call every frame"""
+        if not chord or chord == "None":
+            return
+        key = (chord, bool(direction_down))
+        with self._cond:
+            if key == self._wanted:
+                return
+            self._wanted = key
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name="voice-armer")
+                self._thread.start()
+            self._cond.notify()
+
+    def take(self, chord, direction_down):
+        """The primed player for (chord, direction), handed out once; None if it is not ready"""
+        key = (chord, bool(direction_down))
+        with self._cond:
+            if self._armed is not None and self._armed[0] == key and self._armed[1] is not None:
+                player = self._armed[1]
+                self._armed = None
+                self.hits += 1
+                return player
+            self.misses += 1
+            return None
+
+    def build(self, chord, direction_down):
+        """Prepare a voice on the calling thread; None if there is no sample for it"""
+        path = sample_path(chord, direction_down, self.sample_dir)
+        if not os.path.exists(path):
+            return None
+        with self._sounds_lock:
+            sound = self._sounds.get(path)
+            if sound is not None:
+                self._sounds.move_to_end(path)
+        player = self.player_class(path, sound=sound)
+        if sound is None:
+            with self._sounds_lock:
+                self._sounds[path] = player.sound
+                while len(self._sounds) > self.cache_size:
+                    self._sounds.popitem(last=False)
+        return player.prime()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._wanted is None or (self._armed is not None and self._armed[0] == self._wanted):
+                    self._cond.wait()
+                key = self._wanted
+            start = time.perf_counter()
+            try:
+                player = self.build(*key)
+            except Exception as e:
+                logging.warning(f"Could not pre-arm {key[0]} {'down' if key[1] else 'up'}: {e}")
+                player = None
+            with self._cond:
+                self.arm_times.append(time.perf_counter() - start)
+                self._armed = (key, player)
+
+    def stats(self) -> dict:
+        with self._cond:
+            times = sorted(self.arm_times)
+            armed = self._armed[0] if self._armed is not None and self._armed[1] is not None else None
+            return {
+                "armed": {"chord": armed[0], "direction": "down" if armed[1] else "up"} if armed else None,
+                "hits": self.hits,
+                "misses": self.misses,
+                "cached_samples": len(self._sounds),
+                "arm_ms_median": times[len(times) // 2] * 1000.0 if times else None,
+            }
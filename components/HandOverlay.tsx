@@ -0,0 +1,92 @@
+'use client'
+
+import { useEffect, useRef } from 'react'
+
+export interface LandmarksMessage {
+  type: 'landmarks'
+  frame: number
+  // server time.monotonic() at capture, for latency measurements
+  captured_at?: number
+  // flat [x0, y0, ..., x20, y20], normalized to the (mirrored) video frame
+  points: number[] | null
+  center?: [number, number]
+  velocity?: number
+  direction?: 'down' | 'up'
+  thumb_extended?: boolean
+  // true when the backend already drew the overlay into the video frames
+  drawn: boolean
+  // true when the video is the camera's own unmirrored MJPEG and must be flipped client-side
+  mirror_video?: boolean
+}
+
+interface HandOverlayProps {
+  landmarks: LandmarksMessage | null
+  // width / height of the video frames, to match an object-contain <img>
+  aspect?: number
+}
+
+// MediaPipe hand skeleton
+const HAND_CONNECTIONS: [number, number][] = [
+  [0, 1], [1, 2], [2, 3], [3, 4],
+  [0, 5], [5, 6], [6, 7], [7, 8],
+  [5, 9], [9, 10], [10, 11], [11, 12],
+  [9, 13], [13, 14], [14, 15], [15, 16],
+  [13, 17], [0, 17], [17, 18], [18, 19], [19, 20],
+]
+
+export default function HandOverlay({ landmarks, aspect = 4 / 3 }: HandOverlayProps) {
+  const canvasRef = useRef<HTMLCanvasElement>(null)
+
+  useEffect(() => {
+    const canvas = canvasRef.current
+    if (!canvas) return
+    const ctx = canvas.getContext('2d')
+    if (!ctx) return
+
+    const { clientWidth, clientHeight } = canvas
+    if (canvas.width !== clientWidth || canvas.height !== clientHeight) {
+      canvas.width = clientWidth
+      canvas.height = clientHeight
+    }
+    ctx.clearRect(0, 0, canvas.width, canvas.height)
+    if (!landmarks || landmarks.drawn || !landmarks.points) return
+
+    // area the letterboxed video actually covers
+    let width = canvas.width
+    let height = width / aspect
+    if (height > canvas.height) {
+      height = canvas.height
+      width = height * aspect
+    }
+    const left = (canvas.width - width) / 2
+    const top = (canvas.height - height) / 2
+    const points = landmarks.points
+    const x = (i: number) => left + points[2 * i] * width
+    const y = (i: number) => top + points[2 * i + 1] * height
+
+    ctx.strokeStyle = 'rgba(255, 255, 255, 0.9)'
+    ctx.lineWidth = 2
+    ctx.beginPath()
+    for (const [a, b] of HAND_CONNECTIONS) {
+      ctx.moveTo(x(a), y(a))
+      ctx.lineTo(x(b), y(b))
+    }
+    ctx.stroke()
+
+    ctx.fillStyle = 'rgb(239, 68, 68)'
+    for (let i = 0; i < points.length / 2; i++) {
+      ctx.beginPath()
+      ctx.arc(x(i), y(i), 3, 0, 2 * Math.PI)
+      ctx.fill()
+    }
+
+    if (landmarks.center) {
+      ctx.fillStyle = 'rgb(34, 197, 94)'
+      ctx.beginPath()
+      ctx.arc(left + landmarks.center[0] * width, top + landmarks.center[1] * height, 8, 0, 2 * Math.PI)
+      ctx.fill()
+    }
+  }, [landmarks, aspect])
+
+  return <canvas ref={canvasRef} className="absolute inset-0 w-full h-full pointer-events-none" />
+}